@@ -1,5 +1,4 @@
 import biobuild.utils as utils
-import biobuild.utils.visual as visual
 import biobuild.resources as resources
 import biobuild.graphs as graphs
 import biobuild.optimizers as optimizers
@@ -9,3 +8,10 @@ from biobuild.core import *
 from biobuild.resources import *
 
 from biobuild.utils.info import __version__, __author__
+
+
+def __getattr__(name):
+    # biobuild.visual is loaded on first use (see biobuild.utils)
+    if name == "visual":
+        return utils.visual
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
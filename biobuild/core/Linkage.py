@@ -98,11 +98,25 @@ to the ``Molecule``'s ``attach`` method or any other function that requires a li
 
 """
 
+from functools import lru_cache
+from sys import intern
+import numpy as np
+
 import biobuild.utils as utils
 import biobuild.structural.neighbors as neighbors
 
 __all__ = ["Linkage", "recipe", "patch", "linkage"]
 
+_PREFIX_TO_SIDE = {"1": "target", "2": "source"}
+"""
+The structure (target or source) that is indicated by the prefix of an atom ID
+"""
+
+_SIDES = frozenset(("target", "source"))
+"""
+The valid values for the `_from` argument of `Linkage.add_delete`
+"""
+
 
 def patch(
     atom1,
@@ -150,14 +164,13 @@ def patch(
     Linkage
         The new linkage.
     """
-    return linkage(
-        atom1,
-        atom2,
+    return Linkage(
+        id=id,
+        description=description,
+        bond=(atom1, atom2),
         delete_in_target=delete_in_target,
         delete_in_source=delete_in_source,
         internal_coordinates=internal_coordinates,
-        id=id,
-        description=description,
     )
 
 
@@ -196,13 +209,12 @@ def recipe(
     Linkage
         The new linkage.
     """
-    return linkage(
-        atom1,
-        atom2,
-        delete_in_target=delete_in_target,
-        delete_in_source=delete_in_source,
+    return Linkage(
         id=id,
         description=description,
+        bond=(atom1, atom2),
+        delete_in_target=delete_in_target,
+        delete_in_source=delete_in_source,
     )
 
 
@@ -252,31 +264,14 @@ def linkage(
     Linkage
         The new linkage instance.
     """
-    # make a new linkage
-    new_linkage = Linkage(id=id, description=description)
-
-    # add the bond
-    new_linkage.add_bond(utils.abstract.AbstractBond(atom1, atom2))
-
-    # add the atoms to delete
-    if delete_in_target is not None:
-        for i in delete_in_target:
-            new_linkage.add_delete(i, "target")
-    if delete_in_source is not None:
-        for i in delete_in_source:
-            new_linkage.add_delete(i, "source")
-
-    # add the internal coordinates
-    if internal_coordinates is not None:
-        if not isinstance(internal_coordinates, dict):
-            raise TypeError(
-                "The internal coordinates must be provided as a dictionary."
-            )
-        for ic in _dict_to_ics(internal_coordinates):
-            new_linkage.add_internal_coordinates(ic)
-
-    # return the linkage
-    return new_linkage
+    return Linkage(
+        id=id,
+        description=description,
+        bond=(atom1, atom2),
+        delete_in_target=delete_in_target,
+        delete_in_source=delete_in_source,
+        internal_coordinates=internal_coordinates,
+    )
 
 
 class Linkage(utils.abstract.AbstractEntity_with_IC):
@@ -289,6 +284,15 @@ class Linkage(utils.abstract.AbstractEntity_with_IC):
         The ID of the linkage.
     description : str, optional
         An additional description of the linkage.
+    bond : tuple of str, optional
+        The atom IDs of the target and source atoms to connect.
+    delete_in_target : str or tuple of str, optional
+        The atom(s) in the first (target) molecule to delete.
+    delete_in_source : str or tuple of str, optional
+        The atom(s) in the second (source) molecule to delete.
+    internal_coordinates : dict, optional
+        The internal coordinates of the atoms in the immediate vicinity of the newly formed bond.
+        See the `linkage` function for the expected format.
 
     Attributes
     ----------
@@ -305,13 +309,54 @@ class Linkage(utils.abstract.AbstractEntity_with_IC):
         first structure (target) and the second one from the second structure (source)
     atoms : list of str
         The atom IDs of the atoms in the linkage.
+    ic_arrays : tuple
+        The internal coordinates in array form (see `Linkage.ic_arrays`).
     """
 
-    def __init__(self, id=None, description: str = None) -> None:
+    _ic_arrays = None
+
+    def __init__(
+        self,
+        id=None,
+        description: str = None,
+        bond: tuple = None,
+        delete_in_target=None,
+        delete_in_source=None,
+        internal_coordinates: dict = None,
+    ) -> None:
         super().__init__(id)
-        self._delete_ids = []
+        self._delete_target = []
+        self._delete_source = []
         self.description = description
 
+        if bond is not None:
+            self.add_bond(utils.abstract.AbstractBond(*map(_intern, bond)))
+
+        if delete_in_target is not None:
+            for i in delete_in_target:
+                self.add_delete(i, "target")
+        if delete_in_source is not None:
+            for i in delete_in_source:
+                self.add_delete(i, "source")
+
+        if internal_coordinates is not None:
+            if not isinstance(internal_coordinates, dict):
+                raise TypeError(
+                    "The internal coordinates must be provided as a dictionary."
+                )
+            self.add_internal_coordinates_many(_cached_dict_to_ics(internal_coordinates))
+
+    def __setstate__(self, state):
+        # linkages pickled before the target/source split store
+        # their deletes as a single list of "1"/"2" prefixed ids
+        legacy = state.pop("_delete_ids", None)
+        self.__dict__.update(state)
+        if legacy is not None:
+            self._delete_target = []
+            self._delete_source = []
+            for i in legacy:
+                self.add_delete(i)
+
     @property
     def atom1(self) -> str:
         """
@@ -429,11 +474,52 @@ class Linkage(utils.abstract.AbstractEntity_with_IC):
         contains the atom IDs to delete from the
         first structure (target) and the second one from the second structure (source)
         """
-        deletes = (
-            [i[1:] for i in self._delete_ids if i[0] == "1"],
-            [i[1:] for i in self._delete_ids if i[0] == "2"],
-        )
-        return deletes
+        return (self._delete_target, self._delete_source)
+
+    @property
+    def _delete_ids(self):
+        """
+        The atom IDs to delete with a `1` (target) or `2` (source) prefix
+        """
+        return [_prefix_id("1", i) for i in self._delete_target] + [
+            _prefix_id("2", i) for i in self._delete_source
+        ]
+
+    @property
+    def ic_arrays(self):
+        """
+        The internal coordinates of the linkage as a set of parallel arrays
+        (one entry per internal coordinate), for vectorized geometric operations.
+
+        Returns
+        -------
+        atoms : list of tuple
+            The ids of the four atoms of each internal coordinate.
+        values : np.ndarray
+            An (N, 5) array with the two bond lengths (1-2 or 1-3 for impropers, and 3-4),
+            the two bond angles (1-2-3 and 2-3-4) and the dihedral of each internal coordinate.
+            Missing values are NaN.
+        impropers : np.ndarray
+            A boolean array that is True for improper internal coordinates.
+        """
+        ics = self.internal_coordinates
+        if self._ic_arrays is None or len(self._ic_arrays[0]) != len(ics):
+            n = len(ics)
+            atoms = [ic.ids for ic in ics]
+            values = np.fromiter(
+                (
+                    np.nan if v is None else v
+                    for ic in ics
+                    for v in (*ic.lengths, *ic.angles, ic.dihedral)
+                ),
+                dtype=np.float64,
+                count=5 * n,
+            ).reshape(n, 5)
+            impropers = np.fromiter(
+                (bool(ic.improper) for ic in ics), dtype=bool, count=n
+            )
+            self._ic_arrays = (atoms, values, impropers)
+        return self._ic_arrays
 
     def add_delete(self, id, _from: str = None):
         """
@@ -449,26 +535,24 @@ class Linkage(utils.abstract.AbstractEntity_with_IC):
             the structure is inferred from the atom ID, in which case either `1` (target) or `2` (source) must be the first character of the ID.
         """
         if _from is None:
-            if not id[0] in ["1", "2"]:
+            _from = _PREFIX_TO_SIDE.get(id[0])
+            if _from is None:
                 raise ValueError(
                     "The atom ID must start with either 1 or 2 to indicate from which structure it is to be deleted."
                 )
+            id = id[1:]
+        elif _from not in _SIDES:
+            raise ValueError("The _from argument must be either 'source' or 'target'.")
+
+        if isinstance(id, str):
+            id = intern(id)
         else:
-            if _from == "source":
-                if isinstance(id, str):
-                    id = "2" + id
-                else:
-                    id = ("2", *id)
-            elif _from == "target":
-                if isinstance(id, str):
-                    id = "1" + id
-                else:
-                    id = ("1", *id)
-            else:
-                raise ValueError(
-                    "The _from argument must be either 'source' or 'target'."
-                )
-        self._delete_ids.append(id)
+            id = tuple(id)
+
+        if _from == "target":
+            self._delete_target.append(id)
+        else:
+            self._delete_source.append(id)
 
     add_id_to_delete = add_delete
 
@@ -513,8 +597,30 @@ class Linkage(utils.abstract.AbstractEntity_with_IC):
             ic.atom3 = prefix(ic.atom3)
             ic.atom4 = prefix(ic.atom4)
 
+        self._ic_arrays = None
         return super().add_internal_coordinates(ic)
 
+    def add_internal_coordinates_many(self, ics):
+        """
+        Add multiple internal coordinates at once.
+
+        Internal coordinates that are already `InternalCoordinates` instances
+        referencing atoms by (prefixed) string ids are added directly.
+        Any other inputs are passed through `add_internal_coordinates` one by one.
+
+        Parameters
+        ----------
+        ics : iterable
+            The internal coordinates to add.
+        """
+        ics = list(ics)
+        IC = utils.ic.InternalCoordinates
+        if all(isinstance(ic, IC) and isinstance(ic.atom1, str) for ic in ics):
+            self._ic_arrays = None
+            return super().add_internal_coordinates_many(ics)
+        for ic in ics:
+            self.add_internal_coordinates(ic)
+
     def to_json(self, filename: str):
         """
         Write the `Linkage` instance to a JSON file.
@@ -540,36 +646,92 @@ class Linkage(utils.abstract.AbstractEntity_with_IC):
         return hash(self.id) + hash(tuple(self.bonds))
 
 
+def _intern(id):
+    """
+    Intern an atom ID string so that identical IDs share one string object
+    (other objects are returned unchanged)
+    """
+    if isinstance(id, str):
+        return intern(id)
+    return id
+
+
+def _prefix_id(prefix, id):
+    """
+    Add a `1` or `2` prefix to an atom ID (or tuple of IDs)
+    """
+    if isinstance(id, str):
+        return prefix + id
+    return (prefix, *id)
+
+
 def _dict_to_ics(_dict):
     """
     Convert a dictionary of internal coordinates to a list of `InternalCoordinate` instances.
     """
-    ics = []
     for key, value in _dict.items():
-        if len(key) == 4 and len(value) == 6:
-            improper = value[-1]
-
-            ic = utils.ic.InternalCoordinates(
-                *key,
-                bond_length_12=value[0] if not improper else None,
-                bond_length_13=value[0] if improper else None,
-                bond_length_34=value[1],
-                bond_angle_123=value[2],
-                bond_angle_234=value[3],
-                dihedral=value[4],
-                improper=improper,
-            )
-        elif len(key) != 4:
+        if len(key) != 4:
             raise ValueError(
                 "The internal coordinate must be provided as a tuple of four atom IDs."
             )
-        elif len(value) != 6:
+        if len(value) != 6:
             raise ValueError(
                 "The internal coordinate must be provided as a tuple of six values."
             )
-        ics.append(ic)
 
-    return ics
+    IC = utils.ic.InternalCoordinates
+    return [
+        IC(
+            *map(_intern, key),
+            bond_length_12=value[0] if not value[5] else None,
+            bond_length_13=value[0] if value[5] else None,
+            bond_length_34=value[1],
+            bond_angle_123=value[2],
+            bond_angle_234=value[3],
+            dihedral=value[4],
+            improper=value[5],
+        )
+        for key, value in _dict.items()
+    ]
+
+
+def _cached_dict_to_ics(_dict):
+    """
+    Convert a dictionary of internal coordinates to a list of new `InternalCoordinate` instances,
+    re-using the checked and interned arguments made for an identical dictionary before.
+    """
+    try:
+        frozen = tuple((tuple(key), tuple(value)) for key, value in _dict.items())
+        arguments = _frozen_to_ic_arguments(frozen)
+    except TypeError:
+        # unhashable entries cannot be cached
+        return _dict_to_ics(_dict)
+    IC = utils.ic.InternalCoordinates
+    return [IC(*ids, **dict(values)) for ids, values in arguments]
+
+
+@lru_cache(maxsize=1024)
+def _frozen_to_ic_arguments(frozen: tuple) -> tuple:
+    """
+    The cached core of `_cached_dict_to_ics` that works with a hashable version of the dictionary.
+    It only keeps the (immutable) arguments of the internal coordinates, so that every linkage gets
+    its own `InternalCoordinate` instances.
+    """
+    return tuple(
+        (
+            (ic.atom1, ic.atom2, ic.atom3, ic.atom4),
+            (
+                ("bond_length_12", ic.bond_length_12),
+                ("bond_length_13", ic.bond_length_13),
+                ("bond_length_34", ic.bond_length_34),
+                ("bond_angle_123", ic.bond_angle_123),
+                ("bond_angle_234", ic.bond_angle_234),
+                ("dihedral", ic.dihedral),
+                ("improper", ic.improper),
+            ),
+        )
+        for ic in _dict_to_ics(dict(frozen))
+    )
 
 
 if __name__ == "__main__":
@@ -241,6 +241,12 @@ They work exactly like their `add_` counterparts, but instead of adding, they re
         # now update the graph
         glc.update_atom_graph()
 
+    Unlike the `AtomGraph`, the molecule's `coords` array, which holds all atom coordinates in one contiguous block
+    (each atom's `coord` is a view into one of its rows), is rebuilt automatically whenever atoms were added, removed,
+    or had their `coord` re-assigned, so in-place changes such as `atom.coord += shift` or `glc.coords += shift` are
+    always reflected on both sides. The precision of the coordinates can be set using `astype` (e.g. `glc.astype(np.float32)`),
+    which is kept when atoms are added and when the molecule is copied, saved, and loaded again.
+
 
 Adjusting labelling
 -------------------
@@ -455,8 +461,11 @@ at every `attach` call or if we want to use the `+` operator, we can set the def
     my_molecule.attach_residue = -2  
 """
 
+from collections import OrderedDict
 from copy import deepcopy
+from functools import lru_cache
 import os
+import re
 from typing import Union
 
 import numpy as np
@@ -619,21 +628,59 @@ def query_pubchem(query: str, by: str = "name") -> "Molecule":
     """
     try:
         return Molecule.from_pubchem(query, by=by)
-    except:
+    except Exception:
         return None
 
 
-def molecule(mol=None) -> "Molecule":
+_molecule_cache = OrderedDict()
+"""
+Molecules that were generated by `molecule` from files, SMILES or PubChem queries
+(maps a key derived from the input string to the generated molecule, in order of last use)
+"""
+
+_MOLECULE_CACHE_SIZE = 64
+"""
+The maximal number of molecules that are kept in the `molecule` cache
+"""
+
+_smiles_pattern = re.compile(r"(?:\[[^\]]*\]|Cl|Br|[BCNOPSFIbcnops]|[0-9%=#+\-()/\\@.:*$~])+")
+"""
+Pattern of strings that may be SMILES (bracket atoms, the organic subset, bonds, rings and branches).
+"""
+
+_file_loaders = {
+    ".pdb": "from_pdb",
+    ".cif": "from_cif",
+    ".pkl": "load",
+    ".json": "from_json",
+    ".mol": "from_molfile",
+    ".mol2": "from_molfile",
+    ".sdf": "from_molfile",
+    ".sd": "from_molfile",
+}
+"""
+The `Molecule` classmethods used by `molecule` to read files (by file extension)
+"""
+
+
+def molecule(mol=None, ignore_cache: bool = False) -> "Molecule":
     """
     Generate a molecule from an input. If the input is a string, the string can be a PDB id, some filename, SMILES or InChI string, IUPAC name or abbreviation.
     This function will try its best to automatically generate the molecule with minimal user effort. However, using a dedicated classmethod is
     recommended for more efficient and predictable results.
 
+    Note
+    ----
+    Molecules generated from files, SMILES or PubChem queries are cached, and repeated calls with the same input return a copy
+    of the cached molecule (files are only re-read if they were modified in the meantime).
+
     Parameters
     ----------
     mol : str or structure-like object
         An input string or structure-like object such as a BioPython Structure or RDKit Molecule, etc.
         If nothing is provided, a new empty molecule is generated.
+    ignore_cache : bool
+        If True, the molecule is generated anew from the input, even if it was generated before.
 
     Returns
     -------
@@ -676,36 +723,78 @@ def molecule(mol=None) -> "Molecule":
     if resources.has_compound(mol):
         return resources.get_compound(mol)
 
+    key = _molecule_cache_key(mol)
+    if not ignore_cache and key in _molecule_cache:
+        _molecule_cache.move_to_end(key)
+        return _molecule_cache[key].copy()
+
+    new = _molecule_from_string(mol)
+    if new is not None:
+        _molecule_cache[key] = new.copy()
+        _molecule_cache.move_to_end(key)
+        if len(_molecule_cache) > _MOLECULE_CACHE_SIZE:
+            _molecule_cache.popitem(last=False)
+        return new
+
+    raise ValueError(f"Could not generate molecule from input: {mol}")
+
+
+def _molecule_cache_key(mol: str) -> tuple:
+    """
+    Get the key under which the molecule generated from an input string is cached by `molecule`.
+    Files are identified by their path and modification time, SMILES by their canonical form
+    (if RDKit is available), and other queries (e.g. names or ids) regardless of case and spacing.
+    """
     if os.path.isfile(mol):
-        _mol = mol.lower()
-        if _mol.endswith(".pdb"):
-            return Molecule.from_pdb(mol)
-        elif _mol.endswith(".cif"):
-            return Molecule.from_cif(mol)
-        elif _mol.endswith(".pkl"):
-            return Molecule.load(mol)
-        elif _mol.endswith(".json"):
-            return Molecule.from_json(mol)
-        elif (
-            _mol.endswith(".mol")
-            or _mol.endswith(".mol2")
-            or _mol.endswith(".sdf")
-            or _mol.endswith(".sd")
-        ):
-            return Molecule.from_molfile(mol)
+        return ("file", os.path.abspath(mol), os.path.getmtime(mol))
+    return _query_cache_key(mol)
+
+
+@lru_cache(maxsize=1024)
+def _query_cache_key(mol: str) -> tuple:
+    """
+    The core of `_molecule_cache_key` for inputs that are not files.
+    The key of each input string is only computed once, so repeated inputs are looked up directly.
+    """
+    query = mol.strip()
+    if not _smiles_pattern.fullmatch(query):
+        # this cannot be a SMILES, so the case does not matter
+        return ("query", " ".join(query.split()).upper())
+
+    if utils.auxiliary.HAS_RDKIT:
+        # not every string of SMILES characters is a SMILES, so RDKit should not complain about them
+        utils.auxiliary.RDLogger.DisableLog("rdApp.*")
+        try:
+            rdmol = utils.auxiliary.Chem.MolFromSmiles(query)
+        finally:
+            utils.auxiliary.RDLogger.EnableLog("rdApp.*")
+        if rdmol is not None:
+            return ("smiles", utils.auxiliary.Chem.MolToSmiles(rdmol))
+    return ("smiles", query)
+
+
+def _molecule_from_string(mol: str) -> "Molecule":
+    """
+    Generate a molecule from a filename, SMILES string or PubChem query
+    (the uncached core of `molecule`). Returns None if no molecule could be generated.
+    """
+    if os.path.isfile(mol):
+        loader = _file_loaders.get(os.path.splitext(mol)[1].lower())
+        if loader is not None:
+            return getattr(Molecule, loader)(mol)
 
     if " " not in mol:
         try:
             return Molecule.from_smiles(mol)
-        except:
+        except Exception:
             pass
 
     try:
         return Molecule.from_pubchem(mol)
-    except:
+    except Exception:
         pass
 
-    raise ValueError(f"Could not generate molecule from input: {mol}")
+    return None
 
 
 def polymerize(
@@ -771,7 +860,9 @@ def connect(
         Whether to copy the first molecule before connecting
     copy_b : bool
         Whether to copy the second molecule before connecting.
-        If False, all atoms of the second molecule will be added to the first molecule.
+        If False, the atoms of the second molecule are moved out of it and into the first molecule
+        (they are no longer copied), which saves a copy but leaves the second molecule without
+        the moved atoms. It should therefore not be used anymore afterward.
     _topology : CHARMMTopology
         A specific topology to use in case a pre-existing patch is used as link and only the string identifier
         is supplied.
@@ -784,14 +875,13 @@ def connect(
     Molecule
         The connected molecule
     """
-    if copy_b:
-        mol_b = mol_b.copy()
     new = mol_a.attach(
         mol_b,
         link,
         at_residue=at_residue_a,
         other_residue=at_residue_b,
         inplace=not copy_a,
+        other_inplace=not copy_b,
         _topology=_topology,
         use_patch=use_patch,
     )
@@ -897,6 +987,9 @@ class Molecule(entity.BaseEntity):
         valid identifier for a model in the structure, such as an integer or string.
     chain : str
         The chain to use from the structure. Defaults to the first chain in the structure.
+    dtype : np.dtype
+        The floating point type in which to store the atom coordinates (e.g. `np.float32`).
+        By default, the type of the given atom coordinates is used. See `astype`.
     """
 
     def __init__(
@@ -905,8 +998,11 @@ class Molecule(entity.BaseEntity):
         root_atom: Union[str, int, entity.base_classes.Atom] = None,
         model: int = 0,
         chain: str = None,
+        dtype=None,
     ):
         super().__init__(structure, model)
+        if dtype is not None:
+            self.astype(dtype)
 
         if not chain or len(self._model.child_list) == 1:
             self._working_chain = self._model.child_list[0]
@@ -974,10 +1070,7 @@ class Molecule(entity.BaseEntity):
             id = utils.filename_to_id(filename)
         struct = utils.defaults.__bioPDBParser__.get_structure(id, filename)
         new = cls(struct, root_atom, model=model, chain=chain)
-        bonds = utils.pdb.parse_connect_lines(filename)
-        if len(bonds) != 0:
-            for b in bonds:
-                new.add_bond(*b)
+        new._add_serial_bonds(utils.pdb.parse_connect_lines(filename))
         return new
 
     @classmethod
@@ -1163,10 +1256,9 @@ class Molecule(entity.BaseEntity):
                 direct_connections = super().get_residue_connections(
                     residue_a=residue_a, residue_b=residue_b, triplet=False
                 )
-                direct_connections1, direct_connections2 = set(
-                    a for a, b in direct_connections
-                ), set(b for a, b in direct_connections)
-                direct_connections = direct_connections1.union(direct_connections2)
+                direct_connections = {
+                    atom for bond in direct_connections for atom in bond
+                }
             bonds = self._direct_bonds(bonds, direct_by, direct_connections)
         return bonds
 
@@ -1196,20 +1288,24 @@ class Molecule(entity.BaseEntity):
         if not link and not self._linkage:
             raise RuntimeError("Cannot multiply a molecule without a patch defined")
 
-        _other = self.copy()
+        # each attach works on a copy of the other molecule anyway, so the original
+        # can serve as the repeating unit as long as it is not the one growing
         if not inplace:
             obj = self.copy()
+            _other = self
         else:
             obj = self
+            _other = self.copy()
 
         _patch = obj._linkage
-        if link:
+        restore = link and link is not _patch
+        if restore:
             obj % link
 
         for i in range(n - 1):
             obj += _other
 
-        if _patch:
+        if restore and _patch:
             obj % _patch
 
         return obj
@@ -1654,17 +1750,7 @@ class Molecule(entity.BaseEntity):
         """
         if not self._linkage:
             raise RuntimeError("Cannot multiply a molecule without a patch defined")
-
-        if not isinstance(n, int):
-            raise TypeError("Can only multiply a molecule by an integer")
-        if n <= 0:
-            raise ValueError("Can only multiply a molecule by a positive integer")
-
-        new = self.attach(self, self._linkage, inplace=False, other_inplace=False)
-        for i in range(n - 2):
-            new = new.attach(self, self._linkage, inplace=True, other_inplace=False)
-
-        return new
+        return self.repeat(n, inplace=False)
 
     def __imul__(self, n) -> "Molecule":
         """
@@ -1714,16 +1800,24 @@ def _molecule_from_pubchem(id, comp):
     # residue = bio.Residue.Residue((" ", 1, " "), "UNK", 1)
     # chain.add(residue)
 
+    atoms = comp.atoms
+    coords = np.fromiter(
+        ((atom.x, atom.y, atom.z) for atom in atoms),
+        dtype=np.dtype((np.float64, 3)),
+        count=len(atoms),
+    )
+
     element_counts = {}
     adx = 1
-    for atom in comp.atoms:
+    _atoms = []
+    for atom, coord in zip(atoms, coords):
         element = atom.element
         element_counts[element] = element_counts.get(element, 0) + 1
 
         id = f"{element}{element_counts[element]}"
         _atom = entity.base_classes.Atom(
             id,
-            coord=np.array((atom.x, atom.y, atom.z)),
+            coord=coord,
             serial_number=adx,
             bfactor=0.0,
             occupancy=0.0,
@@ -1732,11 +1826,21 @@ def _molecule_from_pubchem(id, comp):
             altloc=" ",
             pqr_charge=0.0,
         )
-        residue.add(_atom)
+        _atom.parent = residue
+        _atoms.append(_atom)
         adx += 1
 
-    for bond in bonds:
-        mol.add_bond(bond.aid1, bond.aid2, bond.order)
+    # the atoms are all new (with unique ids), so they can be added to the
+    # residue in one go rather than checking each for duplicates in residue.add
+    residue.child_list.extend(_atoms)
+    residue.child_dict.update((atom.get_id(), atom) for atom in _atoms)
+
+    # the atoms' coords are already rows of one array, which can
+    # therefore serve as the molecule's coordinate block right away
+    mol._coords = coords
+    mol._coord_atoms = _atoms
+    mol._coord_epoch = entity._coord_epoch(mol._model)
+    mol._add_serial_bonds((bond.aid1, bond.aid2, bond.order) for bond in bonds)
 
     return mol
 
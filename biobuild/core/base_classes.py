@@ -51,6 +51,18 @@ import periodictable as pt
 __all__ = ["Atom", "Residue", "Chain", "Model", "Structure", "Bond"]
 
 
+def _touch_coords(entity):
+    """
+    Mark the atom coordinates of the model that an atom, residue or chain belongs to as changed,
+    so that molecules using the model know to rebuild their coordinate array.
+    """
+    while entity is not None:
+        if getattr(entity, "level", None) == "M":
+            entity._coord_epoch = getattr(entity, "_coord_epoch", 0) + 1
+            return
+        entity = getattr(entity, "parent", None)
+
+
 class ID:
     """
     The base class for Biobuild's internal object identification.
@@ -128,7 +140,7 @@ class Atom(ID, bio.Atom.Atom):
         "parent",
         "name",
         "fullname",
-        "coord",
+        "_coord",
         "mass",
         "serial_number",
         "bfactor",
@@ -191,6 +203,26 @@ class Atom(ID, bio.Atom.Atom):
     def full_id(self, value):
         pass
 
+    @property
+    def coord(self):
+        return self._coord
+
+    @coord.setter
+    def coord(self, value):
+        self._coord = value
+        _touch_coords(self)
+
+    def set_parent(self, parent):
+        # the full id is a computed property, so unlike biopython
+        # there is nothing to pre-compute here when linking the parent
+        _touch_coords(self)
+        self.parent = parent
+        _touch_coords(self)
+
+    def detach_parent(self):
+        _touch_coords(self)
+        self.parent = None
+
     @classmethod
     def from_biopython(cls, atom) -> "Atom":
         """
@@ -268,8 +300,9 @@ class Atom(ID, bio.Atom.Atom):
             >= pt.elements.symbol(other.element.title()).number
         )
 
-    def __hash__(self):
-        return ID.__hash__(self)
+    # atoms are hashed by the millions (graphs, sets, lookup dicts), so
+    # rather than a wrapper around ID.__hash__ the method itself is used
+    __hash__ = ID.__hash__
 
     # def __eq__(self, other):
     #     return self.serial_number == other.serial_number and (
@@ -358,6 +391,15 @@ class Residue(ID, bio.Residue.Residue):
     def coord(self, value):
         self._coord = value
 
+    def set_parent(self, parent):
+        _touch_coords(self)
+        super().set_parent(parent)
+        _touch_coords(self)
+
+    def detach_parent(self):
+        _touch_coords(self)
+        super().detach_parent()
+
     # def add(self, atom):
     #     if atom.get_id() not in self.child_dict:
     #         self.child_list.append(atom)
@@ -464,6 +506,15 @@ class Chain(ID, bio.Chain.Chain):
         super(bio.Chain.Chain, self).__init__(id)
         self.level = "C"
 
+    def set_parent(self, parent):
+        _touch_coords(self)
+        super().set_parent(parent)
+        _touch_coords(self)
+
+    def detach_parent(self):
+        _touch_coords(self)
+        super().detach_parent()
+
     @property
     def full_id(self):
         p = self.get_parent()
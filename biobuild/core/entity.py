@@ -6,6 +6,8 @@ The ``Molecule`` class adds additional features on top.
 
 from copy import deepcopy
 from typing import Union
+import copyreg
+import pickle
 import warnings
 
 import Bio.PDB as bio
@@ -18,6 +20,20 @@ import biobuild.graphs as graphs
 import biobuild.resources as resources
 import biobuild.core.base_classes as base_classes
 
+_atom_table_dtype = np.dtype(
+    [
+        ("serial", "i4"),
+        ("name", "U4"),
+        ("element", "U2"),
+        ("resid", "i4"),
+        ("chain", "U4"),
+        ("coord", "f8", (3,)),
+    ]
+)
+"""
+The record layout of `BaseEntity._atom_table`
+"""
+
 
 class BaseEntity:
     """
@@ -41,6 +57,12 @@ class BaseEntity:
         "_working_chain",
         "_root_atom",
         "_attach_residue",
+        "_coords",
+        "_coord_atoms",
+        "_coord_epoch",
+        "_coord_dtype",
+        "_atom_index",
+        "_connections",
     )
 
     def __init__(self, structure, model: int = 0):
@@ -68,6 +90,17 @@ class BaseEntity:
         self._root_atom = None
         self._attach_residue = None
 
+        # the contiguous coordinate block and the lookup
+        # index for atoms and residues are only built on demand
+        self._coords = None
+        self._coord_atoms = None
+        self._coord_epoch = None
+        self._coord_dtype = None
+        self._atom_index = None
+
+        # the residue connections are cached until bonds, atoms or residues change
+        self._connections = None
+
     @classmethod
     def from_pdb(
         cls,
@@ -90,10 +123,7 @@ class BaseEntity:
             id = utils.filename_to_id(filename)
         struct = utils.defaults.__bioPDBParser__.get_structure(id, filename)
         new = cls(struct)
-        bonds = utils.pdb.parse_connect_lines(filename)
-        if len(bonds) != 0:
-            for b in bonds:
-                new.add_bond(*b)
+        new._add_serial_bonds(utils.pdb.parse_connect_lines(filename))
         return new
 
     @classmethod
@@ -274,6 +304,10 @@ class BaseEntity:
             Path to the file
         """
         obj = utils.load_pickle(filename)
+        if isinstance(obj, tuple) and len(obj) == 2:
+            obj, coords = obj
+            if isinstance(obj, BaseEntity):
+                obj._restore_coords(coords)
         if obj.__class__.__name__ != cls.__name__:
             raise TypeError(
                 f"Object loaded from {filename} is not a {cls.__name__} but a {type(obj)}"
@@ -349,6 +383,7 @@ class BaseEntity:
 
     @bonds.setter
     def bonds(self, value):
+        self._connections = None
         if value is None or len(value) == 0:
             self._bonds.clear()
             self._AtomGraph.clear_edges()
@@ -369,7 +404,7 @@ class BaseEntity:
         if value is None or len(value) == 0:
             self._AtomGraph._locked_edges.clear()
         elif isinstance(value, set):
-            self._AtomGraph._locked_edges = value
+            self._AtomGraph._locked_edges = graphs.BaseGraph._EdgeSet(value)
         else:
             raise TypeError("locked_bonds must be a set")
 
@@ -395,6 +430,56 @@ class BaseEntity:
         return sorted(self._AtomGraph.nodes)
         # return list(self._model.get_atoms())
 
+    @property
+    def coords(self) -> np.ndarray:
+        """
+        The coordinates of all atoms as one contiguous (N, 3) array,
+        in the same order as `get_atoms()`.
+
+        Each atom's `coord` is a view into a row of this array, so
+        in-place changes to either are reflected in both. If atoms were
+        added or removed, or an atom's `coord` was re-assigned, the array
+        is rebuilt on the next access.
+        """
+        # atoms note any change of their coordinates or parents in the model,
+        # so the array is valid as long as the model has not noted any changes since it was built
+        if getattr(self, "_coords", None) is None or self._coord_epoch != _coord_epoch(
+            self._model
+        ):
+            self._rebuild_coord_block()
+        return self._coords
+
+    def astype(self, dtype):
+        """
+        Store the atom coordinates with a given floating point precision.
+        The precision is kept when atoms are added or the coordinate array is rebuilt
+        (until `astype` is called again).
+
+        Note
+        ----
+        `float32` is plenty for the 0.001 Å resolution of PDB files and halves the
+        memory of the coordinates. `float16` is only precise to about 0.01 Å at typical
+        coordinate magnitudes, so it should only be used for storage or visualization purposes.
+
+        Parameters
+        ----------
+        dtype : np.dtype or str
+            The floating point type to use, e.g. `np.float32`.
+            If None is given, the type of the atom coordinates is used again.
+
+        Returns
+        -------
+        self
+            The same object, with converted coordinates
+        """
+        if dtype is not None:
+            dtype = np.dtype(dtype)
+            if dtype.kind != "f":
+                raise ValueError(f"Coordinates must be floating point, got '{dtype}'")
+        self._coord_dtype = dtype
+        self._rebuild_coord_block()
+        return self
+
     def get_atom_triplets(self):
         """
         Compute triplets of three consequtively bonded atoms
@@ -558,7 +643,30 @@ class BaseEntity:
         filename : str
             Path to the PDB file
         """
-        utils.save_pickle(self, filename)
+        # the coordinates are stored once as a single contiguous array
+        # instead of as one small numpy array per atom
+        coords = self.coords
+        atoms = self._coord_atoms
+        for atom in atoms:
+            atom.coord = None
+        try:
+            with open(filename, "wb") as f:
+                pickle.dump((self, coords), f, protocol=5)
+        finally:
+            self._restore_coords(coords, atoms)
+
+    def _restore_coords(self, coords: np.ndarray, atoms: list = None):
+        """
+        Let each atom's `coord` point to its row in a coordinate block
+        (in the order of `get_atoms()`) and use the block as the molecule's `coords`.
+        """
+        if atoms is None:
+            atoms = list(self._model.get_atoms())
+        for atom, coord in zip(atoms, coords):
+            atom.coord = coord
+        self._coords = coords
+        self._coord_atoms = atoms
+        self._coord_epoch = _coord_epoch(self._model)
 
     def show(self, residue_graph: bool = False):
         """
@@ -671,35 +779,152 @@ class BaseEntity:
     def copy(self):
         """
         Create a deepcopy of the molecule
+
+        Note
+        ----
+        The default linkage is a template that only refers to atoms by their ids.
+        Just like when it is set from the topology, it is shared with the copy rather than duplicated.
         """
-        new = deepcopy(self)
-        new._base_struct._new_id()
-        new._AtomGraph.clear()
-        for model in new._base_struct.child_list:
-            new._base_struct.child_dict.pop(model.get_id())
-            model._new_id()
-            new._base_struct.child_dict[model.get_id()] = model
-            for chain in model.child_list:
-                model.child_dict.pop(chain.get_id())
-                chain._new_id()
-                model.child_dict[chain.get_id()] = chain
-                for residue in chain.child_list:
-                    chain.child_dict.pop(residue.get_id())
-                    residue._new_id()
-                    chain.child_dict[residue.get_id()] = residue
-                    for atom in residue.child_list:
-                        residue.child_dict.pop(atom.get_id())
-                        atom._new_id()
-                        residue.child_dict[atom.get_id()] = atom
-        new._AtomGraph.add_nodes_from(new.get_atoms())
-        new._AtomGraph.add_edges_from(new.get_bonds())
-        for b in new.get_bonds():
-            b.atom1 = new.get_atom(b.atom1.serial_number)
-            b.atom2 = new.get_atom(b.atom2.serial_number)
-            new._AtomGraph.edges[b]["bond_order"] = b.order
-            new._AtomGraph.edges[b]["bond_obj"] = b
+        new = self.__class__.__new__(self.__class__)
+
+        # clone the structure hierarchy and keep track of which
+        # new object replaces which old one
+        mapping = {}
+        new._base_struct = _copy_structure(
+            self._base_struct, mapping, getattr(self, "_coord_dtype", None)
+        )
+        new._model = mapping[self._model]
+        new._id = self._id
+        new._working_chain = mapping.get(self._working_chain)
+        new._root_atom = mapping.get(self._root_atom)
+        new._attach_residue = mapping.get(self._attach_residue)
+        new._coords = None
+        new._coord_atoms = None
+        new._coord_epoch = None
+        new._coord_dtype = getattr(self, "_coord_dtype", None)
+        new._atom_index = None
+        new._connections = None
+
+        new._linkage = self._linkage
+        if getattr(self, "__dict__", None):
+            memo = {id(old): _new for old, _new in mapping.items()}
+            new.__dict__.update(deepcopy(self.__dict__, memo))
+
+        new._bonds = []
+        for b in self._bonds:
+            atom1 = mapping.get(b.atom1)
+            atom2 = mapping.get(b.atom2)
+            if atom1 is not None and atom2 is not None:
+                new._bonds.append(base_classes.Bond(atom1, atom2, b.order))
+        new._AtomGraph = graphs.AtomGraph(self._AtomGraph.id, [])
+        new._AtomGraph.add_nodes_from(new._model.get_atoms())
+        new._AtomGraph.add_edges_from(
+            (b.atom1, b.atom2, {"bond_order": b.order, "bond_obj": b})
+            for b in new._bonds
+        )
+        # the copied atoms have new ids, so the edges are keyed anew
+        new._AtomGraph._locked_edges = graphs.BaseGraph._EdgeSet(
+            (mapping[a], mapping[b])
+            for a, b in self._AtomGraph._locked_edges
+            if a in mapping and b in mapping
+        )
         return new
 
+    @property
+    def _atom_table(self) -> np.recarray:
+        """
+        A snapshot of the atoms' serial numbers, names, elements, residue seqids,
+        chain ids and coordinates as a numpy record array (in the same order as `get_atoms()`).
+        This is rebuilt on every access and is meant for vectorized bulk queries.
+        """
+        coords = self.coords
+        table = np.recarray(len(coords), dtype=_atom_table_dtype)
+        atoms = self._coord_atoms
+        table.serial = [atom.serial_number for atom in atoms]
+        table.name = [atom.id for atom in atoms]
+        table.element = [atom.element for atom in atoms]
+        table.resid = [atom.parent.id[1] for atom in atoms]
+        table.chain = [atom.parent.parent.id for atom in atoms]
+        table.coord = coords
+        return table
+
+    def _rebuild_coord_block(self, atoms: list = None):
+        """
+        Collect all atom coordinates into one contiguous array
+        and let each atom's `coord` point to its row in that array.
+        """
+        if atoms is None:
+            atoms = list(self._model.get_atoms())
+        values = np.array([atom.coord for atom in atoms])
+        dtype = getattr(self, "_coord_dtype", None)
+        if dtype is None:
+            dtype = values.dtype if values.dtype.kind == "f" else np.float64
+        block = np.empty((len(atoms), 3), dtype=dtype)
+        block[:] = values.reshape(-1, 3)
+        for atom, coord in zip(atoms, block):
+            atom.coord = coord
+        self._coords = block
+        self._coord_atoms = atoms
+        self._coord_epoch = _coord_epoch(self._model)
+
+    def _invalidate_caches(self):
+        """
+        Drop the coordinate block, lookup index and residue connections after atoms or residues were added or removed
+        """
+        self._coords = None
+        self._atom_index = None
+        self._connections = None
+        self._AtomGraph._invalidate_structure_cache()
+
+    def _build_atom_index(self) -> dict:
+        """
+        Build the index used for looking up atoms by serial number, id or full_id and residues by seqid.
+        Only the first match (in structure order) is stored for each key.
+        """
+        serials, ids, full_ids, seqids = {}, {}, {}, {}
+        for residue in self._model.get_residues():
+            seqids.setdefault(residue.id[1], residue)
+            residue_full_id = residue.get_full_id()
+            for atom in residue.child_list:
+                serials.setdefault(atom.serial_number, atom)
+                ids.setdefault(atom.id, atom)
+                full_ids.setdefault((*residue_full_id, (atom.name, atom.altloc)), atom)
+        self._atom_index = {
+            "serial": serials,
+            "id": ids,
+            "full_id": full_ids,
+            "seqid": seqids,
+        }
+        return self._atom_index
+
+    def _indexed_lookup(self, key, by: str):
+        """
+        Look up an atom (by 'serial', 'id' or 'full_id') or a residue (by 'seqid') in the index.
+        Since entities may also be edited directly, a hit is only trusted if it still
+        matches the key and belongs to the structure, otherwise the index is rebuilt.
+        """
+        index = getattr(self, "_atom_index", None)
+        if index is not None:
+            obj = index[by].get(key)
+            if obj is not None and _index_key(obj, by) == key and self._owns(obj):
+                return obj
+        return self._build_atom_index()[by].get(key)
+
+    def _owns(self, entity) -> bool:
+        """
+        Check whether an atom or residue is (still) part of the structure
+        """
+        # removed entities keep a reference to their former parent,
+        # so we need to check that each parent still lists the child
+        while entity.parent is not None:
+            parent = entity.parent
+            if parent.child_dict.get(entity.get_id()) is not entity:
+                return False
+            if parent is self._model:
+                return True
+            entity = parent
+        return False
+
     def get_attach_residue(self):
         """
         Get the residue that is used for attaching other molecules to this one.
@@ -832,7 +1057,7 @@ class BaseEntity:
         """
         atom1 = self.get_atom(atom1)
         atom2 = self.get_atom(atom2)
-        if (atom1, atom2) in self.locked_bonds:
+        if self._AtomGraph.is_locked(atom1, atom2):
             raise RuntimeError("Cannot rotate around a locked bond")
         if angle_is_degrees:
             angle = np.radians(angle)
@@ -986,25 +1211,22 @@ class BaseEntity:
         start_atomid : int
             The starting atom id
         """
-        cdx = start_chainid - 1
-        rdx = start_resid
-        adx = start_atomid
-
         chains = list(self.chains)
-        for chain in chains:
-            chain._id = utils.auxiliary.chain_id_maker(cdx)
-            cdx += 1
+        residues = [residue for chain in chains for residue in chain.child_list]
+        atoms = [atom for residue in residues for atom in residue.child_list]
 
-            for residue in chain.child_list:
-                # chain.child_dict.pop(residue.id)
-                residue.serial_number = rdx
-                # residue.id = (residue.id[0], rdx, *residue.id[2:])
-                rdx += 1
-                # chain.child_dict[residue._id] = residue
+        # compute all new labels at once and assign them in a single pass
+        resids = np.arange(start_resid, start_resid + len(residues)).tolist()
+        serials = np.arange(start_atomid, start_atomid + len(atoms)).tolist()
 
-                for atom in residue.child_list:
-                    atom.serial_number = adx
-                    adx += 1
+        for cdx, chain in enumerate(chains, start=start_chainid - 1):
+            chain._id = utils.auxiliary.chain_id_maker(cdx)
+        for residue, rdx in zip(residues, resids):
+            residue.serial_number = rdx
+        for atom, adx in zip(atoms, serials):
+            atom.serial_number = adx
+        self._atom_index = None
+        self._AtomGraph._invalidate_structure_cache()
 
         # update the atom graph
         # let's see iff all breaks if we don't do this
@@ -1019,9 +1241,9 @@ class BaseEntity:
         mol : Molecule
             The molecule to adjust the indexing of
         """
-        cdx = len(self.chains)
-        rdx = len(self.residues)
-        adx = sum(1 for i in self._model.get_atoms())
+        cdx = len(self._model.child_list)
+        rdx = sum(len(chain.child_list) for chain in self._model.child_list)
+        adx = sum(len(r.child_list) for r in self._model.get_residues())
         mol.reindex(cdx + 1, rdx + 1, adx + 1)
 
     def get_chains(self):
@@ -1257,10 +1479,14 @@ class BaseEntity:
             atom_gen = self._model.get_atoms
 
         if isinstance(atom, base_classes.Atom):
-            if atom in atom_gen():
+            # without a residue, ownership already tells whether the atom is part
+            # of the structure, so only a residue needs to be searched
+            if residue is None:
+                if self._owns(atom):
+                    return atom
+            elif atom in atom_gen():
                 return atom
-            else:
-                return self.get_atom(atom.full_id, by="full_id")
+            return self.get_atom(atom.full_id, by="full_id")
 
         if by is None:
             if isinstance(atom, (int, np.int64)):
@@ -1274,6 +1500,9 @@ class BaseEntity:
                     "Unknown search parameter, must be either 'id', 'serial' or 'full_id'"
                 )
 
+        if residue is None and by in ("id", "serial", "full_id"):
+            return self._indexed_lookup(atom, by)
+
         if by == "id":
             _atom = (i for i in atom_gen() if i.id == atom)
         elif by == "serial":
@@ -1399,7 +1628,7 @@ class BaseEntity:
             The residue
         """
         if isinstance(residue, base_classes.Residue):
-            if residue in self.residues:
+            if self._owns(residue):
                 return residue
             else:
                 return self.get_residue(residue.id[1], by="seqid", chain=chain)
@@ -1421,6 +1650,8 @@ class BaseEntity:
         elif by == "seqid":
             if residue < 0:
                 residue = len(self.residues) + residue + 1
+            if chain is None:
+                return self._indexed_lookup(residue, "seqid")
             _residue = (i for i in self._model.get_residues() if i.id[1] == residue)
         elif by == "full_id":
             _residue = (i for i in self._model.get_residues() if i.full_id == residue)
@@ -1485,6 +1716,7 @@ class BaseEntity:
             if adjust_seqid:
                 chain._id = utils.auxiliary.chain_id_maker(len(self.chains) + 1)
             self._model.add(chain)
+        self._AtomGraph._invalidate_structure_cache()
         return self
 
     def add_residues(
@@ -1510,8 +1742,11 @@ class BaseEntity:
             This is useful if you want to add the same residue to multiple molecules, while leaving
             them and their original parent structures intakt.
         """
-        rdx = len(self.residues)
-        adx = sum(1 for i in self._model.get_atoms())
+        rdx = 0
+        adx = 0
+        for residue in self._model.get_residues():
+            rdx += 1
+            adx += len(residue.child_list)
         for residue in residues:
             p = residue.get_parent()
             if p:
@@ -1536,6 +1771,7 @@ class BaseEntity:
                     adx += 1
                     atom.set_serial_number(adx)
                 self._AtomGraph.add_node(atom)
+        self._invalidate_caches()
         return self
 
     def remove_residues(self, *residues: Union[int, base_classes.Residue]) -> list:
@@ -1567,6 +1803,7 @@ class BaseEntity:
             residue.set_parent(chain)
 
             _residues.append(residue)
+        self._invalidate_caches()
         return _residues
 
     def rename_chain(self, chain: Union[str, base_classes.Chain], name: str):
@@ -1583,6 +1820,7 @@ class BaseEntity:
         if isinstance(chain, str):
             chain = next(i for i in self._model.get_chains() if i.id == chain)
         chain._id = name
+        self._AtomGraph._invalidate_structure_cache()
         return self
 
     def rename_residue(self, residue: Union[int, base_classes.Residue], name: str):
@@ -1599,6 +1837,7 @@ class BaseEntity:
         if isinstance(residue, int):
             residue = self._chain.child_list[residue - 1]
         residue.resname = name
+        self._AtomGraph._invalidate_structure_cache()
         return self
 
     def rename_atom(
@@ -1625,6 +1864,8 @@ class BaseEntity:
         # _old = atom.id
         atom.id = name
         atom.name = name
+        self._atom_index = None
+        self._AtomGraph._invalidate_structure_cache()
         # if p:
         #     p.child_dict.pop(_old)
         #     p.child_dict[name] = atom
@@ -1659,7 +1900,7 @@ class BaseEntity:
         else:
             target = self._chain.child_list[-1]
 
-        _max_serial = sum(1 for i in self._model.get_atoms())
+        _max_serial = sum(len(i.child_list) for i in self._model.get_residues())
         for atom in atoms:
             if _copy:
                 atom = atom.copy()
@@ -1667,6 +1908,7 @@ class BaseEntity:
             atom.set_serial_number(_max_serial)
             target.add(atom)
             self._AtomGraph.add_node(atom)
+        self._invalidate_caches()
         return self
 
     def remove_atoms(self, *atoms: Union[int, str, tuple, base_classes.Atom]) -> list:
@@ -1706,6 +1948,7 @@ class BaseEntity:
             adx += 1
             atom.serial_number = adx
 
+        self._invalidate_caches()
         return _atoms
 
     def add_bond(
@@ -1754,6 +1997,15 @@ class BaseEntity:
                 bond = bond.to_tuple()
             self._add_bond(*bond)
 
+    def _add_serial_bonds(self, bonds):
+        """
+        Add bonds between atoms given by their serial numbers, i.e. tuples of (serial1, serial2, order).
+        The atoms are looked up through the serial number index, rather than one search per bond.
+        """
+        serials = self._build_atom_index()["serial"]
+        for atom1, atom2, order in bonds:
+            self._add_bond(serials.get(atom1), serials.get(atom2), order)
+
     def remove_bond(
         self,
         atom1: Union[int, str, tuple, base_classes.Atom],
@@ -1899,8 +2151,7 @@ class BaseEntity:
         atom1 = self.get_atom(atom1)
         atom2 = self.get_atom(atom2)
 
-        bond = (atom1, atom2)
-        return bond in self.locked_bonds
+        return self._AtomGraph.is_locked(atom1, atom2)
 
     def infer_bonds(
         self, max_bond_length: float = None, restrict_residues: bool = True
@@ -1962,31 +2213,42 @@ class BaseEntity:
         list
             A set of tuples of atom pairs that are bonded and connect different residues
         """
-        bonds = (i for i in self.bonds if i[0].get_parent() != i[1].get_parent())
+        # connections across the whole structure are cached, since they are
+        # requested repeatedly (e.g. by optimizers) while the bonds stay the same
+        # (every method that changes bonds or residues clears the cache)
+        cache = residue_a is None and residue_b is None and not rotatable_only
+        if cache:
+            connections = getattr(self, "_connections", None)
+            if connections is None:
+                connections = self._connections = {}
+            cached = connections.get(triplet)
+            if cached is not None:
+                return list(cached)
+
+        bonds = (i for i in self._bonds if _crosses_residues(i.atom1, i.atom2))
 
         if residue_a is not None and residue_b is None:
-            residue_a = self.get_residues(residue_a)
+            residue_a = set(self.get_residues(residue_a))
             bonds = (
                 i
                 for i in bonds
-                if i[0].get_parent() in residue_a or i[1].get_parent() in residue_a
+                if i.atom1.parent in residue_a or i.atom2.parent in residue_a
             )
         elif residue_b is not None and residue_a is None:
-            residue_b = self.get_residues(residue_b)
+            residue_b = set(self.get_residues(residue_b))
             bonds = (
                 i
                 for i in bonds
-                if i[0].get_parent() in residue_b or i[1].get_parent() in residue_b
+                if i.atom1.parent in residue_b or i.atom2.parent in residue_b
             )
         elif residue_a is not None and residue_b is not None:
-            residue_a, residue_b = self.get_residues(residue_a), self.get_residues(
-                residue_b
-            )
+            residue_a = set(self.get_residues(residue_a))
+            residue_b = set(self.get_residues(residue_b))
             bonds = (
                 i
                 for i in bonds
-                if (i[0].get_parent() in residue_a and i[1].get_parent() in residue_b)
-                or (i[1].get_parent() in residue_a and i[0].get_parent() in residue_b)
+                if (i.atom1.parent in residue_a and i.atom2.parent in residue_b)
+                or (i.atom2.parent in residue_a and i.atom1.parent in residue_b)
             )
         if triplet:
             bonds = self._make_bond_triplets(bonds)
@@ -1994,10 +2256,14 @@ class BaseEntity:
         if rotatable_only:
             bonds = [
                 bond for bond in bonds if
-                bond not in self._locked_bonds and bond.is_rotatable()
+                not self._AtomGraph.is_locked(*bond) and bond.is_rotatable()
             ]
             return bonds
-        return [b for b in bonds]
+        bonds = [b for b in bonds]
+        if cache:
+            connections[triplet] = bonds
+            return list(bonds)
+        return bonds
 
     def _make_bond_triplets(self, bonds) -> set:
         """
@@ -2016,9 +2282,11 @@ class BaseEntity:
         """
         bonds = set(bonds)
         _new = set()
+        adj = self._AtomGraph.adj
         for bond in bonds:
             atom1, atom2 = bond
-            neighs = self.get_neighbors(atom1)
+            neighs = set(adj[atom1])
+            neighs.discard(atom1)
             neighs.discard(atom2)
             neighs -= set(i for i in neighs if i.element == "H")
             if len(neighs) == 1:
@@ -2027,7 +2295,8 @@ class BaseEntity:
                     _new.add((atom1, neigh))
                 continue
 
-            neighs = self.get_neighbors(atom2)
+            neighs = set(adj[atom2])
+            neighs.discard(atom2)
             neighs.discard(atom1)
             neighs -= set(i for i in neighs if i.element == "H")
             if len(neighs) == 1:
@@ -2089,6 +2358,7 @@ class BaseEntity:
         bonds = structural.infer_residue_connections(
             self._base_struct, bond_length, triplet
         )
+        self._connections = None
         self._bonds.extend(b for b in bonds if b not in self._bonds)
         self._AtomGraph.add_edges_from(bonds)
         return bonds
@@ -2257,6 +2527,7 @@ class BaseEntity:
         self._AtomGraph.clear()
         self._AtomGraph.add_nodes_from(self.get_atoms())
         self._AtomGraph.add_edges_from(self._bonds)
+        self._invalidate_caches()
         return self
 
     def make_residue_graph(self, detailed: bool = False, locked: bool = True):
@@ -2509,15 +2780,12 @@ class BaseEntity:
         """
         The core function of `purge_bonds` which expects atoms to be provided as Atom objects.
         """
-        # the full_id thing seems to prevent some memory leaky-ness
-        bonds = [
-            i
-            for i in self._bonds
-            if atom is i[0] or atom is i[1]
-            # if atom.full_id == i[0].full_id or atom.full_id == i[1].full_id
-        ]
-        for bond in bonds:
-            self._remove_bond(*bond)
+        # every bond is also an edge in the atom graph, so the graph
+        # adjacency gives us the bonds of the atom without scanning all bonds
+        if atom not in self._AtomGraph:
+            return
+        for neighbor in list(self._AtomGraph.adj[atom]):
+            self._remove_bond(atom, neighbor)
 
     def _add_bond(self, atom1, atom2, order=1):
         """
@@ -2529,6 +2797,7 @@ class BaseEntity:
         if not atom2:
             raise ValueError("Atom2 not found!")
 
+        self._connections = None
         if not self._AtomGraph.has_edge(atom1, atom2):
             bond = base_classes.Bond(atom1, atom2, order)
             self._AtomGraph.add_edge(atom1, atom2, bond_order=order, bond_obj=bond)
@@ -2543,11 +2812,12 @@ class BaseEntity:
         """
         The core function of `remove_bond` which expects atoms to be provided as Atom objects.
         """
+        self._connections = None
         if self._AtomGraph.has_edge(atom1, atom2):
             bond_obj = self._AtomGraph[atom1][atom2]["bond_obj"]
             if self._AtomGraph[atom1][atom2].get("bond_order", 1) == 1:
-                self._bonds.remove(bond_obj)
-                self._AtomGraph._locked_edges.discard(bond_obj)
+                _remove_by_identity(self._bonds, bond_obj)
+                self._AtomGraph.unlock_edge(atom1, atom2)
                 self._AtomGraph.remove_edge(atom1, atom2)
             else:
                 self._AtomGraph[atom1][atom2]["bond_order"] = (
@@ -2566,18 +2836,33 @@ class BaseEntity:
         """
         The core alternative of `remove_atoms` which expects atoms to be provided as Atom objects.
         """
+        changed = set()
         for atom in atoms:
             self._purge_bonds(atom)
             self._AtomGraph.remove_node(atom)
             p = atom.get_parent()
             p.detach_child(atom.get_id())
             atom.set_parent(p)
+            changed.add(id(p))
 
-        # reindex the atoms
+        # reindex the atoms, starting from the first residue that lost any
+        # (as long as the numbering up to there is still contiguous) so that
+        # trimming the end of a long chain does not renumber all of it
         adx = 0
-        for atom in self._model.get_atoms():
-            adx += 1
-            atom.serial_number = adx
+        renumber = False
+        for residue in self._model.get_residues():
+            children = residue.child_list
+            if not renumber:
+                renumber = id(residue) in changed or (
+                    children and children[-1].serial_number != adx + len(children)
+                )
+                if not renumber:
+                    adx += len(children)
+                    continue
+            for atom in children:
+                adx += 1
+                atom.serial_number = adx
+        self._invalidate_caches()
 
     def _direct_bonds(
         self,
@@ -2629,11 +2914,45 @@ class BaseEntity:
                 for bond in bonds
             ]
         if save:
-            for old, new in zip(bonds, directed):
-                self.remove_bond(*old)
-                self.add_bond(*new)
+            self._replace_bonds(bonds, directed)
         return directed
 
+    def _replace_bonds(self, old_bonds, new_bonds):
+        """
+        Replace bonds with (re-directed) bonds, which is the same as removing each old
+        bond and then adding the new one. If all old bonds are distinct single bonds in the
+        structure, the bond list is only filtered once instead of once per bond.
+        """
+        old_bonds = list(old_bonds)
+        new_bonds = list(new_bonds)
+        graph = self._AtomGraph
+        self._connections = None
+        seen = set()
+        for bond, new in zip(old_bonds, new_bonds):
+            atom1, atom2 = bond[0], bond[1]
+            key = (id(atom1), id(atom2)) if id(atom1) < id(atom2) else (id(atom2), id(atom1))
+            if (
+                key in seen
+                or {id(new[0]), id(new[1])} != set(key)
+                or not graph.has_edge(atom1, atom2)
+                or graph[atom1][atom2].get("bond_order", 1) != 1
+            ):
+                for old, new in zip(old_bonds, new_bonds):
+                    self.remove_bond(*old)
+                    self.add_bond(*new)
+                return
+            seen.add(key)
+
+        removed = set()
+        for bond in old_bonds[: len(new_bonds)]:
+            bond_obj = graph[bond[0]][bond[1]]["bond_obj"]
+            removed.add(id(bond_obj))
+            graph.unlock_edge(bond[0], bond[1])
+            graph.remove_edge(bond[0], bond[1])
+        self._bonds[:] = [i for i in self._bonds if id(i) not in removed]
+        for bond in new_bonds[: len(old_bonds)]:
+            self._add_bond(bond[0], bond[1])
+
     def _rotate_around_bond(
         self,
         atom1: base_classes.Atom,
@@ -2649,7 +2968,7 @@ class BaseEntity:
         ----
         This function expects the angle to be in RADIANS! Contrary to the `rotate_around_bond` method!
         """
-        self._AtomGraph.rotate_around_edge(atom1, atom2, angle, descendants_only)
+        self._AtomGraph._rotate_around_edge(atom1, atom2, angle, descendants_only)
 
     def __mod__(self, patch):
         """
@@ -2674,6 +2993,116 @@ class BaseEntity:
         return self
 
 
+def _crosses_residues(atom1, atom2) -> bool:
+    """
+    Check if two atoms belong to different residues.
+    Most bonds are within one residue, which the identity check settles without comparing ids.
+    """
+    p1, p2 = atom1.parent, atom2.parent
+    return p1 is not p2 and p1 != p2
+
+
+def _remove_by_identity(items: list, obj):
+    """
+    Remove an object from a list by identity rather than equality.
+    The list is searched from the back since recently added items are the most likely to be removed.
+    """
+    for idx in range(len(items) - 1, -1, -1):
+        if items[idx] is obj:
+            del items[idx]
+            return
+    raise ValueError(f"{obj} is not in list")
+
+
+def _coord_epoch(model) -> int:
+    """
+    Get the number of changes to atom coordinates and parents that a model has noted
+    (see `base_classes._touch_coords`).
+    """
+    return getattr(model, "_coord_epoch", 0)
+
+
+def _shallow_copy(obj):
+    """
+    Make a shallow copy of an object, including its slots.
+    This does the same as `copy.copy` but without going through the pickle protocol.
+    """
+    cls = obj.__class__
+    new = cls.__new__(cls)
+    new.__dict__.update(obj.__dict__)
+    for name in copyreg._slotnames(cls):
+        try:
+            setattr(new, name, getattr(obj, name))
+        except AttributeError:
+            pass
+    return new
+
+
+def _copy_structure(structure, mapping: dict, dtype=None):
+    """
+    Make a copy of a structure with new (uniquely identified) models, chains, residues and atoms.
+    This is a faster alternative to a `deepcopy` of the entire structure.
+
+    Parameters
+    ----------
+    structure : Structure
+        The structure to copy
+    mapping : dict
+        A dictionary that is filled with the old objects as keys and their copies as values.
+    dtype : dtype, optional
+        The floating point type of the copied coordinates.
+        By default, the type of the original coordinates is kept.
+
+    Returns
+    -------
+    Structure
+        The copied structure
+    """
+    atoms = [atom for atom in structure.get_atoms()]
+    coords = np.array([atom.coord for atom in atoms], dtype=dtype).reshape(-1, 3)
+    for atom, coord in zip(atoms, coords):
+        new = _shallow_copy(atom)
+        new._new_id()
+        # set the coordinate directly, since the copy is still linked
+        # to the original parent and would otherwise mark its model as changed
+        new._coord = coord
+        new.xtra = dict(atom.xtra)
+        mapping[atom] = new
+
+    def _copy_entity(entity):
+        new = _shallow_copy(entity)
+        new._new_id()
+        new.xtra = dict(entity.xtra)
+        if getattr(entity, "_coord", None) is not None:
+            new._coord = np.array(entity._coord)
+        new.child_list = []
+        new.child_dict = {}
+        for child in entity.child_list:
+            _child = mapping[child] if child.level == "A" else _copy_entity(child)
+            _child.parent = new
+            new.child_list.append(_child)
+            new.child_dict[_child.get_id()] = _child
+        mapping[entity] = new
+        return new
+
+    new = _copy_entity(structure)
+    new.parent = None
+    return new
+
+
+def _index_key(obj, by: str):
+    """
+    Get the key under which an atom or residue is stored in the lookup index
+    """
+    if by == "serial":
+        return obj.serial_number
+    elif by == "id":
+        return obj.id
+    elif by == "full_id":
+        return obj.full_id
+    return obj.id[1]
+
+
 def should_invert(bond, direct_connecting_atoms):
     """
     Check if a given bond should be inverted during bond direction
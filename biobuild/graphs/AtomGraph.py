@@ -4,7 +4,6 @@ import Bio.PDB as bio
 import biobuild.structural as struct
 from biobuild.graphs.BaseGraph import BaseGraph
 import biobuild.core.base_classes as base_classes
-import biobuild.utils.visual as vis
 
 
 class AtomGraph(BaseGraph):
@@ -95,6 +94,8 @@ class AtomGraph(BaseGraph):
         return new
 
     def draw(self):
+        import biobuild.utils.visual as vis
+
         v = vis.AtomGraphViewer3D()
         v.link(self)
         return v
@@ -10,6 +10,8 @@ import networkx as nx
 import numpy as np
 from scipy.spatial.transform import Rotation
 
+import biobuild.utils.auxiliary as aux
+
 
 class BaseGraph(nx.Graph):
     """
@@ -17,13 +19,21 @@ class BaseGraph(nx.Graph):
     """
 
     def __init__(self, id, bonds: list):
+        # an empty list would still be run through networkx's input conversion
+        if isinstance(bonds, list) and not bonds:
+            bonds = None
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        self._rotation_buffer = None
         super().__init__(bonds)
         self.id = id
         self._structure = None
         self._molecule = None
         self._neighborhood = None
-        self._locked_edges = set()
+        self._locked_edges = _EdgeSet()
         self._structure_was_searched = False
+        self._invalidate_structure_cache()
 
     @property
     def structure(self):
@@ -32,7 +42,8 @@ class BaseGraph(nx.Graph):
         """
         if not self._structure_was_searched:
             self._structure = self._get_structure()
-            self._structure_was_searched = True
+            # an empty graph has nothing to search yet
+            self._structure_was_searched = len(self) > 0
         return self._structure
 
     @property
@@ -40,27 +51,45 @@ class BaseGraph(nx.Graph):
         """
         Returns the chains in the molecule
         """
-        if not self.structure:
-            return
-        return list(self.structure.get_chains())
+        if self._chain_list is None:
+            if not self.structure:
+                return
+            self._chain_list = list(self.structure.get_chains())
+        # a copy so that callers cannot change the cached list
+        return list(self._chain_list)
 
     @property
     def residues(self):
         """
         Returns the residues in the molecule
         """
-        if not self.structure:
-            return
-        return list(self.structure.get_residues())
+        if self._residue_list is None:
+            if not self.structure:
+                return
+            self._residue_list = list(self.structure.get_residues())
+        # a copy so that callers cannot change the cached list
+        return list(self._residue_list)
 
     @property
     def atoms(self):
         """
         Returns the atoms in the molecule
         """
-        if not self.structure:
-            return
-        return list(self.structure.get_atoms())
+        if self._atom_list is None:
+            if not self.structure:
+                return
+            self._atom_list = list(self.structure.get_atoms())
+        # a copy so that callers cannot change the cached list
+        return list(self._atom_list)
+
+    def _invalidate_structure_cache(self):
+        """
+        Drop the cached chains, residues and atoms lists.
+        This is also called by the molecules when their structure changes without the graph nodes changing.
+        """
+        self._chain_list = None
+        self._residue_list = None
+        self._atom_list = None
 
     @property
     def central_node(self):
@@ -68,21 +97,20 @@ class BaseGraph(nx.Graph):
         Returns the central most node of the graph.
         This is computed based on the mean of all node coordinates.
         """
+        nodes = list(self.nodes)
+        coords = np.array([i.coord for i in nodes]).reshape(-1, 3)
         # get the central node
-        center = np.mean([i.coord for i in self.nodes])
+        center = coords.mean()
         # get the node closest to the center
-        root_node = min(self.nodes, key=lambda x: np.linalg.norm(x.coord - center))
-        return root_node
+        d = coords - center
+        return nodes[int(np.einsum("ij,ij->i", d, d).argmin())]
 
     @property
     def nodes_in_cycles(self) -> set:
         """
         Returns the nodes in cycles
         """
-        cycles = nx.cycle_basis(self)
-        if len(cycles) == 0:
-            return set()
-        return set.union(*[set(i) for i in cycles])
+        return set(self._get_cycle_index())
 
     @property
     def bonds(self):
@@ -178,20 +206,67 @@ class BaseGraph(nx.Graph):
         >>> graph.get_descendants("B", "A")
         set() # because in this direction there are no other nodes
         """
-        neighs = set(self.adj[node_2])
-        neighs.remove(node_1)
-        _seen = set((node_1, node_2))
-        _new_neighs = set(neighs)
-        while len(_new_neighs) > 0:
-            neigh = _new_neighs.pop()
-            descendants = set(self.adj[neigh])
-            descendants -= _seen
-            _seen.add(neigh)
-            neighs.add(neigh)
-            if len(descendants) == 0:
-                continue
-            _new_neighs.update(descendants)
-        return neighs
+        adj = self._adj
+        if node_1 not in adj[node_2]:
+            raise KeyError(node_1)
+
+        # the compiled search only pays off if the adjacency arrays are already there,
+        # since building them is as costly as searching the graph once (see `_prepare_descendants`)
+        if aux.HAS_NUMBA and getattr(self, "_adjacency", None) is not None:
+            nodes, index, indptr, indices = self._adjacency
+            descendants = _descendants_kernel(
+                indptr, indices, index[node_2], index[node_1]
+            )
+            return {nodes[i] for i in descendants}
+
+        _seen = {node_1, node_2}
+        _to_visit = [node_2]
+        while _to_visit:
+            for neigh in adj[_to_visit.pop()]:
+                if neigh not in _seen:
+                    _seen.add(neigh)
+                    _to_visit.append(neigh)
+        _seen.discard(node_1)
+        _seen.discard(node_2)
+        return _seen
+
+    def _prepare_descendants(self):
+        """
+        Prepare the graph for many calls of `get_descendants` without changes
+        to the graph in between, by building the arrays used by the compiled search (if numba is available).
+        """
+        if aux.HAS_NUMBA:
+            self._get_adjacency()
+
+    def _get_adjacency(self) -> tuple:
+        """
+        Get the adjacency of the graph as integer arrays in compressed sparse row format.
+        The arrays are computed once and kept until the nodes or edges of the graph change.
+
+        Returns
+        -------
+        nodes : list
+            The nodes of the graph in the order of their integer indices
+        index : dict
+            The integer index of each node
+        indptr, indices : np.ndarray
+            The neighbors of the node with index `i` are `indices[indptr[i]:indptr[i + 1]]`
+        """
+        if getattr(self, "_adjacency", None) is None:
+            adj = self._adj
+            nodes = list(adj)
+            index = {node: idx for idx, node in enumerate(nodes)}
+            indptr = np.zeros(len(nodes) + 1, dtype=np.int32)
+            indptr[1:] = np.cumsum(
+                np.fromiter((len(adj[n]) for n in nodes), dtype=np.int32, count=len(nodes))
+            )
+            indices = np.fromiter(
+                (index[neigh] for n in nodes for neigh in adj[n]),
+                dtype=np.int32,
+                count=indptr[-1],
+            )
+            self._adjacency = (nodes, index, indptr, indices)
+        return self._adjacency
 
     def get_ancestors(self, node_1, node_2):
         """
@@ -275,30 +350,69 @@ class BaseGraph(nx.Graph):
         if not max_ancestors:
             max_ancestors = np.inf
 
-        circulars = [set(i) for i in nx.cycle_basis(self)]
-        rotatable_edges = [
-            i
-            for i in self.edges
-            if not self.is_locked(*i)
-            and self[i[0]][i[1]].get("bond_order", 1) == 1
-            and not self.in_same_cycle(*i, circulars)
-        ]
+        cyclic_edges = self._get_cyclic_edges()
+        subtree_sizes, component_sizes, parents = self._dfs_subtree_sizes()
+
         if root_node is not None:
-            _directed = nx.dfs_tree(self, root_node)
-            rotatable_edges = [
-                i
-                for i in _directed.edges
-                if i in rotatable_edges or i[::-1] in rotatable_edges
-            ]
-
-        rotatable_edges = [
-            i
-            for i in rotatable_edges
-            if min_descendants < len(self.get_descendants(*i)) < max_descendants
-            and min_ancestors < len(self.get_ancestors(*i)) < max_ancestors
-        ]
+            edges = self._dfs_tree_edges(root_node)
+        else:
+            edges = self.edges
+
+        _rotatable = []
+        for i in edges:
+            node_1, node_2 = i
+
+            # edges outside of cycles are part of any spanning tree and split their
+            # connected component in two, so the descendants are either the subtree
+            # below node_2 or everything but the subtree of node_1, and the ancestors
+            # are all the nodes that are not descendants. Edges outside the tree close a cycle.
+            if parents.get(node_2) is node_1:
+                n_descendants = subtree_sizes[node_2] - 1
+            elif parents.get(node_1) is node_2:
+                n_descendants = component_sizes[node_1] - subtree_sizes[node_1] - 1
+            else:
+                continue
+            if not min_descendants < n_descendants < max_descendants:
+                continue
+            n_ancestors = component_sizes[node_1] - n_descendants - 2
+            if not min_ancestors < n_ancestors < max_ancestors:
+                continue
+
+            if (
+                self.is_locked(node_1, node_2)
+                or self._adj[node_1][node_2].get("bond_order", 1) != 1
+                or frozenset(i) in cyclic_edges
+            ):
+                continue
+            _rotatable.append(i)
+
+        return _rotatable
 
-        return rotatable_edges
+    def _dfs_subtree_sizes(self):
+        """
+        Compute the subtree size of each node in a depth-first spanning forest of the graph.
+
+        Returns
+        -------
+        subtree_sizes : dict
+            The number of nodes in the subtree rooted at each node (including the node itself)
+        component_sizes : dict
+            The number of nodes in the connected component of each node
+        parents : dict
+            The parent of each node in the spanning forest (roots are not included)
+        """
+        tree_edges = list(nx.dfs_edges(self))
+        parents = {child: parent for parent, child in tree_edges}
+
+        subtree_sizes = dict.fromkeys(self.nodes, 1)
+        for parent, child in reversed(tree_edges):
+            subtree_sizes[parent] += subtree_sizes[child]
+
+        roots = {node: node for node in self.nodes if node not in parents}
+        for parent, child in tree_edges:
+            roots[child] = roots[parent]
+        component_sizes = {node: subtree_sizes[root] for node, root in roots.items()}
+        return subtree_sizes, component_sizes, parents
 
     def in_same_cycle(self, node_1, node_2, cycles=None) -> bool:
         """
@@ -310,12 +424,138 @@ class BaseGraph(nx.Graph):
             The nodes to check
         """
         if not cycles:
-            cycles = nx.cycle_basis(self)
+            index = self._get_cycle_index()
+            if node_1 not in index or node_2 not in index:
+                return False
+            return not index[node_1].isdisjoint(index[node_2])
         for cycle in cycles:
             if node_1 in cycle and node_2 in cycle:
                 return True
         return False
 
+    def _get_cycle_index(self) -> dict:
+        """
+        Get the indices of the (basis) cycles each node is part of.
+        The cycle basis is computed once and kept until the edges of the graph change.
+
+        Returns
+        -------
+        dict
+            A dictionary of nodes in cycles and the set of indices of their cycles
+        """
+        return self._get_cycles()[0]
+
+    def _get_cyclic_edges(self) -> set:
+        """
+        Get all edges that are part of a cycle (as frozensets of their two nodes).
+        These are exactly the edges whose nodes are in the same cycle.
+        """
+        return self._get_cycles()[1]
+
+    def _get_cycles(self) -> tuple:
+        """
+        Compute the cycle basis of the graph and index the nodes and edges in cycles.
+        """
+        if getattr(self, "_cycles", None) is None:
+            index = {}
+            edges = set()
+            for idx, cycle in enumerate(self._compute_cycles()):
+                for node in cycle:
+                    index.setdefault(node, set()).add(idx)
+                # the nodes of a cycle are listed in order
+                edges.update(map(frozenset, zip(cycle, cycle[1:] + cycle[:1])))
+            self._cycles = (index, edges)
+        return self._cycles
+
+    def _compute_cycles(self) -> list:
+        """
+        Compute a cycle basis of the graph.
+
+        Bridges are never part of a cycle, so they are removed first and the basis
+        is computed separately for each biconnected component of the remaining graph.
+        This keeps the acyclic chains between ring systems out of the computation.
+
+        Returns
+        -------
+        list
+            A list of cycles, each given as a list of nodes in order
+        """
+        bridges = set(map(frozenset, nx.bridges(self)))
+        core = nx.Graph()
+        core.add_edges_from(i for i in self.edges if frozenset(i) not in bridges)
+        cycles = []
+        for component in nx.biconnected_components(core):
+            if len(component) > 2:
+                cycles.extend(nx.cycle_basis(core.subgraph(component)))
+        return cycles
+
+    # the cycle index, edge keys and adjacency arrays depend on the edges, so they are dropped by
+    # everything that changes them, and the structure lists are dropped by everything that may add
+    # or remove nodes
+
+    def add_node(self, node_for_adding, **attr):
+        self._adjacency = None
+        self._invalidate_structure_cache()
+        super().add_node(node_for_adding, **attr)
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        self._adjacency = None
+        self._invalidate_structure_cache()
+        super().add_nodes_from(nodes_for_adding, **attr)
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        self._invalidate_structure_cache()
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        self._invalidate_structure_cache()
+        super().add_edges_from(ebunch_to_add, **attr)
+
+    def remove_edge(self, u, v):
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        super().remove_edge(u, v)
+
+    def remove_edges_from(self, ebunch):
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        super().remove_edges_from(ebunch)
+
+    def remove_node(self, n):
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        self._invalidate_structure_cache()
+        super().remove_node(n)
+
+    def remove_nodes_from(self, nodes):
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        self._invalidate_structure_cache()
+        super().remove_nodes_from(nodes)
+
+    def clear(self):
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        self._invalidate_structure_cache()
+        super().clear()
+
+    def clear_edges(self):
+        self._cycles = None
+        self._edge_keys = None
+        self._adjacency = None
+        super().clear_edges()
+
     def direct_edges(self, root_node=None, edges: list = None) -> list:
         """
         Sort the edges such that the first node in each edge
@@ -344,11 +584,29 @@ class BaseGraph(nx.Graph):
         if root_node not in self.nodes:
             raise ValueError(f"Root node {root_node} not in graph")
 
-        _directed = nx.dfs_tree(self, source=root_node).edges
-        _directed = [i for i in _directed if i in edges or i[::-1] in edges]
+        # edges may also be given as Bond objects, which compare equal to their atom tuples
+        edges = set(tuple(i) for i in edges)
+        _directed = [
+            i
+            for i in self._dfs_tree_edges(root_node)
+            if i in edges or i[::-1] in edges
+        ]
 
         return _directed
 
+    def _dfs_tree_edges(self, root_node) -> list:
+        """
+        Get the edges of the depth-first search tree from a root node,
+        in the same order as `nx.dfs_tree(self, root_node).edges` would list them
+        (grouped by parent node, in the order the parents were discovered)
+        but without building the tree graph itself.
+        """
+        children = {root_node: []}
+        for parent, child in nx.dfs_edges(self, root_node):
+            children[parent].append(child)
+            children[child] = []
+        return [(parent, child) for parent in children for child in children[parent]]
+
     def lock_edge(self, node_1, node_2):
         """
         Lock an edge, preventing it from being rotated.
@@ -358,7 +616,7 @@ class BaseGraph(nx.Graph):
         node_1, node_2
             The nodes that define the edge
         """
-        self._locked_edges.add((node_1, node_2))
+        self._locked_edges.add(self._edge_key(node_1, node_2))
 
     def unlock_edge(self, node_1, node_2):
         """
@@ -369,8 +627,7 @@ class BaseGraph(nx.Graph):
         node_1, node_2
             The nodes that define the edge
         """
-        if (node_1, node_2) in self._locked_edges:
-            self._locked_edges.remove((node_1, node_2))
+        self._locked_edges.discard(self._edge_key(node_1, node_2))
 
     def is_locked(self, node_1, node_2):
         """
@@ -386,7 +643,17 @@ class BaseGraph(nx.Graph):
         bool
             Whether the edge is locked
         """
-        return (node_1, node_2) in self._locked_edges
+        return self._edge_key(node_1, node_2) in self._locked_edges
+
+    @staticmethod
+    def _edge_key(node_1, node_2) -> tuple:
+        """
+        Get the key under which an edge is stored in the locked edges.
+        Both orientations of an edge map to the same key.
+        """
+        if hash(node_2) < hash(node_1):
+            return (node_2, node_1)
+        return (node_1, node_2)
 
     def get_locked_edges(self):
         """
@@ -395,7 +662,7 @@ class BaseGraph(nx.Graph):
         Returns
         -------
         set
-            The locked edges
+            The locked edges (in which edges are found in either orientation)
         """
         return self._locked_edges
 
@@ -406,21 +673,29 @@ class BaseGraph(nx.Graph):
         Returns
         -------
         set
-            The unlocked edges
+            The unlocked edges (in which edges are found in either orientation)
         """
-        return set(self.edges) - self._locked_edges
+        return _EdgeSet(self._get_edge_keys() - self._locked_edges)
 
     def lock_all(self):
         """
         Lock all edges
         """
-        self._locked_edges = set(self.edges)
+        self._locked_edges = _EdgeSet(self._get_edge_keys())
+
+    def _get_edge_keys(self) -> frozenset:
+        """
+        Get the keys of all edges (see `_edge_key`), which are cached until the edges change.
+        """
+        if getattr(self, "_edge_keys", None) is None:
+            self._edge_keys = frozenset(self._edge_key(*i) for i in self.edges)
+        return self._edge_keys
 
     def unlock_all(self):
         """
         Unlock all edges
         """
-        self._locked_edges = set()
+        self._locked_edges = _EdgeSet()
 
     def rotate_around_edge(
         self,
@@ -457,45 +732,53 @@ class BaseGraph(nx.Graph):
         # ---------- sanity checks ----------
         # if node_1 not in self.nodes or node_2 not in self.nodes:
         #     raise ValueError("One or more nodes not in graph!")
-        if node_1 is node_2:
-            raise ValueError("Cannot rotate around an edge with only one node!")
-        elif self.is_locked(node_1, node_2):
+        if self.is_locked(node_1, node_2):
             raise ValueError("Cannot rotate around a locked edge!")
+        return self._rotate_around_edge(
+            node_1, node_2, angle, descendants_only, update_coords
+        )
 
-        # we need to get a reference node index to normalise the rotated
-        # coordinates to the original coordinate system
-        # indices = list(self.nodes)
-        idx_1 = next(idx for idx, i in enumerate(self.nodes) if i is node_1)
+    def _rotate_around_edge(
+        self,
+        node_1,
+        node_2,
+        angle: float,
+        descendants_only: bool = False,
+        update_coords: bool = True,
+    ):
+        """
+        The core function of `rotate_around_edge` which does not check if the edge is locked.
+        """
+        if node_1 is node_2:
+            raise ValueError("Cannot rotate around an edge with only one node!")
 
         # define the axis of rotation as the cross product of the edge's vectors
         edge_vector = node_2.coord - node_1.coord
         edge_vector /= np.linalg.norm(edge_vector)
 
         # create the rotation matrix
-        r = Rotation.from_rotvec(angle * edge_vector)
+        rotation = Rotation.from_rotvec(angle * edge_vector).as_matrix()
 
         # create a numpy array of the node coordinates
         if descendants_only:
-            nodes = {i: i.coord for i in self.get_descendants(node_1, node_2)}
-            nodes[node_2] = node_2.coord
+            nodes = list(self.get_descendants(node_1, node_2))
+            nodes.append(node_2)
         else:
-            nodes = {i: i.coord for i in self.nodes}
-
-        node_coords = np.array(tuple(nodes.values()))
-
-        # indices = list(nodes.keys())
-        # idx_2 = indices.index(node_2)
-        idx_2 = next(idx for idx, i in enumerate(nodes.keys()) if i is node_2)
-
-        # apply the rotation matrix to the node coordinates
-        node_coords_rotated = r.apply(node_coords)
-
-        # now adjust for the translatisonal shift around the axis
-        _diff = node_coords_rotated[idx_2] - node_coords[idx_2]
-        node_coords_rotated -= _diff
+            nodes = list(self.nodes)
+        # the input coordinates go into a buffer that is reused across rotations
+        # (the rotated coordinates are handed out to the nodes so they need fresh memory)
+        node_coords = self._get_rotation_buffer(len(nodes))
+        for idx, node in enumerate(nodes):
+            node_coords[idx] = node.coord
+
+        # rotate around node_2 so that the edge itself stays in place
+        pivot = np.array(node_2.coord)
+        node_coords -= pivot
+        node_coords_rotated = node_coords @ rotation.T
+        node_coords_rotated += pivot
 
         # update the node coordinates in the graph
-        new_coords = {i: node_coords_rotated[idx] for idx, i in enumerate(nodes.keys())}
+        new_coords = dict(zip(nodes, node_coords_rotated))
 
         if update_coords:
             for node, coord in new_coords.items():
@@ -505,19 +788,36 @@ class BaseGraph(nx.Graph):
         _new_coords.update(new_coords)
         return _new_coords
 
+    def _get_rotation_buffer(self, n: int) -> np.ndarray:
+        """
+        Get a (n, 3) view of the coordinate buffer used by `_rotate_around_edge`.
+        The buffer only grows, so it is reallocated rarely during repeated rotations.
+        """
+        buffer = getattr(self, "_rotation_buffer", None)
+        if buffer is None or len(buffer) < n:
+            buffer = np.empty((2 * n, 3), dtype=np.float64)
+            self._rotation_buffer = buffer
+        return buffer[:n]
+
     def _get_structure(self):
         """
         Get the underlying `bio.PDB.Structure` object
         """
-        if not hasattr(list(self.nodes)[0], "get_parent"):
+        node = next(iter(self.nodes), None)
+        if node is None:
+            return None
+        if not hasattr(node, "get_parent"):
             warnings.warn("Nodes are not Biopython entities with linked parents!")
             return None
-        structure = list(self.nodes)[0].get_parent()
+        structure = node.get_parent()
         if structure is None:
             warnings.warn("Nodes do not seem to have linked parents!")
             return None
         while not isinstance(structure, bio.Structure.Structure):
             structure = structure.get_parent()
+            if structure is None:
+                warnings.warn("Nodes are not part of a structure!")
+                return None
         return structure
 
     def __str__(self):
@@ -525,6 +825,67 @@ class BaseGraph(nx.Graph):
         return lines
 
 
+class _EdgeSet(set):
+    """
+    A set of edges that are stored under their `BaseGraph._edge_key`,
+    so that an edge is found (and added or removed) in either orientation.
+    """
+
+    def __init__(self, edges=()):
+        super().__init__(_as_edge_key(i) for i in edges)
+
+    def __contains__(self, edge):
+        return super().__contains__(_as_edge_key(edge))
+
+    def add(self, edge):
+        super().add(_as_edge_key(edge))
+
+    def discard(self, edge):
+        super().discard(_as_edge_key(edge))
+
+    def remove(self, edge):
+        super().remove(_as_edge_key(edge))
+
+    def update(self, *others):
+        for edges in others:
+            super().update(_as_edge_key(i) for i in edges)
+
+
+def _as_edge_key(edge):
+    """
+    Get the key of an edge given as a pair of nodes (other objects are returned as they are).
+    """
+    if isinstance(edge, tuple) and len(edge) == 2:
+        return BaseGraph._edge_key(*edge)
+    if hasattr(edge, "atom1") and hasattr(edge, "atom2"):
+        return BaseGraph._edge_key(edge.atom1, edge.atom2)
+    return edge
+
+
+@aux.njit(cache=True)
+def _descendants_kernel(indptr, indices, source, exclude):
+    """
+    The numeric core of `BaseGraph.get_descendants`.
+    This is compiled with numba if it is available.
+    """
+    visited = np.zeros(indptr.size - 1, dtype=np.bool_)
+    visited[exclude] = True
+    visited[source] = True
+    queue = np.empty(indptr.size - 1, dtype=np.int32)
+    queue[0] = source
+    head, tail = 0, 1
+    while head < tail:
+        node = queue[head]
+        head += 1
+        for k in range(indptr[node], indptr[node + 1]):
+            neigh = indices[k]
+            if not visited[neigh]:
+                visited[neigh] = True
+                queue[tail] = neigh
+                tail += 1
+    return queue[1:tail]
+
+
 if __name__ == "__main__":
     import biobuild as bb
     from timeit import timeit
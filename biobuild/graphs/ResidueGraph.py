@@ -5,7 +5,6 @@ import numpy as np
 
 import biobuild.structural as struct
 from biobuild.graphs.BaseGraph import BaseGraph
-import biobuild.utils.visual as vis
 
 
 class ResidueGraph(BaseGraph):
@@ -348,6 +347,8 @@ class ResidueGraph(BaseGraph):
                     self.remove_edge(triplet[0], triplet[2])
 
     def draw(self):
+        import biobuild.utils.visual as vis
+
         v = vis.ResidueGraphViewer3D()
         v.link(self)
         return v
@@ -361,11 +362,11 @@ class ResidueGraph(BaseGraph):
             if isinstance(edge[0], bio.Residue.Residue) and isinstance(
                 edge[1], bio.Atom.Atom
             ):
-                self._locked_edges.add(edge)
+                self.lock_edge(*edge)
             elif isinstance(edge[0], bio.Atom.Atom) and isinstance(
                 edge[1], bio.Residue.Residue
             ):
-                self._locked_edges.add(edge)
+                self.lock_edge(*edge)
 
     @property
     def residues(self):
@@ -18,6 +18,7 @@ from scipy.spatial.distance import cdist
 
 import biobuild.optimizers.Rotatron as Rotatron
 import biobuild.graphs.BaseGraph as BaseGraph
+import biobuild.utils.auxiliary as aux
 
 # Rotatron = Rotatron.Rotatron
 
@@ -80,6 +81,73 @@ def concatenation_function_linear(self, x):
     return e
 
 
+# the built-in concatenation functions also have a compiled
+# version which evaluates all nodes at once (if numba is available)
+_compiled_concatenation_modes = {
+    simple_concatenation_function: 0,
+    concatenation_function_with_penalty: 1,
+    concatenation_function_no_pushback: 2,
+    concatenation_function_no_unfold: 3,
+    concatenation_function_linear: 4,
+}
+
+
+@aux.njit(parallel=True, cache=True)
+def _evaluate_nodes(
+    dists, masks, radius, mode, n_smallest, unfold, pushback, clash_distance
+):
+    """
+    Compute the evaluation of each node (row of the pairwise distance matrix)
+    using one of the built-in concatenation functions. Nodes without any other
+    nodes in range receive -1.
+
+    Each row is evaluated in a single pass which keeps a sorted buffer
+    of the `n_smallest` distances instead of sorting the entire row.
+    """
+    n = dists.shape[0]
+    out = np.empty(n)
+    for i in aux.prange(n):
+        smallest = np.empty(n_smallest)
+        count = 0
+        n_kept = 0
+        total = 0.0
+        penalty = 0
+        for j in range(n):
+            x = dists[i, j]
+            if not (x < radius and masks[i, j]):
+                continue
+            count += 1
+            total += x
+            if x < 1.5 * clash_distance:
+                penalty += 1
+            if n_kept < n_smallest:
+                n_kept += 1
+            elif x >= smallest[n_kept - 1]:
+                continue
+            k = n_kept - 1
+            while k > 0 and smallest[k - 1] > x:
+                smallest[k] = smallest[k - 1]
+                k -= 1
+            smallest[k] = x
+
+        if count == 0:
+            out[i] = -1.0
+            continue
+        mean = total / count
+        mean_smallest = smallest[:n_kept].mean()
+        if mode == 0:
+            out[i] = mean**unfold + mean_smallest**pushback
+        elif mode == 1:
+            out[i] = (mean**unfold + mean_smallest**pushback) / (1 + penalty) ** 2
+        elif mode == 2:
+            out[i] = mean**unfold
+        elif mode == 3:
+            out[i] = mean_smallest**pushback
+        else:
+            out[i] = mean * unfold + mean_smallest * pushback
+    return out
+
+
 class DistanceRotatron(Rotatron):
     """
     A distance-based Rotatron environment.
@@ -175,6 +243,11 @@ class DistanceRotatron(Rotatron):
             return self._concatenation_function(self, x[mask])
 
         self.concatenation_function = concatenation_wrapper
+        self._concatenation_mode = (
+            _compiled_concatenation_modes.get(concatenation_function, -1)
+            if aux.HAS_NUMBA and n_smallest > 0
+            else -1
+        )
         self._state_dists = np.zeros((len(graph.nodes), len(graph.nodes)))
 
         # =====================================
@@ -209,8 +282,22 @@ class DistanceRotatron(Rotatron):
         pairwise_dists = cdist(state, state)
         np.fill_diagonal(pairwise_dists, self._radius)
 
-        self.ndx = 0
-        dist_eval = np.apply_along_axis(self.concatenation_function, 1, pairwise_dists)
+        if self._concatenation_mode >= 0:
+            dist_eval = _evaluate_nodes(
+                pairwise_dists,
+                self.rotation_unit_masks,
+                self._radius,
+                self._concatenation_mode,
+                self.n_smallest,
+                self.unfold,
+                self.pushback,
+                self.clash_distance,
+            )
+        else:
+            self.ndx = 0
+            dist_eval = np.apply_along_axis(
+                self.concatenation_function, 1, pairwise_dists
+            )
         mask = dist_eval > -1
 
         if not np.logical_or.reduce(mask):
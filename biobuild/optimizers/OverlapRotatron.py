@@ -8,7 +8,6 @@ import gym
 
 import numpy as np
 from scipy.spatial.distance import cdist
-from scipy.stats import multivariate_normal
 
 # from sklearn.mixture import GaussianMixture
 # from scipy.stats import entropy
@@ -40,6 +39,9 @@ def MVN(points):
     mvn : scipy.stats.multivariate_normal
         The multi-variate normal distribution for the points.
     """
+    # scipy.stats is slow to import and only needed once this environment is used
+    from scipy.stats import multivariate_normal
+
     return multivariate_normal(
         mean=np.mean(points, axis=0),
         cov=np.cov(points, rowvar=False),
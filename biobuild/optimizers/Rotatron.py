@@ -33,6 +33,9 @@ class Rotatron(gym.Env):
         self.rotatable_edges = self._get_rotatable_edges(graph, rotatable_edges)
 
         self.node_dict = {n: i for i, n in enumerate(self.graph.nodes)}
+        self.edge_dict = {}
+        for i, e in enumerate(self.rotatable_edges):
+            self.edge_dict.setdefault(tuple(e), i)
         self.n_nodes = len(self.node_dict)
         self.n_edges = len(self.rotatable_edges)
 
@@ -76,16 +79,11 @@ class Rotatron(gym.Env):
         """
         Compute the edge masks of downstream nodes
         """
-        self.edge_masks = np.array(
-            [
-                [
-                    1 if i in self.graph.get_descendants(*e) else 0
-                    for i in self.graph.nodes
-                ]
-                for e in self.rotatable_edges
-            ],
-            dtype=bool,
-        )
+        self.edge_masks = np.zeros((self.n_edges, self.n_nodes), dtype=bool)
+        self.graph._prepare_descendants()
+        for edx, e in enumerate(self.rotatable_edges):
+            descendants = self.graph.get_descendants(*e)
+            self.edge_masks[edx, [self.node_dict[i] for i in descendants]] = True
 
     @property
     def best(self):
@@ -95,7 +93,11 @@ class Rotatron(gym.Env):
         return self._best_state, self._best_action, self._best_eval
 
     def get_edge_idx(self, _edge):
-        return self.rotatable_edges.index(_edge)
+        edx = self.edge_dict.get(tuple(_edge))
+        if edx is None:
+            # edges may also match in reverse (e.g. Bond objects)
+            edx = self.rotatable_edges.index(_edge)
+        return edx
 
     def get_node_idx(self, _node):
         return self.node_dict[_node]
@@ -144,8 +146,8 @@ class Rotatron(gym.Env):
         vec /= length
         ref_coord = self.get_node_coords(edge[0])
 
-        rot = Rotation.from_rotvec(vec * angle)
-        self.state[mask] = rot.apply(self.state[mask] - ref_coord) + ref_coord
+        rot = Rotation.from_rotvec(vec * angle).as_matrix()
+        self.state[mask] = (self.state[mask] - ref_coord) @ rot.T + ref_coord
         return self.state
 
     def _rotate(self, edx, angle):
@@ -175,8 +177,8 @@ class Rotatron(gym.Env):
         vec /= length
         ref_coord = self._get_edge_ref_coord(edx)
 
-        rot = Rotation.from_rotvec(vec * angle)
-        self.state[mask] = rot.apply(self.state[mask] - ref_coord) + ref_coord
+        rot = Rotation.from_rotvec(vec * angle).as_matrix()
+        self.state[mask] = (self.state[mask] - ref_coord) @ rot.T + ref_coord
         return self.state
 
     def eval(self, state):
@@ -304,10 +306,11 @@ class Rotatron(gym.Env):
         """
         if rotatable_edges is None:
             _circulars = graph.nodes_in_cycles
+            graph._prepare_descendants()
             rotatable_edges = [
                 e
                 for e in graph.edges
-                if e not in graph._locked_edges
+                if not graph.is_locked(*e)
                 and graph.edges[e].get("bond_order", 1) == 1
                 and not "Residue" in type(e[0]).__name__
                 and not "Residue" in type(e[1]).__name__
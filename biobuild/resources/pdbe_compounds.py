@@ -91,7 +91,7 @@ If multiple compounds match a query, they are returned as a list (unless `return
 Setting default PDBECompounds
 =============================
 
-_biobuild_ loads a default PDBECompounds object for convenience. The default instance can be accessed using the `get_default_compounds` function. A custom instance can be set as the default using the `set_default_compounds` function.
+_biobuild_ loads a default PDBECompounds object for convenience (when it is first needed). The default instance can be accessed using the `get_default_compounds` function. A custom instance can be set as the default using the `set_default_compounds` function.
 
 .. code-block:: python
 
@@ -129,14 +129,19 @@ Other toplevel functions indlude `has_compound` and `add_compound`.
 """
 
 import os
+import re
 import warnings
 import numpy as np
-import pdbecif.mmcif_tools as mmcif_tools
 import pickle
+import sys
 
 import Bio.PDB as bio
 from Bio import SVDSuperimposer
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial.distance import cdist
 
+import biobuild.utils.cif as cif
+from biobuild.utils.pdb import __amino_acids as _amino_acids
 import biobuild.utils.json as json
 import biobuild.utils.defaults as defaults
 import biobuild.utils.auxiliary as aux
@@ -201,6 +206,26 @@ __needs_to_have__ = set(
 
 __search_by__ = ("id", "name", "formula", "smiles")
 
+_inchikey_pattern = re.compile(r"[A-Z]{14}-[A-Z]{10}-[A-Z]")
+"""
+Pattern of an InChIKey (hashed InChI) descriptor.
+"""
+
+_formula_pattern = re.compile(r"([A-Z][a-z]?)\s*(\d*)")
+"""
+Pattern of one element and its (optional) count in a chemical formula.
+"""
+
+
+_pickle_buffer_size = 1 << 20
+"""
+The buffer size used when saving and loading pickled PDBECompounds objects.
+"""
+
+_max_templates = 512
+"""
+The number of template molecules each PDBECompounds object keeps (the least recently used ones are dropped).
+"""
 
 _bond_order_rev_map = {
     "SING": 1,
@@ -305,11 +330,7 @@ def has_compound(compound: str, search_by: str = None) -> bool:
     """
     if search_by is not None:
         return get_default_compounds().has_residue(compound, by=search_by)
-
-    for by in __search_by__:
-        if get_default_compounds().has_residue(compound, by=by):
-            return True
-    return False
+    return get_default_compounds()._find_any(compound)[0] is not None
 
 
 def get_compound(compound: str, search_by: str = None, return_type: str = "molecule"):
@@ -335,20 +356,23 @@ def get_compound(compound: str, search_by: str = None, return_type: str = "molec
         The molecule object, structure, or tuple of dictionaries.
         If multiple compounds are found matching, they are returned as a list.
     """
-    if not has_compound(compound, search_by=search_by):
+    comps = get_default_compounds()
+    # the matches are found once and then used directly
+    if search_by is not None:
+        matches = comps._get(compound, search_by)
+    else:
+        matches = comps._find_any(compound)[1]
+    if not matches:
         raise ValueError(
             f"Compound {compound} not found in the default PDBECompounds instance."
         )
-    comps = get_default_compounds()
-    for by in __search_by__:
-        if comps.has_residue(compound, by=by):
-            comp = comps.get(compound, by=by, return_type=return_type)
-            if return_type == "dict":
-                if isinstance(comp, list):
-                    comp = [(c, comps._pdb[c["id"]]) for c in comp]
-                else:
-                    comp = comp, comps._pdb[comp["id"]]
-            return comp
+    comp = comps._from_matches(matches, return_type)
+    if return_type == "dict":
+        if isinstance(comp, list):
+            comp = [(c, comps._pdb[c["id"]]) for c in comp]
+        else:
+            comp = comp, comps._pdb[comp["id"]]
+    return comp
 
 
 def add_compound(
@@ -394,7 +418,14 @@ def get_default_compounds() -> "PDBECompounds":
     PDBECompounds
         The currently loaded default PDBECompounds instance.
     """
-    return defaults.__default_instances__["PDBECompounds"]
+    compounds = defaults.get_default_instance("PDBECompounds")
+    if compounds is None:
+        # the base library is only read once it is first needed
+        compounds = read_compounds(
+            defaults.DEFAULT_PDBE_COMPONENT_FILES["base"], set_default=False
+        )
+        defaults.set_default_instance("PDBECompounds", compounds)
+    return compounds
 
 
 def set_default_compounds(obj, overwrite: bool = False):
@@ -413,7 +444,7 @@ def set_default_compounds(obj, overwrite: bool = False):
     if not obj.__class__.__name__ == "PDBECompounds":
         raise TypeError("The object must be a PDBECompounds instance.")
     if overwrite:
-        current = defaults.get_default_instance("PDBECompounds")
+        current = get_default_compounds()
         if current:
             if not os.path.exists(
                 defaults.DEFAULT_PDBE_COMPONENT_FILES["base"] + ".bak"
@@ -436,7 +467,7 @@ def save_as_default_compounds(obj):
     """
     if not obj.__class__.__name__ == "PDBECompounds":
         raise TypeError("The object must be a PDBECompounds instance.")
-    current = defaults.get_default_instance("PDBECompounds")
+    current = get_default_compounds()
     if current:
         current.save(defaults.DEFAULT_PDBE_COMPONENT_FILES["base"] + ".bak")
     obj.save(defaults.DEFAULT_PDBE_COMPONENT_FILES["base"])
@@ -508,14 +539,7 @@ def load_amino_acids():
     """
     Load amino acid components into the default PDBECompounds instance.
     """
-    if __loaded_compounds__["amino_acids"]:
-        return
-    comps = get_default_compounds()
-    amino_acids = read_compounds(
-        defaults.DEFAULT_PDBE_COMPONENT_FILES["amino_acids"], set_default=False
-    )
-    comps.merge(amino_acids)
-    __loaded_compounds__["amino_acids"] = True
+    _load_category("amino_acids")
 
 
 def unload_amino_acids():
@@ -535,14 +559,7 @@ def load_lipids():
     """
     Load lipid components into the default PDBECompounds instance.
     """
-    if __loaded_compounds__["lipids"]:
-        return
-    comps = get_default_compounds()
-    lipids = read_compounds(
-        defaults.DEFAULT_PDBE_COMPONENT_FILES["lipids"], set_default=False
-    )
-    comps.merge(lipids)
-    __loaded_compounds__["lipids"] = True
+    _load_category("lipids")
 
 
 def unload_lipids():
@@ -562,14 +579,7 @@ def load_sugars():
     """
     Load sugar components into the default PDBECompounds instance.
     """
-    if __loaded_compounds__["sugars"]:
-        return
-    comps = get_default_compounds()
-    sugars = read_compounds(
-        defaults.DEFAULT_PDBE_COMPONENT_FILES["sugars"], set_default=False
-    )
-    comps.merge(sugars)
-    __loaded_compounds__["sugars"] = True
+    _load_category("sugars")
 
 
 def unload_sugars():
@@ -589,15 +599,7 @@ def load_nucleotides():
     """
     Load nucleotide components into the default PDBECompounds instance.
     """
-    if __loaded_compounds__["nucleotides"]:
-        return
-
-    comps = get_default_compounds()
-    nucleotides = read_compounds(
-        defaults.DEFAULT_PDBE_COMPONENT_FILES["nucleotides"], set_default=False
-    )
-    comps.merge(nucleotides)
-    __loaded_compounds__["nucleotides"] = True
+    _load_category("nucleotides")
 
 
 def unload_nucleotides():
@@ -617,14 +619,7 @@ def load_small_molecules():
     """
     Load small molecule components into the default PDBECompounds instance.
     """
-    if __loaded_compounds__["small_molecules"]:
-        return
-    comps = get_default_compounds()
-    small_molecules = read_compounds(
-        defaults.DEFAULT_PDBE_COMPONENT_FILES["small_molecules"], set_default=False
-    )
-    comps.merge(small_molecules)
-    __loaded_compounds__["small_molecules"] = True
+    _load_category("small_molecules")
 
 
 def unload_small_molecules():
@@ -644,11 +639,36 @@ def load_all_compounds():
     """
     Load all available components into the default PDBECompounds instance.
     """
-    load_amino_acids()
-    load_lipids()
-    load_sugars()
-    load_nucleotides()
-    load_small_molecules()
+    for category in (
+        "amino_acids",
+        "lipids",
+        "sugars",
+        "nucleotides",
+        "small_molecules",
+    ):
+        _load_category(category)
+
+
+def _read_category(category: str) -> "PDBECompounds":
+    """
+    Read the components of a category from their default file.
+    """
+    return read_compounds(
+        defaults.DEFAULT_PDBE_COMPONENT_FILES[category], set_default=False
+    )
+
+
+def _load_category(category: str, compounds: "PDBECompounds" = None):
+    """
+    Merge the components of a category into the default PDBECompounds instance
+    (unless they were already loaded). If the components are not given they are read from their default file.
+    """
+    if __loaded_compounds__[category]:
+        return
+    if compounds is None:
+        compounds = _read_category(category)
+    get_default_compounds().merge(compounds)
+    __loaded_compounds__[category] = True
 
 
 def unload_all_compounds():
@@ -685,6 +705,17 @@ class PDBECompounds:
 
         self._filename = None
         self._orig = compounds
+        self._bond_tables = {}
+        self._templates = {}
+        self._search_index = {}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        # the template molecules, search index and code maps are only caches and are rebuilt on demand
+        state["_templates"] = {}
+        state["_search_index"] = {}
+        state.pop("_code_maps", None)
+        return state
 
     @classmethod
     def from_file(cls, filename: str) -> "PDBECompounds":
@@ -701,20 +732,17 @@ class PDBECompounds:
         PDBECompounds
             The PDBECompounds object.
         """
-        _dict = mmcif_tools.MMCIF2Dict()
-        _dict = _dict.parse(filename, ignoreCategories=__to_ignore__)
-
-        # Make sure all required fields are present
-        _keys = set(_dict.keys())
-        for key in _keys:
-            v = _dict[key]
+        new = cls()
+        # the compounds are read and processed one at a time
+        for key, v in cif.read_data_blocks(filename, ignore=__to_ignore__):
+            # Make sure all required fields are present
             if not all(i in v.keys() for i in __needs_to_have__):
-                del _dict[key]
                 warnings.warn(
                     f"Compound '{key}' does not have all required fields. It will be ignored."
                 )
+                continue
+            new._setup_dictionaries({key: v})
 
-        new = cls(_dict)
         new._filename = filename
         return new
 
@@ -733,7 +761,7 @@ class PDBECompounds:
         PDBECompounds
             The PDBECompounds object.
         """
-        with open(filename, "rb") as f:
+        with open(filename, "rb", buffering=_pickle_buffer_size) as f:
             return pickle.load(f)
 
     @classmethod
@@ -780,11 +808,10 @@ class PDBECompounds:
                 "formula": compound["formula"],
                 "one_letter_code": compound["one_letter_code"],
                 "three_letter_code": compound["three_letter_code"],
-                "names": compound["names"],
+                "names": _lower_names(compound["names"]),
                 "descriptors": compound["identifiers"],
             }
-            mol = Molecule._from_dict(compound)
-            pdb_dict = _molecule_to_pdbx_dict(mol)
+            pdb_dict = _json_to_pdbx_dict(compound["structure"])
 
             new._compounds[compound["id"]] = comp_dict
             new._pdb[compound["id"]] = pdb_dict
@@ -835,8 +862,8 @@ class PDBECompounds:
 
         self._filename = filename
 
-        with open(filename, "wb") as f:
-            pickle.dump(self, f)
+        with open(filename, "wb", buffering=_pickle_buffer_size) as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     def to_json(self, filename: str = None) -> None:
         """
@@ -867,13 +894,17 @@ class PDBECompounds:
         other : PDBECompounds
             The other object.
         """
+        overlap = self._compounds.keys() & other._compounds.keys()
+        if overlap:
+            warnings.warn(
+                f"Compounds {', '.join(sorted(overlap))} already present. They will be overwritten."
+            )
+        self._compounds.update(other._compounds)
+        self._pdb.update(other._pdb)
         for key in other._compounds.keys():
-            if key in self._compounds:
-                warnings.warn(
-                    f"Compound '{key}' already present. It will be overwritten."
-                )
-            self._compounds[key] = other._compounds[key]
-            self._pdb[key] = other._pdb[key]
+            self._drop_cached(key)
+        # a bulk merge is cheaper to index anew on the next query
+        self.__dict__["_search_index"] = {}
 
     def get(
         self,
@@ -909,13 +940,19 @@ class PDBECompounds:
             The object that matches the given criteria, or None if no match was found.
             If multiple matches are found, a list of objects is returned.
         """
-        _dict = self._get(query, by)
-        if len(_dict.keys()) == 0:
+        return self._from_matches(self._get(query, by), return_type)
+
+    def _from_matches(self, matches: dict, return_type: str = "molecule"):
+        """
+        Make the objects to return from `get` for a dictionary of matching compounds
+        (as returned by `_get`).
+        """
+        if len(matches) == 0:
             return None
-        elif len(_dict.keys()) > 1:
-            return [self.get(i, "id", return_type) for i in _dict.keys()]
+        elif len(matches) > 1:
+            return [self._from_matches({k: v}, return_type) for k, v in matches.items()]
 
-        _dict = list(_dict.values())[0]
+        _dict = next(iter(matches.values()))
         if return_type == "molecule":
             return self._molecule(_dict)
         elif return_type == "dict":
@@ -967,18 +1004,20 @@ class PDBECompounds:
         # get the residue
         comp = {
             "id": mol.id,
-            "names": set(i.lower() for i in names),
+            "names": _lower_names((*names, mol.id)),
             "formula": formula,
             "descriptors": identifiers,
             "type": type,
             "one_letter_code": one_letter_code,
             "three_letter_code": three_letter_code,
         }
-        comp["names"].add(mol.id.lower())
+        old = self._compounds.get(mol.id)
         self._compounds[mol.id] = comp
 
         pdb = _molecule_to_pdbx_dict(mol)
         self._pdb[mol.id] = pdb
+        self._drop_cached(mol.id)
+        self._update_search_index(mol.id, old)
 
     def remove(self, id: str) -> None:
         """
@@ -989,8 +1028,10 @@ class PDBECompounds:
         id : str
             The id of the compound to remove.
         """
-        self._compounds.pop(id, None)
+        old = self._compounds.pop(id, None)
         self._pdb.pop(id, None)
+        self._drop_cached(id)
+        self._update_search_index(id, old)
 
     def has_residue(self, query: str, by: str = "id") -> bool:
         """
@@ -1016,6 +1057,115 @@ class PDBECompounds:
         _dict = self._get(query, by)
         return len(_dict.keys()) > 0
 
+    def _find_any(self, query: str) -> tuple:
+        """
+        Find the compounds that match a query by any of the search types,
+        which are tried in the order of `__search_by__` (i.e. the id first).
+
+        Returns
+        -------
+        tuple
+            The search type that matched and the dictionary of matching compounds,
+            or None and an empty dictionary if nothing matched.
+        """
+        for by in __search_by__:
+            # the query may be anything, so it is not parsed as a SMILES for the InChIKey search
+            matches = self._get(query, by, equivalent=False)
+            if matches:
+                return by, matches
+        return None, {}
+
+    def get_bond_table(self, id: str) -> tuple:
+        """
+        Get the bonds of a compound as a table of atom ids and bond orders.
+        The table is computed once per compound and then reused.
+
+        Parameters
+        ----------
+        id : str
+            The id of the compound.
+
+        Returns
+        -------
+        tuple
+            A tuple of (atom1 id, atom2 id, bond order) tuples,
+            or None if the compound is not available.
+        """
+        tables = self.__dict__.setdefault("_bond_tables", {})
+        table = tables.get(id)
+        if table is None:
+            ref = self.get(id)
+            if ref is None:
+                return None
+            table = tuple(
+                (bond.atom1.id, bond.atom2.id, bond.order) for bond in ref.get_bonds()
+            )
+            tables[id] = table
+        return table
+
+    def _drop_cached(self, id: str):
+        """
+        Forget the cached bond table and template molecule of a compound
+        (after it was added, replaced or removed).
+        """
+        self.__dict__.setdefault("_bond_tables", {}).pop(id, None)
+        self.__dict__.setdefault("_templates", {}).pop(id, None)
+        self.__dict__.pop("_code_maps", None)
+
+    def _update_search_index(self, id: str, old: dict = None):
+        """
+        Move a compound that was added, replaced or removed within the search indices that are already built,
+        so they do not have to be rebuilt for the next query. `old` is the compound's previous data (if any).
+        Indices that were already out of date or cannot hold the compound are dropped instead.
+        """
+        indices = self.__dict__.setdefault("_search_index", {})
+        new = self._compounds.get(id)
+        size = len(self._compounds)
+        previous_size = size - (new is not None) + (old is not None)
+        for by, (built_size, mapping) in list(indices.items()):
+            new_values = _search_values(new, by) if new is not None else ()
+            if mapping is None or built_size != previous_size or new_values is None:
+                del indices[by]
+                continue
+            if old is not None:
+                for value in _search_values(old, by) or ():
+                    ids = mapping.get(value)
+                    if ids and id in ids:
+                        ids.remove(id)
+                        if not ids:
+                            del mapping[value]
+            for value in new_values:
+                ids = mapping.setdefault(value, [])
+                if id not in ids:
+                    ids.append(id)
+            indices[by] = (size, mapping)
+
+    def _get_search_index(self, by: str):
+        """
+        Get the index mapping names, formulas or descriptors to the ids of all compounds that have them.
+        The index is built on first use, kept up to date by `add`, `remove` and `merge`, and rebuilt if the
+        number of compounds changed otherwise. If any compound stores the searched field in a form that
+        does not support exact matching, None is returned.
+        """
+        indices = self.__dict__.setdefault("_search_index", {})
+        index = indices.get(by)
+        if index is not None and index[0] == len(self._compounds):
+            return index[1]
+
+        mapping = {}
+        for key, comp in self._compounds.items():
+            values = _search_values(comp, by)
+            if values is None:
+                mapping = None
+                break
+            for value in values:
+                ids = mapping.setdefault(value, [])
+                if not ids or ids[-1] != key:
+                    ids.append(key)
+
+        indices[by] = (len(self._compounds), mapping)
+        return mapping
+
     def translate_ids_3_to_1(self, ids: list) -> list:
         """
         Translate a list of 3-letter compound ids to 1-letter ids.
@@ -1031,14 +1181,8 @@ class PDBECompounds:
         list
             A list of 1-letter compound ids.
         """
-        new = []
-        for i in ids:
-            i = self.get(i, "id", "dict")
-            i = i.get("one_letter_code", None)
-            if i is None:
-                i = "X"
-            new.append(i)
-        return new
+        three_to_one = self._get_code_maps()[0]
+        return [three_to_one.get(i, "X") for i in ids]
 
     def translate_ids_1_to_3(self, ids: list) -> list:
         """
@@ -1055,14 +1199,35 @@ class PDBECompounds:
         list
             A list of 3-letter compound ids.
         """
-        new = []
-        for i in ids:
-            i = self.get(i, "id", "dict")
-            i = i.get("three_letter_code", None)
-            if i is None:
-                i = "XXX"
-            new.append(i)
-            return new
+        one_to_three = self._get_code_maps()[1]
+        return [one_to_three.get(i, "XXX") for i in ids]
+
+    def _get_code_maps(self):
+        """
+        Get the dictionaries translating 3-letter compound ids to 1-letter ids and back.
+        The maps are built on first use and rebuilt after compounds were added, replaced or removed.
+        If several compounds share a 1-letter id (e.g. modified amino acids), it is translated
+        to the standard amino acid (if there is one) or otherwise to the first of these compounds.
+        """
+        maps = self.__dict__.get("_code_maps")
+        if maps is not None and maps[0] == len(self._compounds):
+            return maps[1:]
+
+        three_to_one = {}
+        one_to_three = {}
+        for key, comp in self._compounds.items():
+            one = comp.get("one_letter_code")
+            if one is None:
+                continue
+            three_to_one[key] = one
+            three = comp.get("three_letter_code") or key
+            if three in _amino_acids:
+                one_to_three[one] = three
+            else:
+                one_to_three.setdefault(one, three)
+
+        self._code_maps = (len(self._compounds), three_to_one, one_to_three)
+        return three_to_one, one_to_three
 
     def relabel_atoms(self, structure):
         """
@@ -1080,30 +1245,33 @@ class PDBECompounds:
         """
         imposer = SVDSuperimposer.SVDSuperimposer()
         for residue in structure.get_residues():
-            # get a reference
+            # get a reference (the atoms of the reference residue are
+            # exactly the atoms stored for the compound, in the same order)
             name = residue.resname
-            ref = self.get(name, "id", "residue")
+            ref = self._pdb.get(name)
             if ref is None:
                 warnings.warn(f"Could not find residue '{name}' in PDBECompounds.")
                 continue
+            ref_coords = np.asarray(ref["atoms"]["coords"], dtype=np.float64)
+            ref_atom_ids = ref["atoms"]["full_ids"]
 
-            residue_coords = np.asarray([atom.coord for atom in residue.get_atoms()])
-            ref_coords = np.asarray([atom.coord for atom in ref.get_atoms()])
+            atoms = list(residue.get_atoms())
+            residue_coords = np.asarray([atom.coord for atom in atoms])
             imposer.set(ref_coords, residue_coords)
             imposer.run()
 
             # get the residue coordinates
             new_coords = imposer.get_transformed()
 
-            ref_atom_ids = [atom.id for atom in ref.get_atoms()]
-            for idx, atom in enumerate(list(residue.get_atoms())):
-                _new = new_coords[idx]
-                min_idx = np.argmin(np.linalg.norm(ref_coords - _new, axis=1))
-                atom.id = ref_atom_ids[min_idx]
+            # match the atoms to the reference atoms such that the total distance is minimal
+            # (unlike the closest reference atom of each atom, this never assigns a label twice)
+            rows, cols = linear_sum_assignment(cdist(new_coords, ref_coords))
+            for row, col in zip(rows, cols):
+                atoms[row].id = ref_atom_ids[col]
 
         return structure
 
-    def _get(self, q: str, by: str = "id"):
+    def _get(self, q: str, by: str = "id", equivalent: bool = True):
         """
         Get a dictionary of compounds that match the given criteria.
 
@@ -1117,6 +1285,9 @@ class PDBECompounds:
             - "name": search by compound name (must match any available synonym exactly)
             - "formula": search by compound formula
             - "smiles": search by compound smiles (this also works for inchi)
+        equivalent : bool, optional
+            If True, a smiles search that finds no exact match also looks for compounds with the same InChIKey
+            (this requires RDKit). This is skipped when all search types are tried on arbitrary queries.
 
         Returns
         -------
@@ -1129,18 +1300,30 @@ class PDBECompounds:
                 return {}
             return {q: _q}
         elif by == "name":
-            return {k: v for k, v in self._compounds.items() if q.lower() in v["names"]}
+            q = q.lower()
+            field = "names"
         elif by == "formula":
-            return {
-                k: v
-                for k, v in self._compounds.items()
-                if q.upper().replace(" ", "") == v["formula"]
-            }
+            # formulas are matched by their elements and counts so that
+            # "C6 H12 O6", "C6H12O6" and "H12 C6 O6" all find the same compounds
+            q = _canon_formula(q) or _canon_formula(q.upper()) or q.upper().replace(" ", "")
+            field = "formula"
         elif by == "smiles":
-            return {k: v for k, v in self._compounds.items() if q in v["descriptors"]}
+            field = "descriptors"
         else:
             raise ValueError(f"Invalid search type: {by}")
 
+        index = self._get_search_index(by)
+        if index is not None:
+            found = index.get(q, ())
+            if not found and by == "smiles" and equivalent:
+                # equivalent SMILES or InChI strings may be written differently
+                # but they share the same InChIKey
+                key = _query_inchikey(q)
+                if key is not None:
+                    found = (self._get_search_index("inchikey") or {}).get(key, ())
+            return {k: self._compounds[k] for k in found}
+        return {k: v for k, v in self._compounds.items() if q in v[field]}
+
     def _setup_dictionaries(self, data_dict):
         """
         Fill in the dictionaries with the appropriate data
@@ -1179,7 +1362,7 @@ class PDBECompounds:
                     identifiers["identifier"] = [identifiers["identifier"]]
                 comp["names"].extend(identifiers["identifier"])
 
-            comp["names"] = set(i.lower() for i in comp["names"])
+            comp["names"] = _lower_names(comp["names"])
 
             if comp["formula"] is not None:
                 comp["formula"] = comp["formula"].replace(" ", "")
@@ -1202,22 +1385,24 @@ class PDBECompounds:
 
             pdb = {
                 "atoms": {
-                    "full_ids": [i.replace(",", "'") for i in atoms["atom_id"]],
+                    "full_ids": [
+                        sys.intern(i.replace(",", "'")) for i in atoms["atom_id"]
+                    ],
                     "ids": [
-                        i.replace(",", "'") for i in atoms["pdbx_component_atom_id"]
+                        sys.intern(i.replace(",", "'"))
+                        for i in atoms["pdbx_component_atom_id"]
                     ],
                     "serials": np.array(atoms["pdbx_ordinal"], dtype=int),
+                    # numpy converts the coordinate strings in one go
                     "coords": np.array(
-                        [
-                            (float(i), float(j), float(k))
-                            for i, j, k in zip(
-                                atoms["pdbx_model_Cartn_x_ideal"],
-                                atoms["pdbx_model_Cartn_y_ideal"],
-                                atoms["pdbx_model_Cartn_z_ideal"],
-                            )
-                        ]
-                    ),
-                    "elements": atoms["type_symbol"],
+                        (
+                            atoms["pdbx_model_Cartn_x_ideal"],
+                            atoms["pdbx_model_Cartn_y_ideal"],
+                            atoms["pdbx_model_Cartn_z_ideal"],
+                        ),
+                        dtype=np.float64,
+                    ).T.copy(),
+                    "elements": [sys.intern(i) for i in atoms["type_symbol"]],
                     "charges": np.array(atoms["charge"], dtype=float),
                     # ---------------------- FUTURE UPDATE ----------------------
                     # support multi-residue molecules
@@ -1230,7 +1415,10 @@ class PDBECompounds:
                 },
                 "bonds": {
                     "bonds": [
-                        (a.replace(",", "'"), b.replace(",", "'"))
+                        (
+                            sys.intern(a.replace(",", "'")),
+                            sys.intern(b.replace(",", "'")),
+                        )
                         for a, b in zip(bonds["atom_id_1"], bonds["atom_id_2"])
                     ],
                     "parents": [(1, 1) for i in bonds["atom_id_1"]],
@@ -1238,7 +1426,7 @@ class PDBECompounds:
                 },
                 "residues": {
                     "serials": [1],
-                    "names": [atoms["pdbx_component_comp_id"][0]],
+                    "names": [sys.intern(atoms["pdbx_component_comp_id"][0])],
                 },
             }
             self._pdb[key] = pdb
@@ -1246,6 +1434,33 @@ class PDBECompounds:
     def _molecule(self, compound: dict) -> Molecule:
         """
         Make a biobuild Molecule from a compound.
+        The molecule is only built once per compound,
+        afterward copies of this template are returned.
+        Only the most recently used templates are kept (see `_max_templates`).
+
+        Parameters
+        ----------
+        compound : dict
+            A dictionary of a compound.
+
+        Returns
+        -------
+        Molecule
+            A biobuild Molecule.
+        """
+        templates = self.__dict__.setdefault("_templates", {})
+        # re-inserting a used template keeps the dictionary in order of last use
+        template = templates.pop(compound["id"], None)
+        if template is None:
+            template = self._make_molecule(compound)
+            if len(templates) >= _max_templates:
+                del templates[next(iter(templates))]
+        templates[compound["id"]] = template
+        return template.copy()
+
+    def _make_molecule(self, compound: dict) -> Molecule:
+        """
+        Build a biobuild Molecule from the stored data of a compound.
 
         Parameters
         ----------
@@ -1366,12 +1581,6 @@ class PDBECompounds:
             yield key, self._compounds[key], self._pdb[key]
 
 
-defaults.set_default_instance(
-    "PDBECompounds",
-    read_compounds(defaults.DEFAULT_PDBE_COMPONENT_FILES["base"], set_default=False),
-)
-
-
 def _residue_from_chain(idx, chain):
     """
     Get a residue from a chain
@@ -1379,6 +1588,80 @@ def _residue_from_chain(idx, chain):
     return next((i for i in chain.child_list if i.id[1] == idx), None)
 
 
+def _search_values(compound: dict, by: str):
+    """
+    Get the values of a compound under which it is found in the search index of a search type,
+    or None if the compound stores them in a form that does not support exact matching.
+    """
+    if by == "formula":
+        formula = compound["formula"]
+        if formula is None:
+            return (None,)
+        return (_canon_formula(formula) or formula.upper().replace(" ", ""),)
+    values = compound["names" if by == "name" else "descriptors"]
+    if not isinstance(values, (list, tuple, set)):
+        return None
+    if by == "inchikey":
+        keys = [i for i in values if _inchikey_pattern.fullmatch(i)]
+        if not keys:
+            keys = (_query_inchikey(i) for i in values if i.startswith("InChI="))
+            keys = [i for i in keys if i is not None]
+        return keys
+    return values
+
+
+def _lower_names(names) -> tuple:
+    """
+    Get the (interned) lowercase versions of compound names as a sorted tuple without duplicates.
+    """
+    return tuple(sorted({sys.intern(i.lower()) for i in names}))
+
+
+def _canon_formula(formula: str):
+    """
+    Get the canonical form of a chemical formula as a sorted tuple of (element, count) pairs,
+    or None if the formula cannot be parsed.
+    """
+    counts = {}
+    end = 0
+    formula = formula.strip()
+    for match in _formula_pattern.finditer(formula):
+        # everything between two elements must be whitespace
+        if formula[end : match.start()].strip():
+            return None
+        element, count = match.groups()
+        counts[element] = counts.get(element, 0) + int(count or 1)
+        end = match.end()
+    if not counts or formula[end:].strip():
+        return None
+    return tuple(sorted(counts.items()))
+
+
+def _query_inchikey(query: str):
+    """
+    Get the InChIKey of a SMILES or InChI string, or None if it cannot be computed
+    (this requires RDKit).
+    """
+    if _inchikey_pattern.fullmatch(query):
+        return query
+    if not aux.HAS_RDKIT:
+        return None
+    # queries are often not SMILES at all (e.g. when all search types are tried)
+    # so RDKit should not complain about them
+    aux.RDLogger.DisableLog("rdApp.*")
+    try:
+        if query.startswith("InChI="):
+            key = aux.Chem.InchiToInchiKey(query)
+        else:
+            mol = aux.Chem.MolFromSmiles(query)
+            key = aux.Chem.MolToInchiKey(mol) if mol is not None else None
+    except Exception:
+        key = None
+    finally:
+        aux.RDLogger.EnableLog("rdApp.*")
+    return key or None
+
+
 def _molecule_to_pdbx_dict(mol):
     """
     Make a pdbx dictionary from a molecule.
@@ -1387,26 +1670,24 @@ def _molecule_to_pdbx_dict(mol):
 
     pdb = {
         "atoms": {
-            "full_ids": [i.id.replace(",", "'") for i in mol.get_atoms()],
-            "ids": [i.id.replace(",", "'") for i in mol.get_atoms()],
+            "full_ids": [
+                sys.intern(i.id.replace(",", "'")) for i in mol.get_atoms()
+            ],
+            "ids": [sys.intern(i.id.replace(",", "'")) for i in mol.get_atoms()],
             "serials": [i.serial_number for i in mol.get_atoms()],
             "coords": np.array(
-                [
-                    (float(i), float(j), float(k))
-                    for i, j, k in zip(
-                        (i.coord[0] for i in mol.get_atoms()),
-                        (i.coord[1] for i in mol.get_atoms()),
-                        (i.coord[2] for i in mol.get_atoms()),
-                    )
-                ]
-            ),
-            "elements": [i.element.title() for i in mol.get_atoms()],
+                [i.coord for i in mol.get_atoms()], dtype=np.float64
+            ).reshape(-1, 3),
+            "elements": [sys.intern(i.element.title()) for i in mol.get_atoms()],
             "charges": [i.pqr_charge for i in mol.get_atoms()],
             "residue": [i.parent.id[1] for i in mol.get_atoms()],
         },
         "bonds": {
             "bonds": [
-                (a.id.replace(",", "'"), b.id.replace(",", "'"))
+                (
+                    sys.intern(a.id.replace(",", "'")),
+                    sys.intern(b.id.replace(",", "'")),
+                )
                 for a, b in _bond_dict.keys()
             ],
             "parents": [
@@ -1417,7 +1698,40 @@ def _molecule_to_pdbx_dict(mol):
         },
         "residues": {
             "serials": [i.id[1] for i in mol.get_residues()],
-            "names": [i.resname for i in mol.get_residues()],
+            "names": [sys.intern(i.resname) for i in mol.get_residues()],
+        },
+    }
+    return pdb
+
+
+def _json_to_pdbx_dict(structure: dict):
+    """
+    Make a pdbx dictionary directly from the structure of a JSON-encoded molecule
+    (this gives the same dictionary as `_molecule_to_pdbx_dict` without building the molecule).
+    """
+    atoms = structure["atoms"]
+    ids = [sys.intern(i.replace(",", "'")) for i in atoms["id"]]
+    index = {serial: idx for idx, serial in enumerate(atoms["serial"])}
+    bonds = [(index[a], index[b]) for a, b in structure["bonds"]["serial"]]
+
+    pdb = {
+        "atoms": {
+            "full_ids": ids,
+            "ids": list(ids),
+            "serials": list(atoms["serial"]),
+            "coords": np.array(atoms["coords_3d"], dtype=np.float64).reshape(-1, 3),
+            "elements": [sys.intern(i.title()) for i in atoms["element"]],
+            "charges": [None] * len(ids),
+            "residue": list(atoms["parent"]),
+        },
+        "bonds": {
+            "bonds": [(ids[a], ids[b]) for a, b in bonds],
+            "parents": [(atoms["parent"][a], atoms["parent"][b]) for a, b in bonds],
+            "orders": [_bond_order_map.get(i) for i in structure["bonds"]["order"]],
+        },
+        "residues": {
+            "serials": list(structure["residues"]["serial"]),
+            "names": [sys.intern(i) for i in structure["residues"]["name"]],
         },
     }
     return pdb
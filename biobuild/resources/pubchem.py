@@ -28,11 +28,19 @@ and a path to the CIF file to write. If no ID is specified, the function will tr
 
     # convert to CIF
     pubchem.pubchem_to_cif(json_file, sdf_file, id="SOMECOMPOUND", cif_file="some_compound.cif")
+
+Caching
+-------
+The records returned by PubChem are cached on disk (by default in ``~/.cache/biobuild/pubchem``, or below ``$XDG_CACHE_HOME`` if set),
+so that repeated queries for the same compound do not need to access the network again. The cache can be bypassed
+by passing ``use_cache=False`` to `query` and can be emptied using `clear_cache`.
 """
 
+import hashlib
 import json
 import os
 import re
+import shutil
 import pubchempy as pcp
 from tabulate import tabulate
 
@@ -101,12 +109,21 @@ _json_headers = ("TOCHeading", "Name", "String")
 Id providing headers in the JSON data structure
 """
 
+_cache_dir = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "biobuild",
+    "pubchem",
+)
+"""
+Directory in which the records of PubChem queries are cached.
+"""
+
 # =========================================================================== #
 #                               Public API                                   #
 # =========================================================================== #
 
 
-def query(_query: str, by: str = "name", idx: int = 0):
+def query(_query: str, by: str = "name", idx: int = 0, use_cache: bool = True):
     """
     Query PubChem for a compound.
 
@@ -120,14 +137,25 @@ def query(_query: str, by: str = "name", idx: int = 0):
     idx : int, optional
         The index of the compound to return if multiple compounds are found. Defaults to 0.
         Only one compound will be returned at a time.
+    use_cache : bool, optional
+        If True, previously downloaded records are read from the on-disk cache
+        and new records are added to it. Defaults to True.
 
     Returns
     -------
     tuple
         The 2D and 3D representations of the compound
     """
-    _2d_comp = pcp.get_compounds(_query, by)
-    _3d_comp = pcp.get_compounds(_query, by, record_type="3d")
+    records = _read_cache(_query, by) if use_cache else None
+    if records is not None:
+        _2d_comp = [pcp.Compound(i) for i in records["2d"]]
+        _3d_comp = [pcp.Compound(i) for i in records["3d"]]
+    else:
+        _2d_comp = pcp.get_compounds(_query, by)
+        _3d_comp = pcp.get_compounds(_query, by, record_type="3d")
+        if use_cache and len(_2d_comp) != 0 and len(_3d_comp) != 0:
+            _write_cache(_query, by, _2d_comp, _3d_comp)
+
     if len(_2d_comp) == 0 or len(_3d_comp) == 0:
         raise ValueError(f"Could not find molecule {_query} in PubChem")
     elif len(_2d_comp) > 1 or len(_3d_comp) > 1:
@@ -137,6 +165,13 @@ def query(_query: str, by: str = "name", idx: int = 0):
     return _2d_comp[idx], _3d_comp[idx]
 
 
+def clear_cache():
+    """
+    Remove all cached PubChem records from disk.
+    """
+    shutil.rmtree(_cache_dir, ignore_errors=True)
+
+
 def pubchem_to_cif(json_file: str, sdf_file: str, id: str = None, cif_file: str = None):
     """
     Convert a downloaded PubChem data entry to a CIF file. This is useful for preparing
@@ -190,13 +225,56 @@ def pubchem_to_cif(json_file: str, sdf_file: str, id: str = None, cif_file: str
         f.write(cif)
 
 
-__all__ = ["query", "pubchem_to_cif"]
+__all__ = ["query", "clear_cache", "pubchem_to_cif"]
 
 # =========================================================================== #
 #                               Private API                                  #
 # =========================================================================== #
 
 
+def _cache_file(_query: str, by: str) -> str:
+    """
+    Get the path of the cache file for a query.
+    The files are sharded into subdirectories by the first two characters of their hash.
+    """
+    key = hashlib.sha1(f"{by}:{_query}".encode()).hexdigest()
+    return os.path.join(_cache_dir, key[:2], key + ".json")
+
+
+def _read_cache(_query: str, by: str):
+    """
+    Read the cached 2D and 3D records of a query, or return None if there are none.
+    """
+    filename = _cache_file(_query, by)
+    if not os.path.isfile(filename):
+        return None
+    try:
+        with open(filename, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(_query: str, by: str, compounds_2d: list, compounds_3d: list):
+    """
+    Write the 2D and 3D records of a query to the cache.
+    Failing to write (e.g. on a read-only file system) is not an error.
+    """
+    filename = _cache_file(_query, by)
+    records = {
+        "2d": [i.record for i in compounds_2d],
+        "3d": [i.record for i in compounds_3d],
+    }
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        tmp = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(records, f)
+        os.replace(tmp, filename)
+    except OSError:
+        pass
+
+
 def load_json(json_file):
     """
     Load a PubChem JSON file and return the data as a dictionary.
@@ -5,6 +5,8 @@ Basic structure related functions
 import numpy as np
 import Bio.PDB as bio
 
+import biobuild.utils.auxiliary as aux
+
 
 def atom_make_full_id(self):
     """
@@ -434,26 +436,62 @@ def _IC_to_xyz(a, b, c, anchor, r, theta, dihedral):
     dihedral : float
         dihedral angle of the internal coordinates
     """
+    return _IC_to_xyz_kernel(
+        np.asarray(a, dtype=np.float64),
+        np.asarray(b, dtype=np.float64),
+        np.asarray(c, dtype=np.float64),
+        np.asarray(anchor, dtype=np.float64),
+        float(r),
+        float(theta),
+        float(dihedral),
+    )
+
+
+@aux.njit(cache=True)
+def _rotate_vector(axis, angle, vec):
+    """
+    Rotate a vector around an arbitrary axis (same rotation as `_rotation_matrix`)
+    """
+    axis = axis / np.sqrt(np.dot(axis, axis))
+    a = np.cos(angle / 2.0)
+    s = np.sin(angle / 2.0)
+    b, c, d = -axis[0] * s, -axis[1] * s, -axis[2] * s
+    aa, bb, cc, dd = a * a, b * b, c * c, d * d
+    bc, ad, ac, ab, bd, cd = b * c, a * d, a * c, a * b, b * d, c * d
+    rot = np.array(
+        (
+            (aa + bb - cc - dd, 2 * (bc + ad), 2 * (bd - ac)),
+            (2 * (bc - ad), aa + cc - bb - dd, 2 * (cd + ab)),
+            (2 * (bd + ac), 2 * (cd - ab), aa + dd - bb - cc),
+        )
+    )
+    return np.dot(rot, vec)
+
+
+@aux.njit(cache=True)
+def _IC_to_xyz_kernel(a, b, c, anchor, r, theta, dihedral):
+    """
+    The numeric core of `_IC_to_xyz`.
+    This is compiled with numba if it is available.
+    """
     ab = b - a
     bc = c - b
 
     # compute normalized bond vectors for available atoms
-    ab /= np.linalg.norm(ab)
-    bc /= np.linalg.norm(bc)
+    ab = ab / np.linalg.norm(ab)
+    bc = bc / np.linalg.norm(bc)
 
     # compute plane vector for atoms 1-2-3
     plane_abc = np.cross(ab, bc)
-    plane_abc /= np.linalg.norm(plane_abc)
+    plane_abc = plane_abc / np.linalg.norm(plane_abc)
 
     # rotate the plane vector around the middle bond (2-3) to get the plane 2-3-4
-    _rot = _rotation_matrix(bc, dihedral)
-    plane_bcd = np.dot(_rot, plane_abc)
-    plane_bcd /= np.linalg.norm(plane_bcd)
+    plane_bcd = _rotate_vector(bc, dihedral, plane_abc)
+    plane_bcd = plane_bcd / np.linalg.norm(plane_bcd)
 
     # rotate the middle bond around the new plane
-    _rot = _rotation_matrix(plane_bcd, theta)
-    cd = np.dot(_rot, bc)
-    cd /= np.linalg.norm(cd)
+    cd = _rotate_vector(plane_bcd, theta, bc)
+    cd = cd / np.linalg.norm(cd)
 
     # compute the coordinates of the fourth atom
     d = anchor + r * cd
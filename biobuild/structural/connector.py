@@ -66,6 +66,16 @@ class Connector:
         if not self.source:
             raise AttributeError("No source set")
 
+        if target_residue:
+            target_residue = self.target.get_residue(target_residue)
+            # a residue that was asked for but does not exist has no anchor atoms
+            if target_residue is None:
+                raise ValueError("No anchor atom found in target molecule")
+        if source_residue:
+            source_residue = self.source.get_residue(source_residue)
+            if source_residue is None:
+                raise ValueError("No anchor atom found in source molecule")
+
         if not _ref_atoms[0]:
             ref_atom_1 = [self.target.root_atom]
         else:
@@ -73,24 +83,26 @@ class Connector:
             # to also work with patches (which would nromally have a 1/2 prefix) which would
             # otherwise prevent anchor finding...
             if isinstance(_ref_atoms[0], str) and _ref_atoms[0].startswith("1"):
-                ref_atom_1 = self.target.get_atoms(_ref_atoms[0][1:])
+                ref_atom_1 = _find_atoms(
+                    self.target, _ref_atoms[0][1:], target_residue, last=True
+                )
             else:
-                ref_atom_1 = self.target.get_atoms(_ref_atoms[0])
+                ref_atom_1 = _find_atoms(
+                    self.target, _ref_atoms[0], target_residue, last=True
+                )
 
         if not _ref_atoms[1]:
             ref_atom_2 = [self.source.root_atom]
         else:
             if isinstance(_ref_atoms[1], str) and _ref_atoms[1].startswith("2"):
-                ref_atom_2 = self.source.get_atoms(_ref_atoms[1][1:])
+                ref_atom_2 = _find_atoms(self.source, _ref_atoms[1][1:], source_residue)
             else:
-                ref_atom_2 = self.source.get_atoms(_ref_atoms[1])
+                ref_atom_2 = _find_atoms(self.source, _ref_atoms[1], source_residue)
 
         if target_residue:
-            target_residue = self.target.get_residue(target_residue)
             ref_atom_1 = [i for i in ref_atom_1 if i.parent == target_residue]
 
         if source_residue:
-            source_residue = self.source.get_residue(source_residue)
             ref_atom_2 = [i for i in ref_atom_2 if i.parent == source_residue]
 
         if len(ref_atom_1) == 0:
@@ -105,3 +117,24 @@ class Connector:
         self._target_residue = ref_atom_1.parent
         self._source_residue = ref_atom_2.parent
         return ref_atom_1, ref_atom_2
+
+
+def _find_atoms(mol, atom, residue=None, last: bool = False) -> list:
+    """
+    Find atoms in a molecule by their id. If a residue is given (and the atom is given by id)
+    only the atoms of that residue are searched. Otherwise, only the first (or last) matching
+    atom in the molecule is returned, since this is the only one used for anchoring.
+    """
+    if not isinstance(atom, str):
+        return mol.get_atoms(atom)
+    if residue is not None:
+        return [i for i in residue.child_list if i.id == atom]
+    residues = list(mol.get_residues())
+    if last:
+        atoms = (i for res in reversed(residues) for i in reversed(res.child_list))
+    else:
+        atoms = (i for res in residues for i in res.child_list)
+    for i in atoms:
+        if i.id == atom:
+            return [i]
+    return []
@@ -9,12 +9,14 @@ from collections import defaultdict
 import warnings
 import numpy as np
 from scipy.spatial.distance import cdist
+from scipy.spatial import cKDTree
 
 from Bio.PDB import NeighborSearch
 import periodictable as pt
 
 import biobuild.utils.ic as _ic
 import biobuild.utils.defaults as defaults
+import biobuild.utils.auxiliary as aux
 import biobuild.resources as resources
 import biobuild.structural.base as base
 import biobuild.structural.neighbors as neighbors
@@ -56,8 +58,8 @@ class AutoLabel:
         self.graph = atom_graph
         self._bond_orders = nx.get_edge_attributes(self.graph, "bond_order")
         self._cycles = nx.cycle_basis(self.graph)
-        self._df_all = self._make_df()
-        self._df = None
+        self._make_tables()
+        self._atoms = None
         self._element_counter = defaultdict(int)
 
     @property
@@ -76,16 +78,25 @@ class AutoLabel:
         pd.DataFrame
             A dataframe with the atom objects and their new labels.
         """
-        for res_df in self._df_all.groupby("residue"):
-            self._df = res_df[1]
+        residues = defaultdict(list)
+        for atom in self._nodes:
+            residues[self._residue[atom]].append(atom)
+
+        for residue in sorted(residues):
+            self._atoms = residues[residue]
             self._parse_carbon_labels()
             self._parse_hetero_labels()
             self._parse_hydrogen_labels()
-            self._df["label"] = self._df["element"] + self._df["label"]
+            for atom in self._atoms:
+                self._labels[atom] = self._element[atom] + self._labels[atom]
             self._final_vet()
-            self._df_all.loc[self._df.index, "label"] = self._df["label"]
 
-        return self._df_all[["atom", "label"]]
+        return pd.DataFrame(
+            {
+                "atom": self._nodes,
+                "label": [self._labels[atom] for atom in self._nodes],
+            }
+        )
 
     def _neighbors(self, atoms):
         """
@@ -93,14 +104,18 @@ class AutoLabel:
         """
         neighbors = []
         neighbor_element_sum = []
+        weights = {}
         for atom in atoms:
             ndx = 0
             edx = 0
             for neighbor in self.graph.neighbors(atom):
                 ndx += 1
-                n_num = pt.elements.symbol(neighbor.element.title()).number
-                if n_num != 1 and n_num != 6:
-                    n_num *= 10
+                n_num = weights.get(neighbor.element)
+                if n_num is None:
+                    n_num = pt.elements.symbol(neighbor.element.title()).number
+                    if n_num != 1 and n_num != 6:
+                        n_num *= 10
+                    weights[neighbor.element] = n_num
                 n_num *= self._bond_orders.get((atom, neighbor), 1)
                 edx += n_num
             neighbors.append(ndx)
@@ -116,104 +131,97 @@ class AutoLabel:
                 return True
         return False
 
-    def _make_df(self):
+    def _make_tables(self):
         """
-        Make a dataframe of the molecule connectivity.
+        Collect the per-atom data (element, residue, connectivity score and label) used for labelling.
         """
-
-        neighbors, neighbor_element_sum = self._neighbors(self.graph.nodes)
-        in_cycle = [self._in_cycle([a]) for a in self.graph.nodes]
-        self._df = pd.DataFrame(
-            {
-                "atom": list(self.graph.nodes),
-                "element": [a.element.title() for a in self.graph.nodes],
-                "neighbors": neighbors,
-                "neighbor_element_sum": neighbor_element_sum,
-                "in_cycle": in_cycle,
-                "residue": [a.get_parent().id[1] for a in self.graph.nodes],
-            }
-        )
-        self._df["total"] = (
-            self._df.neighbors
-            * self._df.neighbor_element_sum
-            * (10 * self._df.in_cycle + 1)
-        )
-        self._df["label"] = "none"
-        return self._df
+        self._nodes = list(self.graph.nodes)
+        neighbors, neighbor_element_sum = self._neighbors(self._nodes)
+        in_cycles = set().union(*self._cycles)
+
+        self._element = {a: a.element.title() for a in self._nodes}
+        self._residue = {a: a.get_parent().id[1] for a in self._nodes}
+        self._total = {
+            a: n * e * (10 * (a in in_cycles) + 1)
+            for a, n, e in zip(self._nodes, neighbors, neighbor_element_sum)
+        }
+        self._labels = {a: "none" for a in self._nodes}
+
+    def _residue_neighbors(self, atom):
+        """
+        Get the neighbors of an atom that belong to the current residue (in residue order).
+        """
+        neighbors = set(self.graph.neighbors(atom))
+        return [a for a in self._atoms if a in neighbors]
 
     def _parse_c1(self, carbons=None):
         if carbons is not None:
-            carbons = self._df[self._df.atom.isin(carbons)]
+            carbons = set(carbons)
+            carbons = [a for a in self._atoms if a in carbons]
         else:
-            carbons = self._df[self._df.element == "C"]
-        carbons = carbons[carbons.label == "none"]
-        carbons = carbons.sort_values("total", ascending=False)
-        # carbons = carbons.sort_values(
-        #     ["neighbors", "neighbor_element_sum"], ascending=False
-        # )
-        carbons = carbons.reset_index(drop=True)
-        return carbons.atom[0]
+            carbons = [a for a in self._atoms if self._element[a] == "C"]
+        carbons = [a for a in carbons if self._labels[a] == "none"]
+        if len(carbons) == 0:
+            return None
+        return _pick(carbons, self._total.__getitem__, False, False)
 
     def _parse_c_next(self, c_current):
-        neighbors = self.graph.neighbors(c_current)
-        neighbors = self._df[self._df.atom.isin(neighbors)]
-        neighbors = neighbors[neighbors.element == "C"]
-        neighbors = neighbors[neighbors.label == "none"]
-        neighbors = neighbors.sort_values("total", ascending=False)
-        # neighbors = neighbors.sort_values(
-        #     ["neighbors", "neighbor_element_sum"], ascending=False
-        # )
-        neighbors = neighbors.reset_index(drop=True)
+        neighbors = [
+            a
+            for a in self._residue_neighbors(c_current)
+            if self._element[a] == "C" and self._labels[a] == "none"
+        ]
         if len(neighbors) == 0:
             return None
-        return neighbors.atom[0]
+        return _pick(neighbors, self._total.__getitem__, False, False)
 
     def _parse_carbon_labels(self):
         c1 = self._parse_c1()
-        self._df.loc[self._df.atom == c1, "label"] = "1"
-        self._c1_row = self._df[self._df.atom == c1]
+        if c1 is None:
+            raise KeyError("No carbon atom found to start labelling from")
+        self._labels[c1] = "1"
+        self._c1 = c1
         idx = 2
         c_current = c1
-        carbons = self._df[self._df.element == "C"]
-        while (carbons.label == "none").any():
+        carbons = [a for a in self._atoms if self._element[a] == "C"]
+        while any(self._labels[a] == "none" for a in carbons):
             c_next = self._parse_c_next(c_current)
             if c_next is None:
-                c_next = self._parse_c1(carbons=carbons[carbons.label == "none"].atom)
-            self._df.loc[self._df.atom == c_next, "label"] = f"{idx}"
+                c_next = self._parse_c1(
+                    carbons=[a for a in carbons if self._labels[a] == "none"]
+                )
+            self._labels[c_next] = f"{idx}"
             idx += 1
             c_current = c_next
-            carbons = self._df[self._df.element == "C"]
 
     def _parse_hetero_labels(self):
         _neighbor_connect_dict = {}
-        heteros = self._df[(self._df.element != "C") * (self._df.element != "H")]
-        while (heteros.label == "none").any():
-            for hetero in heteros.atom:
-                neighbors = self.graph.neighbors(hetero)
-                neighbors = self._df[self._df.atom.isin(neighbors)]
-                # remove c1 row
+        heteros = [a for a in self._atoms if self._element[a] not in ("C", "H")]
+        while any(self._labels[a] == "none" for a in heteros):
+            _unlabeled = sum(1 for a in heteros if self._labels[a] == "none")
+            for hetero in heteros:
+                neighbors = self._residue_neighbors(hetero)
+                # remove c1
                 if (
-                    len(neighbors[(neighbors.element != "H")]) > 1
-                    and len(neighbors[neighbors.element == "C"]) > 1
+                    sum(1 for a in neighbors if self._element[a] != "H") > 1
+                    and sum(1 for a in neighbors if self._element[a] == "C") > 1
                 ):
-                    neighbors = neighbors[neighbors.atom != self._c1_row.atom.iloc[0]]
-                neighbors = neighbors[neighbors.label != "none"]
+                    neighbors = [a for a in neighbors if a is not self._c1]
+                neighbors = [a for a in neighbors if self._labels[a] != "none"]
 
-                if len(neighbors[neighbors.element == "C"]) > 0:
-                    neighbors = neighbors[neighbors.element == "C"]
+                carbons = [a for a in neighbors if self._element[a] == "C"]
+                if len(carbons) > 0:
+                    neighbors = carbons
                     use_blank_label = True
                 else:
                     use_blank_label = False
 
-                # used to by: sort by "label", and ascending=False
-                neighbors = neighbors.sort_values("total", ascending=True)
-
-                neighbors = neighbors.reset_index(drop=True)
                 if len(neighbors) == 0:
                     continue
 
-                neighbor = neighbors.atom.iloc[-1]
-                label = neighbors.label.iloc[-1]
+                # used to by: sort by "label", and ascending=False
+                neighbor = _pick(neighbors, self._total.__getitem__, True, True)
+                label = self._labels[neighbor]
                 if neighbor.element not in _neighbor_connect_dict:
                     _neighbor_connect_dict[neighbor] = {hetero.element: [hetero]}
                 else:
@@ -225,61 +233,78 @@ class AutoLabel:
                         label = label[:-1]
                     label += chr(self._element_counter[hetero.element] + 64)
 
-                self._df.loc[self._df.atom == hetero, "label"] = label
-            heteros = self._df[(self._df.element != "C") * (self._df.element != "H")]
+                self._labels[hetero] = label
+
+            # stop if some heteroatoms can not be reached from any labelled atom
+            if sum(1 for a in heteros if self._labels[a] == "none") == _unlabeled:
+                break
+
         for _heteros in _neighbor_connect_dict.values():
             if len(_heteros) > 1:
-                # idx = 1
                 for h in _heteros.values():
                     for idx, atom in enumerate(h):
-                        self._df.loc[self._df.atom == h, "label"] += str(idx + 1)
-                    # idx += 1
+                        self._labels[atom] += str(idx + 1)
 
     def _parse_hydrogen_labels(self):
         _neighbor_connect_dict = {}
-        hydrogens = self._df[self._df.element == "H"]
-        for hydrogen in hydrogens.atom:
-            neighbors = self.graph.neighbors(hydrogen)
-            neighbors = self._df[self._df.atom.isin(neighbors)]
-            neighbors = neighbors[neighbors.label != "none"]
-            neighbors = neighbors.sort_values("label", ascending=False)
-            # neighbors = neighbors.sort_values(
-            #     ["neighbors", "neighbor_element_sum"], ascending=False
-            # )
-            neighbors = neighbors.reset_index(drop=True)
+        hydrogens = [a for a in self._atoms if self._element[a] == "H"]
+        for hydrogen in hydrogens:
+            neighbors = [
+                a
+                for a in self._residue_neighbors(hydrogen)
+                if self._labels[a] != "none"
+            ]
             if len(neighbors) == 0:
                 continue
-            neighbor = neighbors.atom.iloc[-1]
+            neighbor = _pick(neighbors, self._labels.__getitem__, False, True)
             if neighbor not in _neighbor_connect_dict:
                 _neighbor_connect_dict[neighbor] = [hydrogen]
             else:
                 _neighbor_connect_dict[neighbor].append(hydrogen)
-            element = neighbors.element.iloc[-1]
+            element = self._element[neighbor]
             if element == "C":
                 element = ""
-            label = element + neighbors.label.iloc[-1]
-            self._df.loc[self._df.atom == hydrogen, "label"] = label
+            self._labels[hydrogen] = element + self._labels[neighbor]
         for _hydrogens in _neighbor_connect_dict.values():
             idx = 1
             if len(_hydrogens) > 1:
                 for h in _hydrogens:
-                    self._df.loc[self._df.atom == h, "label"] += str(idx)
+                    self._labels[h] += str(idx)
                     idx += 1
 
     def _final_vet(self):
-        _label_counts = self._df.label.value_counts()
-        _label_counts = _label_counts[_label_counts > 1]
-        _label_counts = _label_counts.sort_index()
-        _label_counts = _label_counts.reset_index()
-        _label_counts.columns = ["label", "count"]
-        _label_counts = _label_counts.sort_values("count", ascending=False)
-        _label_counts = _label_counts.reset_index(drop=True)
-        for idx in range(len(_label_counts)):
-            label = _label_counts.label.iloc[idx]
-            count = _label_counts["count"].iloc[idx]
-            atoms = self._df[self._df.label == label].atom
+        _label_counts = defaultdict(int)
+        for atom in self._atoms:
+            _label_counts[self._labels[atom]] += 1
+        _label_counts = sorted((l, c) for l, c in _label_counts.items() if c > 1)
+        _label_counts = [
+            _label_counts[i] for i in _argsort([c for _, c in _label_counts], False)
+        ]
+        for label, count in _label_counts:
+            atoms = [a for a in self._atoms if self._labels[a] == label]
             for j, atom in enumerate(atoms):
-                self._df.loc[self._df.atom == atom, "label"] += str(j + 1)
+                self._labels[atom] += str(j + 1)
+
+
+def _argsort(values, ascending=True):
+    """
+    Get the sorting order of a list of values. This uses the same
+    (non-stable) sorting as pandas' `sort_values` so that ties are
+    resolved in the same way as they were in the original dataframe-based labelling.
+    """
+    values = np.asarray(values)
+    if ascending:
+        return values.argsort(kind="quicksort")
+    idx = np.arange(len(values))[::-1]
+    return idx[values[::-1].argsort(kind="quicksort")][::-1]
+
+
+def _pick(items, key, ascending, last):
+    """
+    Pick the first (or last) item after sorting a list of items by some key
+    """
+    order = _argsort([key(i) for i in items], ascending)
+    return items[order[-1 if last else 0]]
 
 
 def autolabel(molecule):
@@ -386,19 +411,30 @@ def vet_structure(
         d = base.compute_distance(a, b)
         if not clash_range[0] <= d <= clash_range[1]:
             return False
-    for angle in molecule.angles.values():
+    # any two atoms closer than the lower limit are a clash (bonded or not),
+    # so a single neighbor query replaces comparing all pairs of atoms
+    if len(cKDTree(_atom_coords(molecule)).query_pairs(r=clash_range[0])) > 0:
+        return False
+    for angle in molecule.compute_angles().values():
         if not angle_range[0] <= angle <= angle_range[1]:
             return False
-    for a in molecule.get_atoms():
-        for b in molecule.get_atoms():
-            if a is b:
-                continue
-            dist = base.compute_distance(a, b)
-            if dist <= clash_range[0]:
-                return False
     return True
 
 
+def _atom_coords(molecule, atoms: list = None) -> np.ndarray:
+    """
+    Get the coordinates of all atoms in a molecule (in the order of `get_atoms()`).
+    Biobuild molecules already keep these in one array, for other entities
+    (e.g. Biopython structures or residues) the array is built from the atoms.
+    """
+    coords = getattr(molecule, "coords", None)
+    if isinstance(coords, np.ndarray) and coords.ndim == 2:
+        return coords
+    if atoms is None:
+        atoms = molecule.get_atoms()
+    return np.array([atom.get_coord() for atom in atoms]).reshape(-1, 3)
+
+
 def find_clashes(molecule, min_dist: float = 0.9):
     """
     Find all clashing atoms within a molecule.
@@ -416,20 +452,25 @@ def find_clashes(molecule, min_dist: float = 0.9):
         A tuple of clashing atoms.
     """
     atoms = list(molecule.get_atoms())
-    atom_coords = np.array([atom.get_coord() for atom in atoms])
-    dists = cdist(atom_coords, atom_coords)
-    edge_mask = np.zeros(dists.shape, dtype=bool)
+    atom_coords = _atom_coords(molecule, atoms)
+    pairs = cKDTree(atom_coords).query_pairs(r=min_dist, output_type="ndarray")
+    if len(pairs) == 0:
+        return
+    xs, ys = pairs[:, 0], pairs[:, 1]
+    dists = np.linalg.norm(atom_coords[xs] - atom_coords[ys], axis=1)
+    mask = (0 < dists) & (dists < min_dist)
+    xs, ys = xs[mask], ys[mask]
+
+    index = {atom: idx for idx, atom in enumerate(atoms)}
+    bonded = set()
     for a, b in molecule.get_bonds():
-        i = atoms.index(a)
-        j = atoms.index(b)
-        edge_mask[i, j] = True
-        edge_mask[j, i] = True
-    dists[edge_mask] = np.inf
-    np.fill_diagonal(dists, np.inf)
-    dists = np.triu(dists)
-    xs, ys = np.where((0 < dists) * (dists < min_dist))
-    for i, j in zip(xs, ys):
-        yield atoms[i], atoms[j]
+        i, j = index[a], index[b]
+        bonded.add((i, j) if i < j else (j, i))
+
+    order = np.lexsort((ys, xs))
+    for i, j in zip(xs[order].tolist(), ys[order].tolist()):
+        if (i, j) not in bonded:
+            yield atoms[i], atoms[j]
 
 
 def sample_atoms_around_reference(
@@ -619,32 +660,30 @@ def infer_residue_connections(
             bond_length = defaults.DEFAULT_BOND_LENGTH / 2, bond_length
         min_length, max_length = bond_length
 
-        bonds = []
-        _seen_residues = set()
-        for residue1 in structure.get_residues():
-            for residue2 in structure.get_residues():
-                if residue1 == residue2:
-                    continue
-                elif residue2 in _seen_residues:
-                    continue
-
-                atoms = list(residue1.get_atoms())
-                atoms.extend(residue2.get_atoms())
-
-                _neighbors = NeighborSearch(atoms)
-                _neighbors = _neighbors.search_all(radius=max_length)
+        atoms = [
+            atom
+            for atom in structure.get_atoms()
+            if atom.element != "H" and atom.get_parent() is not None
+        ]
+        if len(atoms) < 2:
+            return []
 
-                _neighbors = (
-                    i
-                    for i in _neighbors
-                    if (i[0].element != "H" and i[1].element != "H")
-                    and i[0].get_parent() != i[1].get_parent()
-                    and np.linalg.norm(i[0].coord - i[1].coord) > min_length
-                )
+        coords = np.array([atom.coord for atom in atoms], dtype=np.float64)
+        pairs = cKDTree(coords).query_pairs(r=max_length, output_type="ndarray")
+        if len(pairs) == 0:
+            return []
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        a, b = pairs[:, 0], pairs[:, 1]
 
-                bonds.extend(_neighbors)
+        residues = {}
+        residue_idx = np.array(
+            [residues.setdefault(id(atom.get_parent()), len(residues)) for atom in atoms],
+            dtype=np.int32,
+        )
+        mask = residue_idx[a] != residue_idx[b]
+        mask &= np.linalg.norm(coords[a] - coords[b], axis=1) > min_length
 
-            _seen_residues.add(residue1)
+        bonds = [(atoms[i], atoms[j]) for i, j in pairs[mask]]
     else:
         connections = infer_residue_connections(
             structure, bond_length=bond_length, triplet=False
@@ -652,10 +691,16 @@ def infer_residue_connections(
         base_bonds = infer_bonds(
             structure, bond_length=bond_length, restrict_residues=True
         )
+        # one-hop lookup of the bonds of each atom
+        _bonds_by_atom = defaultdict(list)
+        for bond in base_bonds:
+            _bonds_by_atom[bond[0]].append(bond)
+            if bond[1] is not bond[0]:
+                _bonds_by_atom[bond[1]].append(bond)
+
         _additional_bonds = []
         for atom1, atom2 in connections:
-            _new = (bond for bond in base_bonds if atom1 in bond)
-            _additional_bonds.extend(_new)
+            _additional_bonds.extend(_bonds_by_atom.get(atom1, ()))
         bonds = connections + _additional_bonds
 
     return bonds
@@ -690,32 +735,189 @@ def infer_bonds(structure, bond_length: float = None, restrict_residues: bool =
         bond_length = (defaults.DEFAULT_BOND_LENGTH / 2, bond_length)
     min_length, max_length = bond_length
 
+    atoms = list(structure.get_atoms())
+    if len(atoms) < 2:
+        return []
+
+    coords = np.array([atom.coord for atom in atoms], dtype=np.float64)
+    is_H = np.array([atom.element == "H" for atom in atoms], dtype=bool)
+
     if restrict_residues:
-        bonds = []
-        for residue in structure.get_residues():
-            atoms = list(residue.get_atoms())
-            _neighbors = NeighborSearch(atoms)
-            bonds.extend(
-                _neighbors.search_all(radius=max_length),
+        residues = {}
+        residue_idx = np.array(
+            [residues.setdefault(id(atom.get_parent()), len(residues)) for atom in atoms],
+            dtype=np.int32,
+        )
+
+    if restrict_residues and aux.HAS_NUMBA:
+        # atoms are grouped by residue so each residue is a slice of the
+        # coordinate array which can be searched in parallel
+        res_starts = np.concatenate(([0], np.flatnonzero(np.diff(residue_idx)) + 1))
+        res_ends = np.append(res_starts[1:], len(atoms))
+        if (res_ends - res_starts).max() <= _MAX_RESIDUE_SIZE_FOR_KERNEL and len(
+            res_starts
+        ) == len(residues):
+            pairs = _residue_bond_pairs(
+                coords, is_H, res_starts, res_ends, min_length**2, max_length**2
             )
+            bonds = [(atoms[i], atoms[j]) for i, j in pairs]
+            bonds = _prune_H_triplets(bonds)
+            return bonds
 
+    if len(atoms) > _CHUNKED_BOND_SEARCH_THRESHOLD:
+        pairs = _chunked_bond_pairs(coords, max_length)
     else:
-        atoms = list(structure.get_atoms())
-        _neighbors = NeighborSearch(atoms)
-        bonds = _neighbors.search_all(radius=max_length)
-
-    bonds = [
-        i
-        for i in bonds
-        if not (i[0].element == "H" and i[1].element == "H")
-        and np.linalg.norm(i[0].coord - i[1].coord) > min_length
-    ]
+        pairs = cKDTree(coords).query_pairs(r=max_length, output_type="ndarray")
+    if len(pairs) == 0:
+        return []
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    a, b = pairs[:, 0], pairs[:, 1]
+
+    mask = ~(is_H[a] & is_H[b])
+    mask &= np.linalg.norm(coords[a] - coords[b], axis=1) > min_length
+
+    if restrict_residues:
+        mask &= residue_idx[a] == residue_idx[b]
+
+    bonds = [(atoms[i], atoms[j]) for i, j in pairs[mask]]
     bonds = _prune_H_triplets(bonds)
     return bonds
 
 
-def _atom_from_residue(id, residue):
-    return next((atom for atom in residue.get_atoms() if atom.id == id), None)
+_CHUNKED_BOND_SEARCH_THRESHOLD = 200_000
+"""
+The number of atoms above which `infer_bonds` searches for bonds
+in chunks of atoms instead of collecting all pairs at once.
+"""
+
+_BOND_SEARCH_CHUNK_SIZE = 16384
+"""
+The number of atoms per chunk in the chunked bond search.
+"""
+
+
+def _chunked_bond_pairs(coords, max_length, chunk_size=None):
+    """
+    Find all pairs of atoms that are within `max_length` of each other, one chunk of atoms at a time.
+    The atoms are sorted along the x-axis and each chunk is searched together with the atoms
+    that lie within `max_length` behind it, so only a small KD-tree (and its pairs) is kept in memory at any time.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        The (N, 3) atom coordinates
+    max_length : float
+        The maximal distance between two atoms
+    chunk_size : int
+        The number of atoms per chunk. By default `_BOND_SEARCH_CHUNK_SIZE`.
+
+    Returns
+    -------
+    np.ndarray
+        The (M, 2) atom index pairs (with the first index smaller than the second)
+    """
+    if chunk_size is None:
+        chunk_size = _BOND_SEARCH_CHUNK_SIZE
+    order = np.argsort(coords[:, 0], kind="stable")
+    x = coords[order, 0]
+    pairs = []
+    for start in range(0, len(coords), chunk_size):
+        stop = min(start + chunk_size, len(coords))
+        end = np.searchsorted(x, x[stop - 1] + max_length, side="right")
+        _pairs = cKDTree(coords[order[start:end]]).query_pairs(
+            r=max_length, output_type="ndarray"
+        )
+        # pairs that lie completely behind the chunk are found with the next chunk
+        _pairs = _pairs[_pairs.min(axis=1) < stop - start] + start
+        pairs.append(order[_pairs])
+    return np.sort(np.concatenate(pairs), axis=1)
+
+
+_MAX_RESIDUE_SIZE_FOR_KERNEL = 1000
+"""
+The largest residue (in atoms) for which the per-residue pairwise distance kernel
+is used in `infer_bonds`. Larger residues are better served by the KD-tree.
+"""
+
+
+def _residue_bond_pairs(coords, is_H, res_starts, res_ends, min_length2, max_length2):
+    """
+    Find all pairs of atoms within each residue that are within bond distance
+    (excluding hydrogen-hydrogen pairs). Residues are processed in parallel.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        The (N, 3) atom coordinates, grouped by residue
+    is_H : np.ndarray
+        A boolean mask of hydrogen atoms
+    res_starts, res_ends : np.ndarray
+        The first and one-past-last atom index of each residue
+    min_length2, max_length2 : float
+        The squared minimal and maximal bond lengths
+
+    Returns
+    -------
+    np.ndarray
+        The (M, 2) atom index pairs, sorted by the first and then the second index
+    """
+    counts = _count_residue_bond_pairs(
+        coords, is_H, res_starts, res_ends, min_length2, max_length2
+    )
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    out = np.empty((offsets[-1], 2), dtype=np.int64)
+    _fill_residue_bond_pairs(
+        coords, is_H, res_starts, res_ends, min_length2, max_length2, offsets, out
+    )
+    return out
+
+
+@aux.njit(parallel=True, cache=True)
+def _count_residue_bond_pairs(
+    coords, is_H, res_starts, res_ends, min_length2, max_length2
+):
+    """
+    Count the bonded atom pairs within each residue
+    """
+    counts = np.zeros(len(res_starts), dtype=np.int64)
+    for r in aux.prange(len(res_starts)):
+        n = 0
+        for i in range(res_starts[r], res_ends[r]):
+            for j in range(i + 1, res_ends[r]):
+                if is_H[i] and is_H[j]:
+                    continue
+                dx = coords[i, 0] - coords[j, 0]
+                dy = coords[i, 1] - coords[j, 1]
+                dz = coords[i, 2] - coords[j, 2]
+                d2 = dx * dx + dy * dy + dz * dz
+                if min_length2 < d2 <= max_length2:
+                    n += 1
+        counts[r] = n
+    return counts
+
+
+@aux.njit(parallel=True, cache=True)
+def _fill_residue_bond_pairs(
+    coords, is_H, res_starts, res_ends, min_length2, max_length2, offsets, out
+):
+    """
+    Write the bonded atom pairs of each residue into its slice of `out`
+    """
+    for r in aux.prange(len(res_starts)):
+        k = offsets[r]
+        for i in range(res_starts[r], res_ends[r]):
+            for j in range(i + 1, res_ends[r]):
+                if is_H[i] and is_H[j]:
+                    continue
+                dx = coords[i, 0] - coords[j, 0]
+                dy = coords[i, 1] - coords[j, 1]
+                dz = coords[i, 2] - coords[j, 2]
+                d2 = dx * dx + dy * dy + dz * dz
+                if min_length2 < d2 <= max_length2:
+                    out[k, 0] = i
+                    out[k, 1] = j
+                    k += 1
 
 
 def apply_reference_bonds(structure, _compounds=None):
@@ -753,17 +955,15 @@ def apply_reference_bonds(structure, _compounds=None):
             )
             return []
 
-        ref = _compounds.get(residue.resname)
-        bonds = (
-            (
-                _atom_from_residue(bond.atom1.id, residue),
-                _atom_from_residue(bond.atom2.id, residue),
-                bond.order,
-            )
-            for bond in ref.get_bonds()
-        )
+        # map the atom ids to the (first) atom of the residue carrying them
+        atoms = {}
+        for atom in residue.get_atoms():
+            atoms.setdefault(atom.id, atom)
+
         bonds = [
-            bond for bond in bonds if bond[1] is not None and bond[0] is not None
+            (atoms[a], atoms[b], order)
+            for a, b, order in _compounds.get_bond_table(residue.resname)
+            if a in atoms and b in atoms
         ]  # make sure to have no None entries...
         return bonds
 
@@ -955,12 +1155,20 @@ def _prune_H_triplets(bonds):
     bonds_with_H = [
         bond for bond in bonds if bond[0].element == "H" or bond[1].element == "H"
     ]
-    triplets = neighbors.generate_triplets(bonds_with_H)
     bond_mappings = defaultdict(int)
     for a, b in bonds_with_H:
         bond_mappings[a] += 1
         bond_mappings[b] += 1
 
+    # only hydrogens with more than one bond can be the center of a triplet,
+    # so all other bonds can be left out when generating the triplets
+    bonds_with_shared_H = [
+        bond
+        for bond in bonds_with_H
+        if any(atom.element == "H" and bond_mappings[atom] > 1 for atom in bond)
+    ]
+    triplets = neighbors.generate_triplets(bonds_with_shared_H)
+
     for triplet in triplets:
         if triplet[1].element != "H":
             continue
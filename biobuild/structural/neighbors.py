@@ -76,7 +76,7 @@ class Neighborhood:
             return {node}
         else:
             neighbors = set()
-            for neighbor in self._src.adj[node]:
+            for neighbor in self._src._adj[node]:
                 if neighbor in self._seen:
                     continue
                 if n >= 1:
@@ -93,7 +93,7 @@ class Neighborhood:
             return {node}
         else:
             neighbors = set()
-            for neighbor in self._src.adj[node]:
+            for neighbor in self._src._adj[node]:
                 if neighbor in self._seen:
                     continue
                 if n >= 1:
@@ -406,8 +406,18 @@ class Patcher(base.Connector):
         if ic:
             return ic.atom1[0] == "1" and ic.atom2[0] == "1" and ic.atom3[0] == "1"
 
-        ids = ["1" + i.id for i in self.target.get_atoms()]
         ics = self._match_IC(3, 4)
+
+        # check which of the required atoms are present in the target
+        # (starting from the back where the anchor residue usually sits)
+        needed = {getattr(i, a) for i in ics for a in ("atom1", "atom2", "atom3")}
+        ids = set()
+        for residue in reversed(list(self.target.get_residues())):
+            ids.update(
+                "1" + atom.id for atom in residue.child_list if "1" + atom.id in needed
+            )
+            if len(ids) == len(needed):
+                break
         ics = [i for i in ics if i.atom1 in ids and i.atom2 in ids and i.atom3 in ids]
         if len(ics) == 0:
             raise PatchError(
@@ -421,12 +431,14 @@ class Patcher(base.Connector):
         """
         delete_from_target, delete_from_source = self.patch.deletes
         if self._target_residue:
+            _ids = set(delete_from_target)
             delete_from_target = [
-                i for i in self._target_residue.child_list if i.id in delete_from_target
+                i for i in self._target_residue.child_list if i.id in _ids
             ]
         if self._source_residue:
+            _ids = set(delete_from_source)
             delete_from_source = [
-                i for i in self._source_residue.child_list if i.id in delete_from_source
+                i for i in self._source_residue.child_list if i.id in _ids
             ]
         self.target._remove_atoms(*delete_from_target)
         self.source._remove_atoms(*delete_from_source)
@@ -457,9 +469,12 @@ class Patcher(base.Connector):
         res, id = atom[0], atom[1:]
         _obj, _res, _idx = self._objs[res]
 
-        atoms = _obj.get_atoms(id, by="id")
         if _res:
-            atoms = [i for i in atoms if i.get_parent() is _res]
+            # only search the residue itself instead of the entire
+            # molecule, which keeps this cheap as polymers grow
+            atoms = [i for i in _res.child_list if i.id == id]
+        else:
+            atoms = _obj.get_atoms(id, by="id")
         if len(atoms) == 0:
             raise PatchError("No atom found with id {}".format(atom))
         atom = atoms[_idx]
@@ -441,8 +441,10 @@ class Stitcher(base.Connector):
                 #     color="orange",
                 # )
 
-                self.target.rotate_around_bond(
-                    *_bond, angle, descendants_only=True, angle_is_degrees=False
+                # the policy was optimized on an unlocked graph, so the
+                # target's locks are not checked here
+                self.target._rotate_around_bond(
+                    *_bond, angle, descendants_only=True
                 )
 
             self._policy = None, None
@@ -5,7 +5,6 @@ Most of these functions are not relevant to the user, but are used internally.
 import biobuild.utils.constants as constants
 import biobuild.utils.defaults as defaults
 import biobuild.utils.abstract as abstract
-import biobuild.utils.visual as visual
 import biobuild.utils.convert as convert
 import biobuild.utils.pdb as pdb
 import biobuild.utils.cif as cif
@@ -16,3 +15,13 @@ import biobuild.utils.auxiliary as auxiliary
 
 from biobuild.utils.auxiliary import *
 from biobuild.utils.defaults import *
+
+
+def __getattr__(name):
+    # the visualization module pulls in plotly and matplotlib,
+    # so it is only imported once it is actually used
+    if name == "visual":
+        import biobuild.utils.visual as visual
+
+        return visual
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
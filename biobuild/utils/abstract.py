@@ -142,6 +142,12 @@ class AbstractEntity_with_IC(AbstractEntity):
         """
         self.internal_coordinates.append(ic)
 
+    def add_internal_coordinates_many(self, ics):
+        """
+        Add multiple internal coordinates to the residue at once
+        """
+        self.internal_coordinates.extend(ics)
+
     def add_ic(self, ic):
         """
         Add an internal coordinate to the residue
@@ -42,6 +42,25 @@ except ImportError:
     HAS_OPENMM = False
 
 
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in for `numba.njit` that leaves the function
+        uncompiled if numba is not installed
+        """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+    HAS_NUMBA = False
+
+
 # =================================================================
 def load_pickle(filename):
     """
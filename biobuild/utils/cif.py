@@ -1,6 +1,8 @@
 """
 Functions to work with CIF files.
 """
+import re
+
 from tabulate import tabulate
 
 _bond_order_map = {
@@ -166,6 +168,146 @@ def parse_bond_table(filename, fmt_header: str = "_bond"):
     return [(a, b, order) for (a, b), order in bonds.items()]
 
 
+_token_pattern = re.compile(r"""'(.*?)'(?=\s|$)|"(.*?)"(?=\s|$)|(\S+)""")
+"""
+The pattern of a single- or double-quoted or bare token on a CIF line
+"""
+
+
+def read_data_blocks(filename: str, ignore: set = None):
+    """
+    Read the data blocks of a CIF file one after the other.
+    Only one data block is kept in memory at a time.
+
+    Parameters
+    ----------
+    filename : str
+        The CIF file to read.
+    ignore : set, optional
+        Categories (e.g. `_pdbx_chem_comp_audit`) whose values are skipped.
+
+    Yields
+    ------
+    block_id : str
+        The id of the data block (the part after `data_`).
+    block : dict
+        A dictionary of the categories in the data block. Each category is a dictionary
+        of its item values, which are lists of values for items in a `loop_`.
+    """
+    ignore = set(ignore or ())
+    block_id, block = None, None
+    # the item waiting for its value, or the items (and their value columns) of the current loop
+    item = None
+    loop, columns, n_values = None, None, 0
+    with open(filename, "r") as f:
+        for tokens, quoted in _tokenize(f):
+            # complete rows of a loop are distributed to the columns at once
+            if (
+                columns is not None
+                and loop
+                and quoted is None
+                and len(tokens) == len(columns)
+                and n_values % len(columns) == 0
+                # tags and keywords all contain an underscore
+                and "_" not in "".join(tokens)
+            ):
+                for column, token in zip(columns, tokens):
+                    if column is not None:
+                        column.append(token)
+                n_values += len(columns)
+                continue
+
+            for idx, token in enumerate(tokens):
+                if not (quoted and quoted[idx]):
+                    if token.startswith("data_"):
+                        if block is not None:
+                            yield block_id, block
+                        block_id, block = token[5:], {}
+                        item, loop = None, None
+                        continue
+                    if token == "loop_":
+                        item, loop, columns = None, [], None
+                        continue
+                    if token.startswith("_"):
+                        category, _, key = token.partition(".")
+                        if loop is not None and columns is None:
+                            loop.append((category, key))
+                            continue
+                        item, loop = (category, key), None
+                        continue
+                if block is None:
+                    continue
+
+                if loop:
+                    if columns is None:
+                        columns = []
+                        for category, key in loop:
+                            column = None
+                            if category not in ignore:
+                                column = block.setdefault(category, {})[key] = []
+                            columns.append(column)
+                        n_values = 0
+                    column = columns[n_values % len(columns)]
+                    if column is not None:
+                        column.append(token)
+                    n_values += 1
+                elif item is not None:
+                    category, key = item
+                    if category not in ignore:
+                        block.setdefault(category, {})[key] = token
+                    item = None
+
+    if block is not None:
+        yield block_id, block
+
+
+def _tokenize(lines):
+    """
+    Split the lines of a CIF file into tokens.
+    Yields the tokens of each line (a text field counts as one line) together with a
+    list of whether each token was quoted (or a text field), in which case it is always a value.
+    If no token of a line was quoted, None is given instead of the list.
+    """
+    text = None
+    for line in lines:
+        # multi-line text fields are delimited by lines starting with a semicolon
+        if line.startswith(";"):
+            if text is None:
+                text = [line[1:].rstrip()]
+                continue
+            yield ["\n".join(text).strip()], [True]
+            text = None
+            line = line[1:]
+        elif text is not None:
+            text.append(line.rstrip())
+            continue
+
+        # most lines hold no quoted values and can simply be split
+        if "'" not in line and '"' not in line:
+            tokens = line.split()
+            for idx, token in enumerate(tokens):
+                if token[0] == "#":
+                    del tokens[idx:]
+                    break
+            if tokens:
+                yield tokens, None
+            continue
+
+        tokens, quoted = [], []
+        for match in _token_pattern.finditer(line):
+            single, double, bare = match.groups()
+            if bare is None:
+                tokens.append(single if single is not None else double)
+                quoted.append(True)
+            elif bare.startswith("#"):
+                break
+            else:
+                tokens.append(bare)
+                quoted.append(False)
+        if tokens:
+            yield tokens, quoted
+
+
 if __name__ == "__main__":
     from biobuild import molecule
 
@@ -2,6 +2,7 @@
 Auxiliary tools for PDB files.
 """
 
+import numpy as np
 from tabulate import tabulate
 
 __amino_acids = set(
@@ -73,6 +74,9 @@ def write_connect_lines(mol, filename):
         f.write("\nEND\n")
 
 
+_whitespace = np.frombuffer(b" \t\r\n\x0b\x0c", dtype=np.uint8)
+
+
 def parse_connect_lines(filename):
     """
     Parse "CONECT" lines from a PDB file.
@@ -88,30 +92,53 @@ def parse_connect_lines(filename):
     bonds: list
         A list of tuples of atom serial numbers that are bonded.
     """
-    with open(filename, "r") as f:
-        lines = f.readlines()
-    bonds = {}
-    known_bonds = set()
-    for line in lines:
-        if line.startswith("CONECT"):
-            # split the line into tokens of length 5
-            line = line[6:]
-            tokens = [
-                line[i : i + 5].strip()
-                for i in range(0, len(line), 5)
-                if len(line[i : i + 5].strip()) > 0
-            ]
-
-            atom_a = int(tokens[0])
-            for token in tokens[1:]:
-                b = (atom_a, int(token))
-                # make sure we don't add the same bond twice
-                if b[::-1] in known_bonds:
-                    continue
-                bonds.setdefault(b, 0)
-                bonds[b] += 1
-                known_bonds.add(b)
-    return [(*k, v) for k, v in bonds.items()]
+    with open(filename, "rb") as f:
+        lines = [line[6:] for line in f.read().splitlines() if line.startswith(b"CONECT")]
+    if len(lines) == 0:
+        return []
+
+    # the records are fixed-width, so all lines are padded to the same
+    # number of 5-character fields which are then parsed at once
+    width = max(len(line) for line in lines)
+    width += -width % 5
+    raw = np.frombuffer(b"".join(line.ljust(width) for line in lines), dtype=np.uint8)
+    raw = raw.reshape(len(lines), -1, 5)
+    blank = np.isin(raw, _whitespace)
+    filled = ~blank.all(axis=2)
+    digits = raw - ord("0")
+    if np.all((digits <= 9) | blank):
+        fields = np.zeros(filled.shape, dtype=np.int64)
+        for i in range(5):
+            fields = np.where(blank[:, :, i], fields, fields * 10 + digits[:, :, i])
+    else:
+        fields = raw.view("S5").reshape(filled.shape)
+        fields = np.where(filled, fields, b"0").astype(np.int64)
+
+    # the first filled field of each record is the atom the others bond to
+    rows = np.flatnonzero(filled.any(axis=1))
+    first = filled.argmax(axis=1)
+    partners = filled & (np.arange(fields.shape[1]) > first[:, None])
+    row, col = np.nonzero(partners[rows])
+    row = rows[row]
+    pairs = np.stack((fields[row, first[row]], fields[row, col]), axis=1)
+    if len(pairs) == 0:
+        return []
+
+    # the same bond may be listed from both sides, only the orientation in which
+    # it appears first is counted (repeats of which encode the bond order)
+    keys = np.sort(pairs, axis=1)
+    keys, first_idx, inverse = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+    same_side = pairs[:, 0] == pairs[first_idx[inverse], 0]
+    counts = np.bincount(inverse, weights=same_side).astype(np.int64)
+    counts[keys[:, 0] == keys[:, 1]] = 1
+
+    order = np.argsort(first_idx, kind="stable")
+    bonds = pairs[first_idx[order]].tolist()
+    counts = counts[order].tolist()
+    return [(a, b, c) for (a, b), c in zip(bonds, counts)]
 
 
 def make_connect_table(mol, symmetric=True):
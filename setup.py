@@ -32,7 +32,6 @@ setuptools.setup(
         "seaborn",
         "networkx",
         "biopython",
-        "pdbecif",
         "periodictable",
         "plotly",
         "gym",
@@ -47,7 +46,8 @@ setuptools.setup(
         "openbabel": ["openbabel"],
         "rdkit": ["rdkit"],
         "openmm": ["openmm"],
-        "full": ["rdkit", "openbabel", "openmm", "py3Dmol", "nglview"],
+        "numba": ["numba"],
+        "full": ["rdkit", "openbabel", "openmm", "numba", "py3Dmol", "nglview"],
     },
     classifiers=[
         "Programming Language :: Python :: 3",
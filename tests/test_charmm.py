@@ -2,6 +2,7 @@
 Test the behaviour of CHARMM force fields and the abstract classes that store their behaviour
 """
 
+import pytest
 import biobuild as bb
 import tests.base as base
 
@@ -51,3 +52,73 @@ def test_make_charmm_topology():
 #     assert len(man.get_internal_coordinates("C1", "O3", mode="anywhere")) == 1
 
 #     assert man.get_bond("C1", "C2") is not None
+
+
+def test_patch_from_internal_coordinates():
+    link = bb.patch(
+        "C1",
+        "O4",
+        ["O1", "HO1"],
+        ["HO4"],
+        internal_coordinates={
+            ("1C1", "1C2", "2O4", "2C4"): (1.1, 1.2, 110.0, 111.0, 60.0, False),
+            ("1C1", "2O4", "1C2", "1O5"): (1.3, 1.4, 112.0, 113.0, 120.0, True),
+        },
+    )
+    assert link.deletes == (["O1", "HO1"], ["HO4"])
+    assert len(link.internal_coordinates) == 2
+
+    proper, improper = link.internal_coordinates
+    assert proper.bond_length_12 == 1.1
+    assert proper.bond_length_13 is None
+    assert improper.bond_length_12 is None
+    assert improper.bond_length_13 == 1.3
+    assert improper.improper
+
+    # a linkage made from the same dictionary gets its own internal coordinates
+    other = bb.patch(
+        "C1",
+        "O4",
+        ["O1", "HO1"],
+        ["HO4"],
+        internal_coordinates={
+            ("1C1", "1C2", "2O4", "2C4"): (1.1, 1.2, 110.0, 111.0, 60.0, False),
+            ("1C1", "2O4", "1C2", "1O5"): (1.3, 1.4, 112.0, 113.0, 120.0, True),
+        },
+    )
+    assert other.internal_coordinates[0] is not proper
+    proper.bond_length_12 = 2.0
+    assert other.internal_coordinates[0].bond_length_12 == 1.1
+
+    with pytest.raises(ValueError):
+        bb.patch("C1", "O4", [], [], {("1C1", "1C2", "2O4"): (1, 2, 3, 4, 5, False)})
+
+
+def test_linkage_deletes_are_stored_per_structure():
+    link = bb.Linkage("test")
+    link.add_delete("1HO1")
+    link.add_delete("O1", "target")
+    link.add_delete("2HO4")
+    assert link.deletes == (["HO1", "O1"], ["HO4"])
+    assert link._delete_ids == ["1HO1", "1O1", "2HO4"]
+
+    # linkages pickled with a single list of prefixed ids are migrated on load
+    legacy = bb.Linkage("legacy")
+    state = dict(legacy.__dict__)
+    del state["_delete_target"], state["_delete_source"]
+    state["_delete_ids"] = ["1HO1", "2HO4"]
+    legacy.__setstate__(state)
+    assert legacy.deletes == (["HO1"], ["HO4"])
+
+
+def test_linkage_ic_arrays():
+    link = bb.get_patch("14bb")
+    atoms, values, impropers = link.ic_arrays
+    assert len(atoms) == len(link.internal_coordinates)
+    assert values.shape == (len(atoms), 5)
+    assert impropers.shape == (len(atoms),)
+
+    for ic, ids, row, improper in zip(link.internal_coordinates, atoms, values, impropers):
+        assert ids == ic.ids
+        assert tuple(row) == (*ic.lengths, *ic.angles, ic.dihedral)
+        assert improper == ic.improper
@@ -37,6 +37,98 @@ def test_atom_graph_from_molecule():
     assert len(graph._locked_edges) == len(mol.locked_bonds), "Molecule is not locked"
 
 
+def test_atom_graph_central_node():
+    mol = bb.Molecule.from_pdb(base.MANNOSE)
+    mol.infer_bonds()
+    graph = bb.graphs.AtomGraph.from_molecule(mol)
+
+    # the same node as the one closest to the mean of all coordinate values
+    center = np.mean([i.coord for i in graph.nodes])
+    root_node = min(graph.nodes, key=lambda x: np.linalg.norm(x.coord - center))
+    assert graph.central_node is root_node
+
+
+def test_atom_graph_cycles_follow_edges():
+    mol = bb.Molecule.from_compound("GLC")
+    graph = bb.graphs.AtomGraph.from_molecule(mol)
+    c1, o5 = mol.get_atom("C1"), mol.get_atom("O5")
+
+    assert graph.in_same_cycle(c1, o5)
+    assert c1 in graph.nodes_in_cycles
+    assert len(graph._get_cyclic_edges()) == 6
+
+    graph.remove_edge(c1, o5)
+    assert not graph.in_same_cycle(c1, o5)
+    assert not graph.nodes_in_cycles
+    assert not graph._get_cyclic_edges()
+
+    graph.add_edge(c1, o5)
+    assert graph.in_same_cycle(c1, o5)
+
+
+def test_atom_graph_cycles_of_separate_rings():
+    mol = bb.Molecule.from_compound("GLC")
+    mol.repeat(2, "14bb")
+    graph = bb.graphs.AtomGraph.from_molecule(mol)
+
+    assert len(graph._get_cyclic_edges()) == 12
+    names = ("C1", "C2", "C3", "C4", "C5", "O5")
+    rings = [{a for a in res.get_atoms() if a.id in names} for res in mol.get_residues()]
+    for cycle in graph._compute_cycles():
+        assert any(set(cycle) == ring for ring in rings)
+
+
+def test_atom_graph_descendants_kernel(monkeypatch):
+    mol = bb.Molecule.from_compound("GLC")
+    mol.repeat(2, "14bb")
+    graph = bb.graphs.AtomGraph.from_molecule(mol)
+
+    monkeypatch.setattr(bb.utils.auxiliary, "HAS_NUMBA", False)
+    expected = {i: graph.get_descendants(*i) for i in graph.edges}
+    monkeypatch.setattr(bb.utils.auxiliary, "HAS_NUMBA", True)
+    graph._prepare_descendants()
+    assert graph._adjacency is not None
+    for edge, descendants in expected.items():
+        assert graph.get_descendants(*edge) == descendants
+
+    # single searches after changes do not rebuild the arrays
+    a, b = next(iter(graph.edges))
+    graph.remove_edge(a, b)
+    assert graph._adjacency is None
+    c, d = next(iter(graph.edges))
+    graph.get_descendants(c, d)
+    assert graph._adjacency is None
+    with pytest.raises(KeyError):
+        graph.get_descendants(a, b)
+
+
+def test_atom_graph_atoms_follow_nodes():
+    mol = bb.Molecule.from_compound("GLC")
+    graph = bb.graphs.AtomGraph.from_molecule(mol)
+
+    # the cached lists are not handed out themselves
+    graph.atoms.clear()
+    assert len(graph.atoms) == 24
+    assert len(graph.residues) == 1
+
+    h = mol.get_atom("HO1")
+    mol._remove_atoms(h)
+    graph.remove_node(h)
+    assert len(graph.atoms) == 23
+
+    assert bb.graphs.AtomGraph("empty", []).atoms is None
+
+
+def test_atom_graph_structure_follows_molecule():
+    mol = bb.Molecule.from_compound("GLC")
+    graph = mol._AtomGraph
+    assert len(graph.chains) == 1
+
+    # adding a chain does not touch the graph nodes
+    mol.add_chains(bb.core.base_classes.Chain("B"))
+    assert len(graph.chains) == 2
+
+
 def test_atom_graph_pdb_one_residue_is_non_empty():
     mol = bb.Molecule.from_pdb(base.MANNOSE)
     mol.infer_bonds()
@@ -158,6 +250,26 @@ def test_atom_graph_rotate_descendants_only():
     ), "Descendants have not moved"
 
 
+def test_atom_graph_rotate_reuses_buffer():
+    mol = bb.Molecule.from_pdb(base.MANNOSE)
+    mol.infer_bonds()
+    mol = bb.graphs.AtomGraph.from_molecule(mol)
+
+    c6 = next(i for i in mol.structure.get_atoms() if i.id == "C6")
+    c5 = next(i for i in mol.structure.get_atoms() if i.id == "C5")
+
+    first = mol.rotate_around_edge(c5, c6, np.radians(35), update_coords=False)
+    first = {k: v.copy() for k, v in first.items()}
+    second = mol.rotate_around_edge(c5, c6, np.radians(35), update_coords=False)
+    for node, coord in first.items():
+        assert np.allclose(second[node], coord)
+
+    mol.rotate_around_edge(c5, c6, np.radians(35), descendants_only=True)
+    assert np.allclose(first[c6], c6.coord)
+    for node in mol.get_descendants(c5, c6):
+        assert np.allclose(second[node], node.coord)
+
+
 def test_atom_graph_rotate_all():
     mol = bb.Molecule.from_pdb(base.MANNOSE)
     mol.infer_bonds()
@@ -532,4 +644,34 @@ def test_atom_graph_lock():
     glc.remove_bond(5, 12)
     assert len(glc.bonds) == old
     assert len(g.edges) == old_edges
-    assert len(set(g._locked_edges)) == len(set(glc.locked_bonds)) == 2
+    assert len(set(g._locked_edges)) == len(set(glc.locked_bonds)) == 1
+
+
+def test_atom_graph_lock_both_orientations():
+    glc = bb.Molecule.from_compound("GLC")
+    g = glc._AtomGraph
+    a, b = glc.get_atom("C1"), glc.get_atom("C2")
+
+    g.lock_edge(a, b)
+    g.lock_edge(b, a)
+    assert len(g._locked_edges) == 1
+    assert g.is_locked(a, b) and g.is_locked(b, a)
+    assert len(g.get_unlocked_edges()) == len(g.edges) - 1
+
+    # the public sets also find edges in either orientation
+    assert (a, b) in glc.locked_bonds and (b, a) in glc.locked_bonds
+    assert (b, a) in g.get_locked_edges()
+    assert (a, b) not in g.get_unlocked_edges()
+
+    g.unlock_edge(b, a)
+    assert not g.is_locked(a, b)
+    assert (b, a) not in glc.locked_bonds
+    assert (b, a) in g.get_unlocked_edges()
+
+    glc.lock_all()
+    assert all(g.is_locked(*i) for i in g.edges)
+    assert not g.find_rotatable_edges()
+
+    c = glc.get_atom("C3")
+    g.add_edge(c, a)
+    assert g.get_unlocked_edges() == {g._edge_key(a, c)}
@@ -4,6 +4,7 @@ Tests to check the behaviour of the bb.Molecule object
 
 import os
 from copy import deepcopy
+import pytest
 import numpy as np
 import biobuild as bb
 import Bio.PDB as bio
@@ -148,6 +149,168 @@ def test_atomgraph_sync():
         assert atom in mol._AtomGraph.nodes, f"Atom {atom} not in graph after reindex"
 
 
+def test_molecule_copy():
+    mol = bb.Molecule.from_pdb(base.MANNOSE)
+    mol.apply_standard_bonds()
+    mol.lock_bond(1, 2)
+    mol.set_root(1)
+
+    other = mol.copy()
+    assert other is not mol
+    assert len(other.atoms) == len(mol.atoms)
+    assert len(other.bonds) == len(mol.bonds)
+    assert len(other.locked_bonds) == 1
+
+    assert not set(other.get_atoms()) & set(mol.get_atoms())
+    for atom in other.get_atoms():
+        assert atom in other._AtomGraph.nodes
+    for bond in other.bonds:
+        assert bond.atom1 in other._AtomGraph.nodes
+        assert bond.atom2 in other._AtomGraph.nodes
+    assert other.root_atom in other._AtomGraph.nodes
+    assert other.root_atom.serial_number == mol.root_atom.serial_number
+
+    atom = other.get_atom(1)
+    assert atom.get_parent().get_parent() is other.chains[0]
+    atom.coord += 1
+    assert np.allclose(mol.get_atom(1).coord + 1, atom.coord)
+
+    # the linkage is a template and is shared, atoms are not
+    mol.set_linkage("14bb")
+    other = mol.copy()
+    assert other._linkage is mol._linkage
+    assert other.get_atom(1).xtra is not mol.get_atom(1).xtra
+    assert other.residues[0].child_list is not mol.residues[0].child_list
+
+
+def test_molecule_coords():
+    mol = bb.Molecule.from_pdb(base.MANNOSE)
+    atoms = list(mol.get_atoms())
+
+    coords = mol.coords
+    assert coords.shape == (len(atoms), 3)
+    assert mol.coords is coords
+
+    # neither in-place changes nor copying the molecule rebuild the block
+    atoms[0].coord[0] += 0.0
+    mol.copy()
+    assert mol.coords is coords
+
+    # atoms and the coordinate block share their memory
+    atoms[0].coord += 1
+    assert np.allclose(coords[0], atoms[0].coord)
+    coords[1] -= 1
+    assert np.allclose(coords[1], atoms[1].coord)
+
+    # re-assigning an atom's coord rebuilds the block
+    atoms[2].coord = np.array([1.0, 2.0, 3.0])
+    assert mol.coords is not coords
+    assert np.allclose(mol.coords[2], [1.0, 2.0, 3.0])
+
+    mol.remove_atoms(atoms[-1])
+    assert mol.coords.shape == (len(atoms) - 1, 3)
+
+
+def test_molecule_coords_dtype():
+    glc = bb.Molecule.from_compound("GLC")
+    ref = glc.coords.copy()
+
+    glc.astype(np.float32)
+    assert glc.coords.dtype == np.float32
+    assert glc.get_atom("C1").coord.dtype == np.float32
+    assert np.allclose(glc.coords, ref, atol=1e-4)
+
+    # the precision is kept when the block is rebuilt or the molecule copied
+    glc.add_atoms(bb.Atom("HX", np.zeros(3), element="H"))
+    assert glc.coords.dtype == np.float32
+    assert glc.copy().coords.dtype == np.float32
+
+    with pytest.raises(ValueError):
+        glc.astype(int)
+
+    glc.astype(None)
+    glc.get_atom("HX").coord = np.zeros(3, dtype=np.float64)
+    assert glc.coords.dtype == np.float64
+
+
+def test_molecule_copy_keeps_float64():
+    glc = bb.Molecule.from_compound("GLC")
+    glc.astype(np.float64)
+    ref = glc.coords.copy()
+
+    new = glc.copy()
+    assert new.coords.dtype == np.float64
+    assert new.get_atom("C1").coord.dtype == np.float64
+    assert np.array_equal(new.coords, ref)
+
+    # also without a chosen type, the type of the atoms is kept
+    glc.astype(None)
+    assert glc.copy().get_atom("C1").coord.dtype == np.float64
+
+
+def test_molecule_atom_lookup():
+    mol = bb.Molecule.from_pdb(base.MANNOSE)
+    atoms = list(mol.get_atoms())
+
+    assert mol.get_atom(1) is atoms[0]
+    assert mol.get_atom("C1") is next(i for i in atoms if i.id == "C1")
+    assert mol.get_residue(1) is mol.residues[0]
+
+    # the lookup follows renaming and removal of atoms
+    mol.rename_atom("C1", "CX")
+    assert mol.get_atom("C1") is None
+    assert mol.get_atom("CX").id == "CX"
+
+    mol.remove_atoms(1)
+    assert atoms[0] not in list(mol.get_atoms())
+    assert mol.get_atom(1) is atoms[1]
+    assert mol.get_atom(atoms[0]) is None
+
+    # ... as well as direct edits of the underlying structure
+    atoms[1].id = "XX"
+    assert mol.get_atom("XX") is atoms[1]
+
+
+def test_molecule_atom_table():
+    mol = bb.Molecule.from_pdb(base.MANNOSE)
+    atoms = list(mol.get_atoms())
+
+    table = mol._atom_table
+    assert len(table) == len(atoms)
+    assert list(table.serial) == [i.serial_number for i in atoms]
+    assert list(table.name) == [i.id for i in atoms]
+    assert (table.element == "C").sum() == sum(1 for i in atoms if i.element == "C")
+    assert np.allclose(table.coord, mol.coords)
+
+
+def test_molecule_save_load():
+    import tempfile
+    import pickle
+
+    mol = bb.Molecule.from_pdb(base.MANNOSE)
+    mol.apply_standard_bonds()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "man.pkl")
+        mol.save(filename)
+
+        # the original molecule is left intact
+        assert all(i.coord is not None for i in mol.get_atoms())
+
+        new = bb.Molecule.load(filename)
+        assert len(new.atoms) == len(mol.atoms)
+        assert len(new.bonds) == len(mol.bonds)
+        assert np.allclose(new.coords, mol.coords)
+        new.coords[0] += 1
+        assert np.allclose(new.get_atom(1).coord, mol.get_atom(1).coord + 1)
+
+        # plainly pickled molecules can still be loaded
+        with open(filename, "wb") as f:
+            pickle.dump(mol, f)
+        new = bb.Molecule.load(filename)
+        assert np.allclose(new.coords, mol.coords)
+
+
 def test_molecule_bonds():
     mol = bb.Molecule.from_pdb(base.MANNOSE)
 
@@ -257,6 +420,103 @@ def test_remove_atoms():
     assert len(glc.bonds) == 18
 
 
+def test_purge_bonds():
+    glc = bb.Molecule.from_compound("GLC")
+    c1 = glc.get_atom("C1")
+    n_bonds = len(glc.bonds)
+    degree = glc._AtomGraph.degree[c1]
+    assert degree > 0
+
+    glc.purge_bonds(c1)
+    assert len(glc.bonds) == n_bonds - degree
+    assert not any(c1 in bond for bond in glc.bonds)
+    assert glc._AtomGraph.degree[c1] == 0
+
+    glc.add_atoms(bb.Atom("HX", [0.0, 0.0, 0.0], element="H"))
+    assert glc.get_atom("HX").serial_number == len(glc.atoms)
+
+
+def test_residue_connections_cached():
+    glc = bb.Molecule.from_compound("GLC")
+    mol = glc.repeat(3, "14bb", inplace=False)
+
+    first = mol.get_residue_connections(triplet=False)
+    assert len(first) == 2
+    first.clear()
+    assert mol.get_residue_connections(triplet=False) == mol.get_residue_connections(
+        triplet=False
+    )
+    assert len(mol.get_residue_connections(triplet=False)) == 2
+
+    a, b = mol.get_residue_connections(triplet=False)[0]
+    mol._remove_bond(a, b)
+    assert len(mol.get_residue_connections(triplet=False)) == 1
+    mol._add_bond(a, b)
+    assert len(mol.get_residue_connections(triplet=False)) == 2
+
+    # the cache follows changes that keep the number of bonds the same
+    c = next(
+        i
+        for i in a.parent.get_atoms()
+        if i is not a and not mol._AtomGraph.has_edge(a, i)
+    )
+    n_bonds = len(mol.bonds)
+    mol._replace_bonds([(a, b)], [(a, c)])
+    assert len(mol.bonds) == n_bonds
+    assert len(mol.get_residue_connections(triplet=False)) == 1
+
+
+def test_get_atom_from_copy():
+    glc = bb.Molecule.from_compound("GLC")
+    mol = glc.repeat(3, "14bb", inplace=False)
+    other = mol.copy()
+
+    for atom in other.get_atoms():
+        own = mol.get_atom(atom)
+        assert own is not atom
+        assert own.full_id == atom.full_id
+        assert mol.get_atom(atom.full_id, by="full_id") is own
+
+    # renumbering the residues must not return stale atoms
+    mol.get_residue(2).serial_number = 5
+    atom = other.get_atom("C1", residue=2)
+    assert mol.get_atom(atom) is None
+    assert mol.get_atom(atom.full_id, by="full_id") is None
+
+
+def test_direct_residue_connections():
+    glc = bb.Molecule.from_compound("GLC")
+    mol = glc.repeat(4, "14bb", inplace=False)
+    n_bonds = len(mol.bonds)
+
+    connections = mol.get_residue_connections(triplet=False, direct_by="resid")
+    assert len(connections) == 3
+    for a, b in connections:
+        assert a.parent.id[1] < b.parent.id[1]
+
+    assert len(mol.bonds) == n_bonds
+    assert len(mol._AtomGraph.edges) == n_bonds
+    for bond in mol.bonds:
+        assert mol._AtomGraph.edges[bond.atom1, bond.atom2]["bond_obj"] is bond
+
+
+def test_remove_atoms_renumbers():
+    glc = bb.Molecule.from_compound("GLC")
+    mol = glc.repeat(3, "14bb", inplace=False)
+
+    mol._remove_atoms(mol.get_atom("C6", residue=2))
+    assert [i.serial_number for i in mol.get_atoms()] == list(
+        range(1, len(mol.atoms) + 1)
+    )
+
+    # a gap before the edited residue is closed as well
+    mol.residues[0].child_list[-1].serial_number = 100
+    mol._remove_atoms(mol.get_atom("C6", residue=3))
+    assert [i.serial_number for i in mol.get_atoms()] == list(
+        range(1, len(mol.atoms) + 1)
+    )
+
+
 def test_add_residues():
     mol = bb.Molecule.from_pdb(base.MANNOSE)
     mol.apply_standard_bonds()
@@ -523,6 +783,20 @@ def test_attach_with_patch():
     assert len(glc2.residues) == _current_residues
 
 
+def test_multiply():
+    glc = bb.Molecule.from_compound("GLC")
+    glc.set_linkage("14bb")
+
+    new = glc * 1
+    assert new is not glc
+    assert len(new.residues) == 1
+
+    new = glc * 4
+    assert len(new.residues) == 4
+    assert len(glc.residues) == 1
+    assert np.allclose(new.coords, glc.repeat(4, inplace=False).coords)
+
+
 def test_infer_bonds():
     mol = bb.molecule("GLC")
     assert mol.count_bonds() == 24
@@ -1258,6 +1532,39 @@ def test_work_with_pubchem():
     phprop.show()
 
 
+def test_pubchem_cache():
+    import tempfile
+    import pubchempy as pcp
+    from biobuild.resources import pubchem
+
+    record = {
+        "id": {"id": {"cid": 123}},
+        "atoms": {"aid": [1], "element": [6]},
+        "coords": [
+            {"aid": [1], "conformers": [{"x": [0.0], "y": [0.0], "z": [0.0]}]}
+        ],
+    }
+    comp = pcp.Compound(record)
+
+    old_dir = pubchem._cache_dir
+    with tempfile.TemporaryDirectory() as tmp:
+        pubchem._cache_dir = tmp
+        try:
+            assert pubchem._read_cache("methane", "name") is None
+            pubchem._write_cache("methane", "name", [comp], [comp])
+            assert pubchem._read_cache("methane", "name") is not None
+
+            # served from the cache without accessing the network
+            _2d, _3d = pubchem.query("methane", by="name")
+            assert _2d.cid == 123
+            assert len(_3d.atoms) == 1
+
+            pubchem.clear_cache()
+            assert pubchem._read_cache("methane", "name") is None
+        finally:
+            pubchem._cache_dir = old_dir
+
+
 def test_chlorine():
     benz = bb.Molecule.from_pubchem("1,2,4-trichloro-5-methylbenzene")
     benz.autolabel()
@@ -21,6 +21,20 @@ def test_distance_rotatron():
     env.reset()
 
 
+def test_distance_rotatron_compiled_eval():
+    mol = bb.read_pdb(base.MANNOSE9)
+    mol.infer_bonds(restrict_residues=False)
+
+    g = mol.get_residue_graph(detailed=True)
+    edges = g.find_rotatable_edges(g.central_node)
+    env = opt.DistanceRotatron(g, edges, unfold=3, pushback=10)
+    state = env.step(env.action_space.sample())[0]
+
+    compiled = env.eval(state)
+    env._concatenation_mode = -1
+    assert np.isclose(compiled, env.eval(state))
+
+
 def test_distance_rotatron_resgraph():
     mol = bb.read_pdb(base.MANNOSE9)
     mol.infer_bonds(restrict_residues=False)
@@ -2,6 +2,8 @@
 Tests for the PDBe compounds class.
 """
 
+import pytest
+
 import tests.base as base
 import Bio.PDB as bio
 import biobuild as bb
@@ -22,6 +24,39 @@ def test_from_cif():
     ), "The compounds were added to the default compounds!"
 
 
+def test_read_cif_data_blocks(tmp_path):
+    cif = tmp_path / "blocks.cif"
+    cif.write_text(
+        """data_ABC
+# a comment
+_chem_comp.id   ABC
+_chem_comp.name
+;some long
+name
+;
+_chem_comp.formula  'C2 H6 O'
+loop_
+_chem_comp_atom.atom_id
+_chem_comp_atom.type_symbol
+C1 C
+"O1'" O # trailing comment
+loop_
+_pdbx_chem_comp_audit.comp_id
+ABC
+data_DEF
+_chem_comp.id DEF
+"""
+    )
+    blocks = list(bb.utils.cif.read_data_blocks(str(cif), ignore={"_pdbx_chem_comp_audit"}))
+
+    assert [i for i, _ in blocks] == ["ABC", "DEF"]
+    abc = blocks[0][1]
+    assert abc["_chem_comp"] == {"id": "ABC", "name": "some long\nname", "formula": "C2 H6 O"}
+    assert abc["_chem_comp_atom"] == {"atom_id": ["C1", "O1'"], "type_symbol": ["C", "O"]}
+    assert "_pdbx_chem_comp_audit" not in abc
+    assert blocks[1][1] == {"_chem_comp": {"id": "DEF"}}
+
+
 def test_getting_compounds():
     comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
 
@@ -179,6 +214,7 @@ def test_relabel_2():
 
         assert scrambled.get_bonds("C1", "C2") != []
         assert scrambled.get_bonds("C6", "H61") != []
+        assert len(new_scrambled) == len(scrambled.atoms), "Labels were assigned twice"
         assert old_scrambled.difference(new_scrambled) != set()
         assert np.allclose(old_scrambled_coords, new_scrambled_coords)
 
@@ -206,6 +242,120 @@ def test_get_2FJ():
     ), "The compound was added to the default compounds!"
 
 
+def test_bond_table():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+
+    table = comps.get_bond_table("MAN")
+    man = comps.get("MAN")
+    assert len(table) == len(man.bonds)
+    assert comps.get_bond_table("MAN") is table
+    assert all(isinstance(a, str) and isinstance(b, str) for a, b, _ in table)
+
+    comps.remove("MAN")
+    assert comps.get_bond_table("MAN") is None
+
+
+def test_compound_template_copies():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+
+    a = comps.get("MAN")
+    b = comps.get("MAN")
+    assert a is not b
+    assert len(a.atoms) == len(b.atoms)
+    assert len(a.bonds) == len(b.bonds)
+    assert not set(a.get_atoms()) & set(b.get_atoms())
+
+    # changing one molecule must not leak into the next one
+    a.remove_atoms(a.get_atom("O1"))
+    c = comps.get("MAN")
+    assert len(c.atoms) == len(b.atoms)
+    assert c.get_atom("O1") is not None
+
+
+def test_compound_templates_are_bounded(monkeypatch):
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+    monkeypatch.setattr(pdbe_compounds, "_max_templates", 2)
+
+    comps.get("MAN")
+    comps.get("GLC")
+    comps.get("MAN")
+    comps.get("BGC")
+    assert list(comps._templates) == ["MAN", "BGC"]
+
+
+def test_compound_search_by_formula_forms():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+
+    expected = set(comps._get("C6 H12 O6", by="formula"))
+    assert "MAN" in expected
+    for formula in ("C6H12O6", "C 6 H 12 O 6", "H12 C6 O6", "c6h12o6"):
+        assert set(comps._get(formula, by="formula")) == expected
+    assert comps._get("C6 H12 O7", by="formula").keys().isdisjoint(expected)
+
+
+def test_compound_search_index():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+
+    assert list(comps._get("alpha-d-mannose", by="name")) == ["MAN"]
+    assert "MAN" in comps._get("C6 H12 O6", by="formula")
+    assert comps._get("not a compound", by="name") == {}
+
+    # the index follows compounds being removed or added again
+    man = comps.get("MAN")
+    comps.remove("MAN")
+    assert comps._get("alpha-d-mannose", by="name") == {}
+    comps.add(man, names=["alpha-d-mannose"])
+    assert list(comps._get("alpha-d-mannose", by="name")) == ["MAN"]
+
+    # ... without having to rebuild it
+    index = comps._get_search_index("name")
+    comps.add(man, names=["some mannose"])
+    assert comps._get_search_index("name") is index
+    assert list(comps._get("some mannose", by="name")) == ["MAN"]
+    assert comps._get("alpha-d-mannose", by="name") == {}
+    assert comps._compounds["MAN"]["names"] == ("man", "some mannose")
+
+
+def test_find_any_compound():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+
+    by, matches = comps._find_any("MAN")
+    assert by == "id" and list(matches) == ["MAN"]
+    by, matches = comps._find_any("alpha-d-mannose")
+    assert by == "name" and list(matches) == ["MAN"]
+    assert comps._find_any("not a compound") == (None, {})
+
+
+def test_merge_compounds():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+    other = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+    other.remove("MAN")
+    n = len(comps)
+
+    assert list(comps._get("alpha-d-mannose", by="name")) == ["MAN"]
+    with pytest.warns(UserWarning, match="already present"):
+        comps.merge(other)
+    assert len(comps) == n
+    assert list(comps._get("alpha-d-mannose", by="name")) == ["MAN"]
+
+
+def test_compound_search_by_inchikey():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+
+    # the same stereo SMILES as the stored one, but written starting from the hydroxyl
+    smiles = "OC[C@@H]1[C@H]([C@@H]([C@@H]([C@H](O1)O)O)O)O"
+    assert smiles not in comps._get_search_index("smiles")
+
+    # searches over all types only match stored descriptors exactly (and build no InChIKey index)
+    assert comps._find_any("some name") == (None, {})
+    assert comps._find_any(smiles) == (None, {})
+    assert "inchikey" not in comps._search_index
+
+    assert "MAN" in comps._get(smiles, by="smiles")
+    assert "MAN" in comps._get("WQZGKKKJIJFFOK-PQMKYFCFSA-N", by="smiles")
+    assert comps._get("MAN", by="smiles") == {}
+
+
 def test_get_all_molecule():
     bb.unload_all_compounds()
     bb.load_sugars()
@@ -225,3 +375,30 @@ def test_get_all_molecule():
             w = Warning(f"Failed for {comp}: {e}")
             print(w)
     bb.unload_all_compounds()
+
+
+def test_json_to_pdbx_dict():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+    man = comps.get("MAN")
+
+    # the same dictionary as when building the molecule from the JSON data first
+    encoded = bb.utils.json.encode_molecule(man)
+    expected = pdbe_compounds._molecule_to_pdbx_dict(bb.Molecule._from_dict(encoded))
+    pdb = pdbe_compounds._json_to_pdbx_dict(encoded["structure"])
+
+    assert np.allclose(pdb["atoms"].pop("coords"), expected["atoms"].pop("coords"))
+    assert pdb == expected
+
+
+def test_translate_ids():
+    comps = pdbe_compounds.PDBECompounds.from_file(base.PDBE_TEST_FILE)
+
+    assert comps.translate_ids_3_to_1(["02K", "04U", "MAN", "???"]) == ["A", "P", "X", "X"]
+    assert comps.translate_ids_1_to_3(["A", "P", "Z"]) == ["02K", "04U", "XXX"]
+
+    # the standard amino acid is preferred over modified ones
+    pro = comps.get("MAN")
+    pro.id = "PRO"
+    comps.add(pro, one_letter_code="P", three_letter_code="PRO")
+    assert comps.translate_ids_3_to_1(["PRO"]) == ["P"]
+    assert comps.translate_ids_1_to_3(["P", "A"]) == ["PRO", "02K"]
@@ -444,6 +444,18 @@ def test_infer_bonds():
     ), f"Recieved {_recieved} {_what}, expected {_expected} {_what}!"
 
 
+def test_infer_bonds_chunked(monkeypatch):
+    _man9 = bio.PDBParser().get_structure("MANNOSE9", base.MANNOSE9)
+    bonds = bb.structural.infer_bonds(_man9, restrict_residues=False)
+
+    monkeypatch.setattr(bb.structural.infer, "_CHUNKED_BOND_SEARCH_THRESHOLD", 0)
+    monkeypatch.setattr(bb.structural.infer, "_BOND_SEARCH_CHUNK_SIZE", 16)
+    chunked = bb.structural.infer_bonds(_man9, restrict_residues=False)
+
+    assert len(bonds) > 0
+    assert chunked == bonds
+
+
 def test_infer_residue_connections():
     _man9 = bio.PDBParser().get_structure("MANNOSE9", base.MANNOSE9)
     bonds = bb.structural.infer_residue_connections(_man9)
@@ -735,6 +747,28 @@ def test_compute_triplets():
     ), "Unique triplets are not unique!"
 
 
+def test_vet_structure():
+    bb.load_sugars()
+    mol = bb.Molecule.from_compound("GLC")
+    assert bb.structural.vet_structure(mol, angle_range=(0, 180))
+
+    # a clash between two atoms that are not bonded
+    mol.get_atom("O6").coord = mol.get_atom("C1").coord + 0.3
+    assert not bb.structural.vet_structure(mol, (0.6, 3.0), (0, 180))
+
+
+def test_atom_coords_of_biopython_entities():
+    bb.load_sugars()
+    mol = bb.Molecule.from_compound("GLC")
+    ref = np.array([i.coord for i in mol.get_atoms()])
+
+    # entities without a coordinate array are supported as well
+    for entity in (mol, mol.to_biopython(), mol.get_residue(1)):
+        coords = bb.structural.infer._atom_coords(entity)
+        assert coords.shape == ref.shape
+        assert np.allclose(coords, ref)
+
+
 def test_quartet_class():
     a = bb.structural.neighbors.Quartet(1, 2, 3, 4, False)
     b = bb.structural.neighbors.Quartet(1, 2, 3, 4, False)
@@ -790,6 +824,12 @@ def test_patcher_anchors():
     assert anchors[0].id == "O2"
     assert anchors[1].id == "C1"
 
+    # a residue that does not exist has no anchors (rather than falling back to other residues)
+    with pytest.raises(ValueError):
+        p.get_anchors(target_residue=5)
+    with pytest.raises(ValueError):
+        p.get_anchors(source_residue="NAG")
+
 
 def test_patcher_anchors_2():
     bb.load_sugars()
@@ -3,6 +3,7 @@ Tests to check the behaviour of the bb.Molecule object
 """
 
 import os
+import sys
 from copy import deepcopy
 import numpy as np
 import biobuild as bb
@@ -52,3 +53,44 @@ def test_connect():
     assert out is not glc2
     assert len(out.residues) == 2
     bb.unload_sugars()
+
+
+def test_molecule_is_cached():
+    mol1 = bb.molecule(base.GLUCOSE)
+    mol2 = bb.molecule(base.GLUCOSE)
+    assert mol1 is not mol2
+    assert mol1.count_atoms() == mol2.count_atoms()
+    assert mol1.count_bonds() == mol2.count_bonds()
+    assert not set(mol1.get_atoms()) & set(mol2.get_atoms())
+
+    mol3 = bb.molecule(base.GLUCOSE, ignore_cache=True)
+    assert mol3.count_atoms() == mol1.count_atoms()
+
+
+def test_molecule_cache_key():
+    from biobuild.core.Molecule import _molecule_cache_key as key
+
+    assert key("beta D  glucose") == key("BETA D GLUCOSE")
+    assert key("glc") == key("GLC")
+    assert key("alpha-D-glucose ") == key("Alpha-d-Glucose")
+
+    # the case of SMILES matters
+    assert key("c1ccccc1") != key("C1CCCCC1")
+    if bb.utils.auxiliary.HAS_RDKIT:
+        assert key("OCC") == key("CCO")
+
+
+def test_molecule_cache_is_lru(monkeypatch):
+    module = sys.modules["biobuild.core.Molecule"]
+    monkeypatch.setattr(module, "_molecule_cache", module.OrderedDict())
+    monkeypatch.setattr(module, "_MOLECULE_CACHE_SIZE", 2)
+
+    # the glucose is used again before the galactose is added, so the mannose is dropped
+    bb.molecule(base.GLUCOSE)
+    bb.molecule(base.MANNOSE)
+    bb.molecule(base.GLUCOSE)
+    bb.molecule(base.GALACTOSE)
+    assert [i[1] for i in module._molecule_cache] == [
+        os.path.abspath(base.GLUCOSE),
+        os.path.abspath(base.GALACTOSE),
+    ]